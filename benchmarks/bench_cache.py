@@ -0,0 +1,51 @@
+"""Ładowanie na zimno (parsowanie CSV) vs na ciepło (binarny cache).
+
+Użycie: python benchmarks/bench_cache.py [katalog_z_csv] [--copies N]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from cache import ParseCache  # noqa: E402
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+
+
+def _timed(label: str, load, count) -> None:
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.3f}s ({count(result) / elapsed:>12,.0f} wierszy/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", default=Path(__file__).resolve().parent.parent / "data", type=Path)
+    parser.add_argument("--copies", type=int, default=5, help="ile kopii plików (różne ścieżki) utworzyć")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = []
+        for i in range(args.copies):
+            for path in sorted(args.data_dir.glob("*.csv")):
+                target = tmp / f"{i}_{path.name}"
+                shutil.copy(path, target)
+                paths.append(target)
+
+        cache = ParseCache(tmp / "cache")
+        loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL, cache=cache)
+        _timed("bez cache", lambda: AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL).load(paths), len)
+        _timed("zimny cache (zapis)", lambda: loader.load(paths), len)
+        _timed("ciepły cache -> list[Auction]", lambda: loader.load(paths), len)
+        _timed("ciepły cache -> AuctionFrame", lambda: loader.load_frame(paths), len)
+        print(f"rozmiar cache: {cache.size_bytes() / 2**20:.2f} MiB, trafienia: {cache.hits}, chybienia: {cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Koszt parsowania kolumn ACV, Current Bid, VIN, uszkodzeń, tytułu, ODO Status i Start Code.
+
+Kod bazowy (sprzed dodania tych kolumn) jest wyciągany z gita (`git archive`)
+do katalogu tymczasowego; obie wersje parsują te same pliki w osobnych
+procesach (na przemian, `--rounds` rund), a wynikiem jest najlepszy czas.
+
+Użycie: python benchmarks/bench_fields.py [katalog_z_csv] [--baseline REF] [--rows N] [--rounds N]
+"""
+import argparse
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import write_sales_lists  # noqa: E402
+
+
+ROOT = Path(__file__).resolve().parent.parent
+# Ostatni commit, w którym parser czytał tylko rok, markę, model, typ i przebieg
+DEFAULT_BASELINE = "e17a0f0"
+
+_MEASURE = """
+import sys, time
+from pathlib import Path
+from parser import CsvAuctionParser
+repeat, paths = int(sys.argv[1]), [Path(p) for p in sys.argv[2:]]
+best = float("inf")
+for _ in range(repeat):
+    parser = CsvAuctionParser()
+    start = time.perf_counter()
+    rows = sum(len(parser.parse_file(p)) for p in paths)
+    best = min(best, time.perf_counter() - start)
+print(rows, best)
+"""
+
+
+def _export_src(ref: str, target: Path) -> Path:
+    archive = subprocess.run(["git", "archive", ref, "src"], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target, filter="data")
+    return target / "src"
+
+
+def _measure(src: Path, paths: list[Path], repeat: int) -> tuple[int, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE, str(repeat), *map(str, paths)],
+        cwd=src, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return int(out[0]), float(out[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", type=Path)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data_dir is not None:
+            paths = sorted(p.resolve() for p in args.data_dir.glob("*.csv"))
+        else:
+            paths = write_sales_lists(Path(tmp) / "data", args.rows, rows_per_file=10_000)
+        baseline_src = _export_src(args.baseline, Path(tmp) / "baseline")
+
+        # rundy na przemian, żeby szum maszyny rozkładał się na obie wersje
+        baseline = current = float("inf")
+        for _ in range(args.rounds):
+            rows, elapsed = _measure(baseline_src, paths, args.repeat)
+            baseline = min(baseline, elapsed)
+            _, elapsed = _measure(ROOT / "src", paths, args.repeat)
+            current = min(current, elapsed)
+
+    print(f"{'wersja':<24} {'czas':>8} {'wierszy/s':>12}")
+    print(f"{'bazowa (' + args.baseline + ')':<24} {baseline:>7.3f}s {rows / baseline:>12,.0f}")
+    print(f"{'z nowymi kolumnami':<24} {current:>7.3f}s {rows / current:>12,.0f}")
+    print(f"spowolnienie: {(current / baseline - 1) * 100:+.1f}% (limit: +15%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Zużycie pamięci: list[Auction] vs kolumnowa AuctionFrame.
+
+Użycie: python benchmarks/bench_frame.py [katalog_z_csv] [--copies N]
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+
+
+def _allocated(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", default=Path(__file__).resolve().parent.parent / "data", type=Path)
+    parser.add_argument("--copies", type=int, default=10, help="ile razy powielić zestaw plików")
+    args = parser.parse_args()
+
+    paths = sorted(args.data_dir.glob("*.csv")) * args.copies
+    loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL)
+
+    auctions, list_bytes = _allocated(lambda: loader.load(paths))
+    count = len(auctions)
+    del auctions
+    frame, frame_bytes = _allocated(lambda: loader.load_frame(paths))
+
+    print(f"{count} aukcji")
+    print(f"list[Auction]: {list_bytes / 2**20:8.2f} MiB ({list_bytes / count:.0f} B/wiersz)")
+    print(f"AuctionFrame:  {frame_bytes / 2**20:8.2f} MiB ({frame_bytes / count:.0f} B/wiersz)")
+    print(f"oszczędność: {list_bytes / frame_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
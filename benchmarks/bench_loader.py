@@ -0,0 +1,47 @@
+"""Porównanie czasu ładowania dla strategii thread / process / serial.
+
+Użycie: python benchmarks/bench_loader.py [katalog_z_csv] [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+
+
+def _best_time(loader: AuctionLoader, paths: list[Path], repeat: int) -> tuple[float, int]:
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(loader.load(paths))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", default=Path(__file__).resolve().parent.parent / "data", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=8)
+    args = parser.parse_args()
+
+    paths = sorted(args.data_dir.glob("*.csv"))
+    print(f"{len(paths)} plików z {args.data_dir}")
+
+    timings = {}
+    for strategy in ExecutorStrategy:
+        loader = AuctionLoader(CsvAuctionParser(), strategy, chunk_size=args.chunk_size)
+        timings[strategy], count = _best_time(loader, paths, args.repeat)
+        print(f"{strategy.value:>8}: {timings[strategy]:.3f}s ({count} aukcji)")
+
+    baseline = timings[ExecutorStrategy.THREAD]
+    for strategy, elapsed in timings.items():
+        print(f"przyspieszenie {strategy.value} vs thread: {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
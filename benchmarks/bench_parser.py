@@ -0,0 +1,57 @@
+"""csv.DictReader vs ProjectedReader (kolumny z PROJECTION) na plikach z data/.
+
+Użycie: python benchmarks/bench_parser.py [katalog_z_csv] [--repeat N]
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from parser import PROJECTION, CsvAuctionParser, ProjectedReader  # noqa: E402
+
+
+def _read_dicts(path: Path) -> list:
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _read_projected(path: Path) -> list:
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        return list(ProjectedReader(f, PROJECTION))
+
+
+def _measure(read, paths: list[Path], repeat: int) -> tuple[float, int, float]:
+    best, rows = float("inf"), []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = [row for path in paths for row in read(path)]
+        best = min(best, time.perf_counter() - start)
+    row_bytes = sum(sys.getsizeof(r) for r in rows) / len(rows)
+    return best, len(rows), row_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", default=Path(__file__).resolve().parent.parent / "data", type=Path)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    paths = sorted(args.data_dir.glob("*.csv"))
+
+    results = {}
+    for label, read in (("DictReader", _read_dicts), ("ProjectedReader", _read_projected)):
+        elapsed, rows, row_bytes = _measure(read, paths, args.repeat)
+        results[label] = (elapsed, row_bytes)
+        print(f"{label:<16} {rows / elapsed:>12,.0f} wierszy/s, obiekt wiersza: {row_bytes:6.0f} B")
+    (dict_time, dict_bytes), (proj_time, proj_bytes) = results.values()
+    print(f"przyspieszenie odczytu: {dict_time / proj_time:.2f}x, mniej alokacji na wiersz: {dict_bytes / proj_bytes:.1f}x")
+
+    start = time.perf_counter()
+    count = sum(len(CsvAuctionParser().parse_file(p)) for p in paths)
+    print(f"pełne parse_file: {count / (time.perf_counter() - start):,.0f} wierszy/s")
+
+
+if __name__ == "__main__":
+    main()
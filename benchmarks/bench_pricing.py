@@ -0,0 +1,72 @@
+"""Percentyle ACV per (marka, model, przedział lat): skrypt na group_by_* vs pricing.
+
+Wersja "skryptowa" to typowe złożenie istniejących pomocników AuctionService
+(group_by_make, a w grupie filtr po modelu i filter_by_year na przedział)
+z statistics.quantiles na listach. Wersja kolumnowa to jedno sortowanie
+w `pricing.prices_by_make_model_year`.
+
+Użycie: python benchmarks/bench_pricing.py [--rows N] [--bucket-years N]
+"""
+import argparse
+import math
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+from pricing import PriceSummary, prices_by_make_model_year  # noqa: E402
+from service import AuctionService  # noqa: E402
+from synthetic import write_sales_lists  # noqa: E402
+
+
+def _scripted(auctions, bucket_years: int) -> dict:
+    result = {}
+    for make, by_make in AuctionService.group_by_make(auctions).items():
+        for model in {a.vehicle.model for a in by_make}:
+            by_model = [a for a in by_make if a.vehicle.model == model]
+            for start in sorted({a.vehicle.year // bucket_years * bucket_years for a in by_model}):
+                bucket = AuctionService.filter_by_year(by_model, start, start + bucket_years - 1)
+                values = sorted(a.acv_cents for a in bucket if a.acv_cents is not None)
+                if len(values) >= 2:
+                    deciles = statistics.quantiles(values, n=10, method="inclusive")
+                    result[(make, model, start)] = PriceSummary(len(values), deciles[0], deciles[4], deciles[8])
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--bucket-years", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_sales_lists(Path(tmp), args.rows)
+        loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL)
+        auctions = loader.load(paths)
+        frame = loader.load_frame(paths)
+
+    start = time.perf_counter()
+    scripted = _scripted(auctions, args.bucket_years)
+    scripted_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar = prices_by_make_model_year(frame, args.bucket_years)
+    columnar_time = time.perf_counter() - start
+
+    assert all(
+        all(map(math.isclose, columnar[key], summary)) for key, summary in scripted.items()
+    ), "wyniki się różnią"
+    print(f"{len(auctions)} aukcji, {len(columnar)} grup")
+    print(f"group_by_* + statistics: {scripted_time:8.3f}s")
+    print(f"pricing (jedno sortowanie): {columnar_time:5.3f}s")
+    print(f"przyspieszenie: {scripted_time / columnar_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
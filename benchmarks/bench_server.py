@@ -0,0 +1,134 @@
+"""Test obciążenia serwera zapytań (src/server.py): przepustowość i opóźnienia p50/p99.
+
+Bez --url skrypt generuje syntetyczne dane, uruchamia serwer w osobnym
+procesie na wolnym porcie i zatrzymuje go na końcu. Klienci (--clients)
+utrzymują połączenia keep-alive i wysyłają losowe zapytania z mieszanki;
+--unique to odsetek zapytań z parametrami, które nie powtarzają się
+(zawsze liczone od zera), reszta trafia w cache wyników.
+
+Użycie: python benchmarks/bench_server.py [--rows N] [--requests N] [--clients N] [--unique 0.2]
+       [--workers N] [--url URL]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import MODELS, write_sales_lists  # noqa: E402
+
+
+ROOT = Path(__file__).resolve().parent.parent
+MAKES = list(MODELS)
+QUERIES = [
+    "/statistics",
+    "/top-makes?n=10",
+    "/top-models?n=5",
+    "/mileage-by-year",
+    "/count?make=ford&year_min=2015",
+    "/top-models?make=toyota,honda&n=5",
+    "/statistics?vehicle_type=SUV",
+    "/auctions?make=kia&year_min=2020&limit=20",
+]
+
+
+def _unique_query(rng: random.Random) -> str:
+    makes = ",".join(rng.sample(MAKES, 2))
+    return f"/statistics?make={makes}&year_min={rng.randint(1990, 2024)}&year_max={rng.randint(2000, 2030)}"
+
+
+async def _client(host: str, port: int, targets: list[str], latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    for target in targets:
+        start = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        length = 0
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def _get_json(host: str, port: int, target: str) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.partition(b"\r\n\r\n")[2])
+
+
+async def _load_test(host: str, port: int, args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    targets = [
+        _unique_query(rng) if rng.random() < args.unique else rng.choice(QUERIES) for _ in range(args.requests)
+    ]
+    before = (await _get_json(host, port, "/health"))["cache"]
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, targets[i::args.clients], latencies) for i in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    health = await _get_json(host, port, "/health")
+    hits = health["cache"]["hits"] - before["hits"]
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(f"{health['auctions']} aukcji, {len(latencies)} zapytań, {args.clients} klientów, "
+          f"{args.unique:.0%} unikalnych, trafienia w cache: {hits / len(latencies):.0%}")
+    print(f"przepustowość: {len(latencies) / elapsed:,.0f} zapytań/s")
+    print(f"p50: {cuts[49] * 1000:.2f}ms  p90: {cuts[89] * 1000:.2f}ms  "
+          f"p99: {cuts[98] * 1000:.2f}ms  max: {max(latencies) * 1000:.2f}ms")
+
+
+def _start_server(data_dir: Path, workers: int | None) -> tuple[subprocess.Popen, str, int]:
+    command = [sys.executable, str(ROOT / "src" / "server.py"), "--data", str(data_dir), "--port", "0"]
+    process = subprocess.Popen(
+        command + (["--workers", str(workers)] if workers else []),
+        stdout=subprocess.PIPE, text=True,
+    )
+    for line in process.stdout:
+        print(f"[serwer] {line.rstrip()}")
+        if line.startswith("Nasłuchuje na "):
+            url = urlsplit(line.split()[-1])
+            return process, url.hostname, url.port
+    raise RuntimeError("Serwer nie wystartował")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--unique", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, help="rozmiar puli serwera uruchamianego przez skrypt")
+    parser.add_argument("--url", help="adres działającego serwera (bez uruchamiania własnego)")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        asyncio.run(_load_test(url.hostname, url.port, args))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        write_sales_lists(Path(tmp) / "data", args.rows)
+        process, host, port = _start_server(Path(tmp) / "data", args.workers)
+        try:
+            asyncio.run(_load_test(host, port, args))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
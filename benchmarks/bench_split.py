@@ -0,0 +1,68 @@
+"""Jeden duży eksport: ładowanie w procesach bez podziału vs z podziałem na fragmenty.
+
+Bez podziału cały plik to jedno zadanie - pozostałe procesy czekają. Skrypt
+mierzy czas ścienny `AuctionLoader.load` oraz najdłuższe pojedyncze zadanie
+(ścieżkę krytyczną), które ogranicza czas ścienny przy dostatecznej liczbie
+rdzeni - na maszynie z jednym rdzeniem zysk widać tylko w tej drugiej kolumnie.
+
+Użycie: python benchmarks/bench_split.py [--rows N] [--split-mib N] [--workers N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+from synthetic import write_sales_lists  # noqa: E402
+
+
+def _longest_task(parser: CsvAuctionParser, path: Path, split_bytes: int | None) -> float:
+    parts = parser.split(path, split_bytes) if split_bytes else None
+    if parts is None:
+        start = time.perf_counter()
+        parser.parse_file(path)
+        return time.perf_counter() - start
+    longest = 0.0
+    for part in parts:
+        start = time.perf_counter()
+        parser.parse_range(part)
+        longest = max(longest, time.perf_counter() - start)
+    return longest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--split-mib", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    split_bytes = args.split_mib << 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        [path] = write_sales_lists(Path(tmp), args.rows, rows_per_file=args.rows)
+        size = path.stat().st_size
+        print(f"1 plik, {args.rows} wierszy, {size / 2**20:.0f} MiB, {args.workers} proces(y)")
+        start = time.perf_counter()
+        parts = CsvAuctionParser().split(path, split_bytes)
+        print(f"podział na {len(parts)} fragmentów: {time.perf_counter() - start:.3f}s")
+
+        print(f"{'':<16} {'czas ścienny':>13} {'najdłuższe zadanie':>19}")
+        for label, threshold in (("bez podziału", None), ("z podziałem", split_bytes)):
+            loader = AuctionLoader(
+                CsvAuctionParser(), ExecutorStrategy.PROCESS, max_workers=args.workers, split_bytes=threshold,
+            )
+            start = time.perf_counter()
+            count = len(loader.load([path]))
+            wall = time.perf_counter() - start
+            longest = _longest_task(CsvAuctionParser(), path, threshold)
+            print(f"{label:<16} {wall:>12.2f}s {longest:>18.2f}s  ({count} aukcji)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""SQLite (AuctionStore) vs list[Auction] w pamięci: ładowanie i opóźnienia zapytań.
+
+Mierzy ładowanie syntetycznych plików do bazy, ponowne ładowanie (pliki już
+zapisane są pomijane) oraz medianę czasu zapytań odpowiadających
+`AuctionService` - na liście w pamięci i jako SQL z indeksami.
+
+Użycie: python benchmarks/bench_storage.py [--rows N] [--repeat N]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+from service import AuctionService  # noqa: E402
+from storage import AuctionStore  # noqa: E402
+from synthetic import write_sales_lists  # noqa: E402
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_sales_lists(Path(tmp) / "data", args.rows)
+        start = time.perf_counter()
+        auctions = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL).load(paths)
+        print(f"{len(auctions)} aukcji, {len(paths)} plików")
+        print(f"ładowanie do pamięci: {time.perf_counter() - start:.2f}s")
+
+        with AuctionStore(Path(tmp) / "auctions.db") as store:
+            start = time.perf_counter()
+            report = store.load(CsvAuctionParser(), paths)
+            elapsed = time.perf_counter() - start
+            print(f"ładowanie do SQLite:  {elapsed:.2f}s ({report.rows / elapsed:,.0f} wierszy/s)")
+            start = time.perf_counter()
+            report = store.load(CsvAuctionParser(), paths)
+            print(f"ponowne ładowanie:    {time.perf_counter() - start:.3f}s (pominięto {len(report.skipped)} plików)")
+            size = sum(p.stat().st_size for p in Path(tmp).glob("auctions.db*"))
+            print(f"rozmiar bazy: {size / 2**20:.0f} MiB\n")
+
+            day = datetime(2024, 1, 2, tzinfo=timezone.utc)
+            week = (day, day + timedelta(days=7))
+            query = store.query()
+            cases = [
+                ("filter_by_make(subaru)",
+                 lambda: AuctionService.filter_by_make(auctions, ["subaru"]),
+                 lambda: query.filter_by_make(["subaru"]).to_auctions()),
+                ("filter_by_year(2024)",
+                 lambda: AuctionService.filter_by_year(auctions, 2024),
+                 lambda: query.filter_by_year(2024).to_auctions()),
+                ("filter_by_date_range(7 dni)",
+                 lambda: AuctionService.filter_by_date_range(auctions, *week),
+                 lambda: query.filter_by_date_range(*week).to_auctions()),
+                ("make + year -> count",
+                 lambda: len(AuctionService.filter_by_year(AuctionService.filter_by_make(auctions, ["kia"]), 2020)),
+                 lambda: query.filter_by_make(["kia"]).filter_by_year(2020).count()),
+                ("get_top_makes",
+                 lambda: AuctionService.get_top_makes(auctions),
+                 lambda: query.get_top_makes()),
+                ("get_average_mileage_by_year",
+                 lambda: AuctionService.get_average_mileage_by_year(auctions),
+                 lambda: query.get_average_mileage_by_year()),
+                ("get_statistics",
+                 lambda: AuctionService.get_statistics(auctions),
+                 lambda: query.get_statistics()),
+                ("get_statistics(make)",
+                 lambda: AuctionService.get_statistics(AuctionService.filter_by_make(auctions, ["subaru"])),
+                 lambda: query.filter_by_make(["subaru"]).get_statistics()),
+            ]
+            print(f"{'zapytanie':<30} {'pamięć':>10} {'SQLite':>10}")
+            for name, in_memory, sql in cases:
+                memory_ms, sql_ms = _median_ms(in_memory, args.repeat), _median_ms(sql, args.repeat)
+                print(f"{name:<30} {memory_ms:>8.1f}ms {sql_ms:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Pamięć strumieniowego potoku CSV -> agregaty na syntetycznych danych.
+
+Szczytowe RSS jest raportowane co `--report-every` wierszy - przy stałym oknie
+(`max_pending`) powinno pozostać płaskie niezależnie od liczby plików.
+
+Użycie: python benchmarks/bench_streaming.py [--rows 10000000] [--data-dir katalog]
+"""
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aggregates import AverageMileageByYear, BranchCounts, TopMakes, TopModels  # noqa: E402
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+from stats import StatisticsAccumulator  # noqa: E402
+from synthetic import write_sales_lists  # noqa: E402
+
+
+def _peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def run(paths: list[Path], strategy: str, max_pending: int, report_every: int) -> None:
+    aggregators = [TopMakes(10), TopModels(10), AverageMileageByYear(), BranchCounts(),
+                   StatisticsAccumulator(exact=False)]
+    adders = [a.add for a in aggregators]
+    loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy(strategy))
+    rows, start = 0, time.perf_counter()
+
+    for auction in loader.iter_auctions(paths, max_pending=max_pending):
+        for add in adders:
+            add(auction)
+        rows += 1
+        if rows % report_every == 0:
+            print(f"{rows:>12,} wierszy, peak RSS {_peak_rss_mib():8.1f} MiB")
+    elapsed = time.perf_counter() - start
+    print(f"razem {rows:,} wierszy z {len(paths)} plików w {elapsed:.1f}s "
+          f"({rows / elapsed:,.0f} wierszy/s), peak RSS {_peak_rss_mib():.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--data-dir", type=Path, help="istniejące pliki zamiast generowania")
+    parser.add_argument("--strategy", default="thread", choices=[s.value for s in ExecutorStrategy])
+    parser.add_argument("--max-pending", type=int, default=4)
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.data_dir:
+        run(sorted(args.data_dir.glob("*.csv")), args.strategy, args.max_pending, args.report_every)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generowanie {args.rows} wierszy...")
+        paths = write_sales_lists(Path(tmp), args.rows, rows_per_file=50_000)
+        run(paths, args.strategy, args.max_pending, args.report_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Zestaw benchmarków etapów: parse, load, filter, group, statistics.
+
+Dane to syntetyczne eksporty z `synthetic.py` (stałe ziarno, więc każdy commit
+mierzy te same pliki), generowane raz per rozmiar do `--data-dir`. Każdy
+rozmiar jest mierzony w osobnym procesie - szczytowe RSS nie przenosi się
+między rozmiarami; RSS etapu to szczyt procesu po jego zakończeniu.
+
+Wyniki (czas, wierszy/s, peak RSS) trafiają do JSON-a; `--compare` zestawia
+je z wcześniejszym plikiem, a `--ref` mierzy src/ z innego commita.
+
+Użycie: python benchmarks/bench_suite.py [--sizes 10k 1m 10m] [--repeat N] [--ref REF]
+                                         [--output plik.json] [--compare poprzedni.json]
+"""
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_fields import ROOT, _export_src  # noqa: E402
+from synthetic import write_sales_lists  # noqa: E402
+
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+# Zmiana czasu etapu powyżej tego progu jest oznaczana w `--compare`
+REGRESSION_THRESHOLD = 0.10
+
+
+def _peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def _dataset(data_dir: Path, size: str) -> list[Path]:
+    """Pliki dla rozmiaru - generowane tylko, jeśli nie ma kompletnego zestawu."""
+    directory = data_dir / size
+    done = directory / ".complete"
+    if not done.exists():
+        print(f"Generowanie {SIZES[size]:,} wierszy do {directory}...", file=sys.stderr)
+        for stale in directory.glob("*.csv"):
+            stale.unlink()
+        write_sales_lists(directory, SIZES[size])
+        done.touch()
+    return sorted(directory.glob("*.csv"))
+
+
+def measure(src: Path, paths: list[Path], repeat: int) -> dict:
+    """Mierzy etapy na kodzie z `src` (w bieżącym procesie)."""
+    sys.path.insert(0, str(src))
+    from loader import AuctionLoader, ExecutorStrategy
+    from models import VehicleType
+    from parser import CsvAuctionParser
+    from service import AuctionService
+
+    def best(fn) -> tuple[float, object]:
+        times, result = [], None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    def parse() -> int:
+        parser = CsvAuctionParser()
+        return sum(len(parser.parse_file(path)) for path in paths)
+
+    def filters() -> None:
+        AuctionService.filter_by_year(auctions, 2010, 2020)
+        AuctionService.filter_by_make(auctions, ["FORD", "toyota", "Honda"])
+        AuctionService.filter_by_vehicle_type(auctions, VehicleType.AUTOMOBILE)
+        AuctionService.filter_by_date_range(auctions, since, until)
+
+    def groups() -> None:
+        AuctionService.group_by_make(auctions)
+        AuctionService.group_by_branch(auctions)
+        AuctionService.group_by_vehicle_type(auctions)
+
+    stages = {}
+    seconds, rows = best(parse)
+    stages["parse"] = seconds, _peak_rss_mib()
+    loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.THREAD)
+    seconds, auctions = best(lambda: loader.load(paths))
+    stages["load"] = seconds, _peak_rss_mib()
+    dates = sorted(a.auction_date_utc for a in auctions[::1000])
+    since, until = dates[len(dates) // 4], dates[3 * len(dates) // 4]
+    for name, fn in (
+        ("filter", filters),
+        ("group", groups),
+        ("statistics", lambda: AuctionService.get_statistics(auctions)),
+    ):
+        seconds, _ = best(fn)
+        stages[name] = seconds, _peak_rss_mib()
+
+    return {
+        "files": len(paths),
+        "rows": rows,
+        "stages": {
+            name: {"seconds": seconds, "rows_per_s": rows / seconds, "peak_rss_mib": rss}
+            for name, (seconds, rss) in stages.items()
+        },
+    }
+
+
+def _run_size(src: Path, paths: list[Path], repeat: int) -> dict:
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        listing.write("\n".join(map(str, paths)))
+    try:
+        out = subprocess.run(
+            [sys.executable, __file__, "--measure", listing.name, "--src", str(src), "--repeat", str(repeat)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+    finally:
+        Path(listing.name).unlink()
+    return json.loads(out)
+
+
+def _commit(ref: str) -> str:
+    return subprocess.run(
+        ["git", "rev-parse", "--short", ref], cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+def _print_results(results: dict) -> None:
+    for size, result in results["sizes"].items():
+        print(f"\n{size}: {result['rows']:,} wierszy w {result['files']} plikach")
+        print(f"{'etap':<12} {'czas [s]':>10} {'wierszy/s':>14} {'peak RSS [MiB]':>15}")
+        for name, stage in result["stages"].items():
+            print(f"{name:<12} {stage['seconds']:>10.3f} {stage['rows_per_s']:>14,.0f} "
+                  f"{stage['peak_rss_mib']:>15.1f}")
+
+
+def _print_comparison(previous: dict, current: dict) -> None:
+    print(f"\nPorównanie {previous['commit']} -> {current['commit']} (czas, >1 = wolniej)")
+    for size, result in current["sizes"].items():
+        before = previous["sizes"].get(size)
+        if before is None:
+            continue
+        print(f"{size}:")
+        for name, stage in result["stages"].items():
+            old = before["stages"].get(name)
+            if old is None:
+                continue
+            ratio = stage["seconds"] / old["seconds"]
+            flag = "  <- regresja" if ratio > 1 + REGRESSION_THRESHOLD else ""
+            print(f"  {name:<12} {old['seconds']:>9.3f}s {stage['seconds']:>9.3f}s {ratio:>6.2f}x{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["10k"], choices=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--data-dir", type=Path, default=ROOT / ".cache" / "bench",
+                        help="katalog na wygenerowane dane (wielokrotnego użytku)")
+    parser.add_argument("--ref", help="mierz src/ z podanego commita zamiast kopii roboczej")
+    parser.add_argument("--output", type=Path, help="plik JSON z wynikami (domyślnie w --data-dir)")
+    parser.add_argument("--compare", type=Path, help="wcześniejszy plik JSON do porównania")
+    parser.add_argument("--measure", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--src", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        paths = [Path(line) for line in args.measure.read_text().splitlines()]
+        print(json.dumps(measure(args.src, paths, args.repeat)))
+        return
+
+    commit = _commit(args.ref or "HEAD")
+    dirty = args.ref is None and bool(subprocess.run(
+        ["git", "status", "--porcelain", "src"], cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout)
+    results = {
+        "commit": commit + ("-dirty" if dirty else ""),
+        "python": platform.python_version(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        src = _export_src(args.ref, Path(tmp)) if args.ref else ROOT / "src"
+        for size in args.sizes:
+            results["sizes"][size] = _run_size(src, _dataset(args.data_dir, size), args.repeat)
+
+    output = args.output or args.data_dir / f"results-{results['commit']}-{'-'.join(args.sizes)}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    _print_results(results)
+    print(f"\nZapisano {output}")
+    if args.compare:
+        _print_comparison(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Tablica symboli (marka/model/oddział) vs wersja bez niej: pamięć i czas filtrów.
+
+Kod bazowy jest wyciągany z gita jak w bench_fields.py; obie wersje ładują
+ten sam zbiór (wszystkie pliki z data/, powielone `--copies` razy) w osobnych
+procesach i mierzą pamięć list[Auction] oraz filter_by_make / group_by_make.
+
+Użycie: python benchmarks/bench_symbols.py [katalog_z_csv] [--baseline REF] [--copies N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_fields import ROOT, _export_src  # noqa: E402
+
+
+# Ostatni commit bez wspólnej tablicy symboli
+DEFAULT_BASELINE = "c61c569"
+
+_MEASURE = """
+import gc, json, sys, time, tracemalloc
+from pathlib import Path
+from loader import AuctionLoader, ExecutorStrategy
+from parser import CsvAuctionParser
+from service import AuctionService
+
+repeat, paths = int(sys.argv[1]), [Path(p) for p in sys.argv[2:]]
+loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL)
+start = time.perf_counter()
+loader.load(paths)
+load = time.perf_counter() - start
+
+gc.collect()
+tracemalloc.start()
+auctions = loader.load(paths)
+gc.collect()
+memory = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+def best(fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+print(json.dumps({
+    "rows": len(auctions),
+    "load": load,
+    "memory": memory,
+    "filter_by_make": best(lambda: AuctionService.filter_by_make(auctions, ["ford", "Toyota", "HONDA"])),
+    "group_by_make": best(lambda: AuctionService.group_by_make(auctions)),
+}))
+"""
+
+
+def _measure(src: Path, paths: list[Path], repeat: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE, str(repeat), *map(str, paths)],
+        cwd=src, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", default=ROOT / "data", type=Path)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--copies", type=int, default=20, help="ile razy powielić zestaw plików")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    paths = sorted(p.resolve() for p in args.data_dir.glob("*.csv")) * args.copies
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = _measure(_export_src(args.baseline, Path(tmp)), paths, args.repeat)
+    current = _measure(ROOT / "src", paths, args.repeat)
+
+    print(f"{current['rows']} aukcji")
+    print(f"{'':<20} {'bazowa':>10} {'symbole':>10} {'zysk':>7}")
+    print(f"{'pamięć [MiB]':<20} {baseline['memory'] / 2**20:>10.2f} {current['memory'] / 2**20:>10.2f} "
+          f"{baseline['memory'] / current['memory']:>6.2f}x")
+    for name in ("load", "filter_by_make", "group_by_make"):
+        print(f"{name + ' [ms]':<20} {baseline[name] * 1e3:>10.1f} {current[name] * 1e3:>10.1f} "
+              f"{baseline[name] / current[name]:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Parsowanie dat aukcji: dateutil na każdy wiersz vs szybka ścieżka z cache.
+
+Użycie: python benchmarks/bench_time_utils.py [katalog_z_csv] [--repeat N]
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from time_utils import _parse_cached, _parse_with_dateutil, parse_auction_datetime  # noqa: E402
+
+
+def _rows_per_sec(func, values: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        _parse_cached.cache_clear()
+        start = time.perf_counter()
+        for value in values:
+            func(value)
+        best = min(best, time.perf_counter() - start)
+    return len(values) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("data_dir", nargs="?", default=Path(__file__).resolve().parent.parent / "data", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    values = []
+    for path in sorted(args.data_dir.glob("*.csv")):
+        with path.open(encoding="utf-8-sig") as f:
+            values.extend(row["Auction Date"] for row in csv.DictReader(f))
+    print(f"{len(values)} wierszy, {len(set(values))} różnych wartości")
+
+    before = _rows_per_sec(_parse_with_dateutil, values, args.repeat)
+    after = _rows_per_sec(parse_auction_datetime, values, args.repeat)
+    print(f"dateutil:        {before:>12,.0f} wierszy/s")
+    print(f"fast path+cache: {after:>12,.0f} wierszy/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Histogram aukcji per oddział / lokalny dzień / godzina: astimezone per wiersz vs CalendarHistogram.
+
+Wariant bazowy przelicza każdą aukcję przez `astimezone`; `CalendarHistogram`
+zlicza pary (oddział, znacznik UTC) kolumnami ramki i przelicza tylko
+unikalne pary przez tabelę zmian czasu (`ZoneTable`).
+
+Użycie: python benchmarks/bench_timeseries.py [--rows N]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from loader import AuctionLoader, ExecutorStrategy  # noqa: E402
+from parser import CsvAuctionParser  # noqa: E402
+from synthetic import write_sales_lists  # noqa: E402
+from time_utils import LOCAL_TZ  # noqa: E402
+from timeseries import CalendarHistogram, zone_table  # noqa: E402
+
+
+def _astimezone(auctions) -> Counter:
+    counts: Counter = Counter()
+    for auction in auctions:
+        local = auction.auction_date_utc.astimezone(LOCAL_TZ)
+        counts[auction.branch, local.date(), local.hour] += 1
+    return counts
+
+
+def _flatten(result: dict) -> Counter:
+    return Counter({
+        (branch, day, hour): n
+        for branch, days in result.items()
+        for day, hours in days.items()
+        for hour, n in enumerate(hours) if n
+    })
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_sales_lists(Path(tmp), args.rows)
+        loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL)
+        auctions = loader.load(paths)
+        frame = loader.load_frame(paths)
+    print(f"{len(auctions)} aukcji")
+
+    _, build = _timed(lambda: zone_table.__wrapped__(LOCAL_TZ))
+    print(f"tabela zmian czasu {LOCAL_TZ.key}: {build * 1000:.1f}ms")
+
+    expected, baseline = _timed(lambda: _astimezone(auctions))
+
+    def stream():
+        histogram = CalendarHistogram()
+        for auction in auctions:
+            histogram.add(auction)
+        return histogram.result()
+
+    def columns():
+        histogram = CalendarHistogram()
+        histogram.add_frame(frame)
+        return histogram.result()
+
+    print(f"{'wariant':<34} {'czas':>8} {'przyspieszenie':>15}")
+    print(f"{'astimezone per wiersz':<34} {baseline:>7.2f}s {1:>14.1f}x")
+    for label, fn in (("CalendarHistogram.add (strumień)", stream), ("CalendarHistogram.add_frame", columns)):
+        result, elapsed = _timed(fn)
+        assert _flatten(result) == expected
+        print(f"{label:<34} {elapsed:>7.2f}s {baseline / elapsed:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Generator syntetycznych eksportów Copart (Sales_List_*.csv) do benchmarków.
+
+Pliki mają ten sam 42-kolumnowy nagłówek co dane w `data/`, te same formaty
+dat ("Mon Mar 04, 8:30am CST"), przebiegów ("162,022 mi") i kwot ("$8,411 USD")
+oraz pola z przecinkami w cudzysłowach.
+
+Użycie: python benchmarks/synthetic.py katalog --rows 1000000 [--rows-per-file 50000]
+"""
+import argparse
+import csv
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+
+HEADER = [
+    "Auction Date", "Branch Name", "Stock Number", "Year", "Make", "Model", "Series Name",
+    "Current Bid", "Title/Sale Document", "Public", "Primary Damage", "Secondary Damage",
+    "Loss Type", "New Inventory Time", "Timed Auction", "Vehicle Type", "Vehicle Subtype",
+    "Odometer", "ODO Status", "Start Code", "Air Bags", "Key", "Exterior Color",
+    "Interior Color", "Engine", "Fuel Type", "Cylinders", "Vin#", "Country",
+    "Transmission Type", "Seller", "Drive Line Type", "Body Style", "Country of Origin",
+    "Offsite", "Lane", "Run", "Aisle", "Stall", "Seller Type", "ACV", "Region",
+]
+
+BRANCHES = {
+    "New Castle": "EST", "Atlanta West": "EST", "Chicago North": "CST", "Dallas": "CST",
+    "Houston": "CST", "Kansas City": "CST", "Orlando South": "EST", "Hartford": "EST",
+    "Warsaw": "CEST",
+}
+MODELS = {
+    "FORD": ["F-150", "ESCAPE", "FOCUS", "FUSION", "EXPLORER", "MUSTANG"],
+    "CHEVROLET": ["SILVERADO 1500", "EQUINOX", "MALIBU", "IMPALA", "TAHOE"],
+    "TOYOTA": ["CAMRY", "COROLLA", "RAV4", "TACOMA", "PRIUS"],
+    "NISSAN": ["ALTIMA", "ROGUE", "SENTRA", "MAXIMA"],
+    "HONDA": ["CIVIC", "ACCORD", "CR-V", "ODYSSEY"],
+    "DODGE": ["CHARGER", "RAM 1500", "GRAND CARAVAN"],
+    "HYUNDAI": ["ELANTRA", "SONATA", "TUCSON"],
+    "SUBARU": ["OUTBACK", "FORESTER", "IMPREZA"],
+    "KIA": ["OPTIMA", "SOUL", "SORENTO"],
+    "JEEP": ["WRANGLER", "GRAND CHEROKEE", "LIBERTY"],
+    "HARLEY-DAVIDSON": ["FLHX", "XL883"],
+}
+VEHICLE_TYPES = [
+    "Automobiles", "Automobiles", "Automobiles", "SUVs", "SUVs", "Vans", "Motorcycles",
+    "Pick-up Trucks", "Heavy Duty Trucks", "Recreational/ Miscellaneous", "Automobiles,Fleet Vehicles",
+]
+DAMAGES = ["Front End", "Rear", "Right Side", "Left Side", "All Over", "Hail", "Normal Wear & Tear", "Mechanical"]
+TITLES = ["Salvage", "Clear", "Bill Of Sale", "Non-Repairable", "SALVAGE-DE", "CLEAR-WY"]
+ODO_STATUSES = ["", "", "", "Not Required/Exempt", "Inoperable Digital Dash", "Not Actual", "Unknown"]
+START_CODES = ["Run & Drive", "Run & Drive", "Stationary", "Starts", " ", ""]
+ENGINES = ["5.3L V-8 295HP", "1.2L I-4 DOHC, VVT, 84HP", "2.5L I-4 DOHC, VVT, 178HP", "3.5L V-6 DOHC, VVT, 290HP"]
+TIMES = ["8:30am", "9:30am", "10:30am", "12:30pm", "3:30pm"]
+VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+
+
+def _money(rng: random.Random, high: int) -> str:
+    return f"${rng.randrange(0, high):,} USD"
+
+
+def _auction_date(day: date, tz: str, rng: random.Random) -> str:
+    zone = "CEDT / CEST" if tz == "CEST" else tz
+    return f"{day:%a %b %d}, {rng.choice(TIMES)} {zone}"
+
+
+def _row(rng: random.Random, stock_number: int, day: date) -> list[str]:
+    branch, tz = rng.choice(list(BRANCHES.items()))
+    make = rng.choice(list(MODELS))
+    odometer = rng.random()
+    return [
+        _auction_date(day, tz, rng),
+        branch,
+        str(stock_number),
+        str(rng.randint(1970, 2025)),
+        make,
+        rng.choice(MODELS[make]),
+        rng.choice(["", "LS", "SE", "LIMITED"]),
+        "" if rng.random() < 0.25 else _money(rng, 5_000),
+        rng.choice(TITLES),
+        "NO",
+        rng.choice(DAMAGES),
+        rng.choice(["UNKNOWN", "Minor Dent/Scratches", ""]),
+        "Collision",
+        _auction_date(day - timedelta(days=rng.randrange(1, 20)), tz, rng),
+        "NO",
+        rng.choice(VEHICLE_TYPES),
+        "",
+        "" if odometer < 0.05 else f"{rng.randrange(0, 400_000):,} mi",
+        rng.choice(ODO_STATUSES),
+        rng.choice(START_CODES),
+        "Intact Airbags",
+        "Key Available",
+        "Gray",
+        "Black",
+        rng.choice(ENGINES),
+        "Gasoline",
+        "4 Cyl",
+        "".join(rng.choices(VIN_CHARS, k=17)),
+        "United States",
+        "Automatic",
+        "State Farm Group Insurance",
+        "Front Wheel Drive",
+        "Sedan 4 Door",
+        "United States",
+        "NO",
+        "A",
+        str(rng.randrange(1, 400)),
+        "A  ",
+        str(rng.randrange(1, 200)),
+        "Insurance",
+        _money(rng, 40_000),
+        "East",
+    ]
+
+
+def write_sales_lists(
+    directory: Path,
+    rows: int,
+    rows_per_file: int = 50_000,
+    seed: int = 0,
+) -> list[Path]:
+    """Zapisuje `rows` wierszy w plikach po `rows_per_file` i zwraca ich ścieżki."""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    start = date(2024, 1, 1)
+    for file_no, offset in enumerate(range(0, rows, rows_per_file)):
+        day = start + timedelta(days=file_no % 700)
+        path = directory / f"Sales_List_{day:%m%d%Y} ({file_no}).csv"
+        with path.open("w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            for i in range(offset, min(rows, offset + rows_per_file)):
+                writer.writerow(_row(rng, 10_000_000 + i, day))
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--rows-per-file", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = write_sales_lists(args.directory, args.rows, args.rows_per_file, args.seed)
+    print(f"Zapisano {args.rows} wierszy w {len(paths)} plikach w {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
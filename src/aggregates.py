@@ -0,0 +1,142 @@
+from collections import Counter
+from typing import Callable, Iterable, Protocol
+
+from models import Auction
+
+
+class Aggregator(Protocol):
+    """Operator agregujący strumień aukcji - jedna aukcja na wywołanie `add`."""
+
+    def add(self, auction: Auction) -> None: ...
+
+    def result(self): ...
+
+
+class RemovableAggregator(Aggregator, Protocol):
+    """Operator, który potrafi też wycofać aukcję (np. zastąpioną nowszą wersją)."""
+
+    def remove(self, auction: Auction) -> None: ...
+
+
+def _decrement(counts: Counter, key) -> None:
+    counts[key] -= 1
+    if counts[key] <= 0:
+        del counts[key]
+
+
+class TopMakes:
+    """Odpowiednik `AuctionService.get_top_makes` dla strumienia."""
+
+    def __init__(self, n: int = 10) -> None:
+        self.n = n
+        self.counts: Counter[str] = Counter()
+
+    def add(self, auction: Auction) -> None:
+        self.counts[auction.vehicle.make] += 1
+
+    def remove(self, auction: Auction) -> None:
+        _decrement(self.counts, auction.vehicle.make)
+
+    def result(self) -> list[tuple[str, int]]:
+        return self.counts.most_common(self.n)
+
+
+class TopModels:
+    """Odpowiednik `AuctionService.get_top_models` dla strumienia."""
+
+    def __init__(self, n: int = 10) -> None:
+        self.n = n
+        self.counts: Counter[str] = Counter()
+
+    def add(self, auction: Auction) -> None:
+        self.counts[f"{auction.vehicle.make} {auction.vehicle.model}"] += 1
+
+    def remove(self, auction: Auction) -> None:
+        _decrement(self.counts, f"{auction.vehicle.make} {auction.vehicle.model}")
+
+    def result(self) -> list[tuple[str, int]]:
+        return self.counts.most_common(self.n)
+
+
+class AverageMileageByYear:
+    """Odpowiednik `AuctionService.get_average_mileage_by_year` - suma i licznik per rok."""
+
+    def __init__(self) -> None:
+        self.totals: dict[int, list[int]] = {}
+
+    def add(self, auction: Auction) -> None:
+        mileage = auction.vehicle.mileage
+        if mileage is not None:
+            total = self.totals.setdefault(auction.vehicle.year, [0, 0])
+            total[0] += mileage
+            total[1] += 1
+
+    def remove(self, auction: Auction) -> None:
+        mileage = auction.vehicle.mileage
+        if mileage is not None:
+            total = self.totals[auction.vehicle.year]
+            total[0] -= mileage
+            total[1] -= 1
+            if not total[1]:
+                del self.totals[auction.vehicle.year]
+
+    def result(self) -> dict[int, float]:
+        return {year: total / count for year, (total, count) in self.totals.items()}
+
+
+class BranchCounts:
+    """Liczba aukcji per oddział."""
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def add(self, auction: Auction) -> None:
+        self.counts[auction.branch] += 1
+
+    def remove(self, auction: Auction) -> None:
+        _decrement(self.counts, auction.branch)
+
+    def result(self) -> dict[str, int]:
+        return dict(self.counts)
+
+
+class Count:
+    """Liczba aukcji spełniających warunek (np. odpowiednik len(filter_by_year(...)))."""
+
+    def __init__(self, predicate: Callable[[Auction], bool] = lambda a: True) -> None:
+        self.predicate = predicate
+        self.count = 0
+
+    def add(self, auction: Auction) -> None:
+        if self.predicate(auction):
+            self.count += 1
+
+    def remove(self, auction: Auction) -> None:
+        if self.predicate(auction):
+            self.count -= 1
+
+    def result(self) -> int:
+        return self.count
+
+
+class First:
+    """Pierwsza aukcja ze strumienia (np. do pokazania przykładu)."""
+
+    def __init__(self) -> None:
+        self.auction: Auction | None = None
+
+    def add(self, auction: Auction) -> None:
+        if self.auction is None:
+            self.auction = auction
+
+    def result(self) -> Auction | None:
+        return self.auction
+
+
+def aggregate(auctions: Iterable[Auction], *aggregators: Aggregator) -> list:
+    """Konsumuje strumień jeden raz, zasilając wszystkie operatory; zwraca ich wyniki."""
+    adders = [a.add for a in aggregators]
+    for auction in auctions:
+        for add in adders:
+            add(auction)
+    return [a.result() for a in aggregators]
@@ -0,0 +1,218 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from hashlib import blake2b
+from pathlib import Path
+from typing import BinaryIO
+
+import frame as _frame
+import instrumentation
+import models as _models
+import parser as _parser
+import symbols as _symbols
+import time_utils as _time_utils
+from frame import DICTIONARIES, NUMERIC_COLUMNS, AuctionFrame
+from symbols import BRANCHES, MAKES, MODELS
+
+
+# Słowniki ramki, których wartości trafiają do wspólnych tablic symboli
+_SYMBOLS = {"makes": MAKES, "models": MODELS, "branches": BRANCHES}
+
+_MAGIC = b"AUCF"
+_FORMAT_VERSION = 4
+_HEADER = struct.Struct("<4sHI")  # magic, wersja formatu, liczba wierszy
+_STRINGS = struct.Struct("<II")  # liczba stringów, długość bloku UTF-8
+_COLUMN = struct.Struct("<cI")  # typecode, długość w bajtach
+
+
+def _code_version() -> str:
+    """Skrót kodu, od którego zależy wynik parsowania - jego zmiana unieważnia cache."""
+    digest = blake2b(digest_size=16)
+    for source in (
+        _parser.__file__, _models.__file__, _symbols.__file__, _time_utils.__file__, _frame.__file__, __file__,
+    ):
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+CODE_VERSION = _code_version()
+
+
+def file_checksum(path: Path) -> str:
+    """Skrót blake2b zawartości pliku, czytanego blokami po 1 MiB."""
+    digest = blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_strings(f: BinaryIO, values: list[str]) -> None:
+    encoded = [v.encode() for v in values]
+    offsets = array("I", [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    f.write(_STRINGS.pack(len(encoded), offsets[-1]))
+    f.write(offsets.tobytes())
+    f.write(b"".join(encoded))
+
+
+def _read_strings(buf: memoryview, pos: int) -> tuple[list[str], int]:
+    count, size = _STRINGS.unpack_from(buf, pos)
+    pos += _STRINGS.size
+    offsets = array("I")
+    offsets.frombytes(buf[pos:pos + 4 * (count + 1)])
+    pos += 4 * (count + 1)
+    blob = bytes(buf[pos:pos + size])
+    return [blob[offsets[i]:offsets[i + 1]].decode() for i in range(count)], pos + size
+
+
+def write_frame(frame: AuctionFrame, f: BinaryIO) -> None:
+    """Zapisuje ramkę w binarnym formacie kolumnowym (stałe sekcje, gotowe do mmap)."""
+    f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(frame)))
+    _write_strings(f, frame.stock_numbers)
+    _write_strings(f, [vin or "" for vin in frame.vins])
+    for name in DICTIONARIES.values():
+        _write_strings(f, getattr(frame, name).values)
+    for name in NUMERIC_COLUMNS:
+        column = getattr(frame, name)
+        f.write(_COLUMN.pack(column.typecode.encode(), len(column) * column.itemsize))
+        f.write(column.tobytes())
+    # nierozpoznane typy pojazdów: wartości i liczby wierszy
+    unmapped = frame.unmapped_vehicle_types
+    _write_strings(f, list(unmapped))
+    counts = array("Q", unmapped.values())
+    f.write(_COLUMN.pack(counts.typecode.encode(), len(counts) * counts.itemsize))
+    f.write(counts.tobytes())
+
+
+def read_frame(buf: memoryview) -> AuctionFrame:
+    magic, version, rows = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError("Unsupported cache entry format")
+    pos = _HEADER.size
+    frame = AuctionFrame()
+    frame.stock_numbers, pos = _read_strings(buf, pos)
+    vins, pos = _read_strings(buf, pos)
+    frame.vins = [vin or None for vin in vins]
+    for name in DICTIONARIES.values():
+        dictionary = getattr(frame, name)
+        values, pos = _read_strings(buf, pos)
+        table = _SYMBOLS.get(name)
+        dictionary.values = list(map(table.intern if table is not None else sys.intern, values))
+        dictionary.codes = {v: i for i, v in enumerate(dictionary.values)}
+    for name in NUMERIC_COLUMNS:
+        typecode, size = _COLUMN.unpack_from(buf, pos)
+        pos += _COLUMN.size
+        column = array(typecode.decode())
+        column.frombytes(buf[pos:pos + size])
+        pos += size
+        setattr(frame, name, column)
+    values, pos = _read_strings(buf, pos)
+    typecode, size = _COLUMN.unpack_from(buf, pos)
+    pos += _COLUMN.size
+    counts = array(typecode.decode())
+    counts.frombytes(buf[pos:pos + size])
+    frame.unmapped_vehicle_types.update(dict(zip(values, counts)))
+    if len(frame) != rows:
+        raise ValueError("Corrupted cache entry")
+    return frame
+
+
+class ParseCache:
+    """Dyskowy cache sparsowanych plików CSV w binarnym formacie kolumnowym.
+
+    Klucz wpisu to ścieżka, rozmiar, mtime i skrót zawartości pliku oraz
+    `CODE_VERSION` - zmiana kodu parsera lub modeli unieważnia wszystkie wpisy.
+    Rozmiar katalogu jest ograniczony przez `max_bytes`; po przekroczeniu
+    usuwane są najdawniej używane wpisy (LRU wg mtime wpisu).
+    """
+
+    SUFFIX = ".aucf"
+
+    def __init__(self, directory: Path, max_bytes: int = 1 << 30) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._content_hashes: dict[tuple[str, int, int], str] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __getstate__(self) -> dict:
+        # do procesów roboczych przekazujemy tylko konfigurację
+        state = self.__dict__.copy()
+        state["_content_hashes"] = {}
+        return state
+
+    def _entry_path(self, path: Path) -> Path:
+        resolved = str(Path(path).resolve())
+        st = os.stat(resolved)
+        identity = (resolved, st.st_size, st.st_mtime_ns)
+        content_hash = self._content_hashes.get(identity)
+        if content_hash is None:
+            content_hash = self._content_hashes[identity] = file_checksum(resolved)
+        key = "\0".join([*map(str, identity), content_hash, CODE_VERSION])
+        return self.directory / (blake2b(key.encode(), digest_size=16).hexdigest() + self.SUFFIX)
+
+    def contains(self, path: Path) -> bool:
+        return self._entry_path(path).exists()
+
+    def get(self, path: Path) -> AuctionFrame | None:
+        entry = self._entry_path(path)
+        try:
+            with open(entry, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buf:
+                    frame = read_frame(buf)
+            os.utime(entry)  # odświeżenie pozycji w LRU
+        except (FileNotFoundError, ValueError, struct.error):
+            self.misses += 1
+            instrumentation.count("cache.misses")
+            return None
+        self.hits += 1
+        instrumentation.count("cache.hits")
+        return frame
+
+    def put(self, path: Path, frame: AuctionFrame) -> None:
+        entry = self._entry_path(path)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_frame(frame, f)
+            os.replace(tmp, entry)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def size_bytes(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _entries(self) -> list[Path]:
+        return list(self.directory.glob("*" + self.SUFFIX))
+
+    def evict(self) -> None:
+        """Usuwa najdawniej używane wpisy, aż rozmiar cache zmieści się w `max_bytes`."""
+        entries = []
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,125 @@
+import heapq
+import pickle
+import tempfile
+from enum import Enum
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from ingest import file_order
+from loader import from_row, to_row
+from models import Auction
+
+
+class ConflictPolicy(Enum):
+    LATEST_FILE = "latest_file"
+    LATEST_AUCTION_DATE = "latest_auction_date"
+
+
+def _read_run(f: IO[bytes]) -> Iterator[tuple]:
+    f.seek(0)
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
+
+
+class Deduplicator:
+    """Usuwa powtórzenia numerów aukcji między eksportami (upsert po `stock_number`).
+
+    Aukcje trafiają do słownika numer -> (ranga, aukcja); przy konflikcie
+    zostaje wersja o wyższej randze: z późniejszego pliku (`file_order`)
+    albo z późniejszą `auction_date_utc`, a przy remisie ta wczytana później.
+    Gdy kluczy jest więcej niż `max_keys`, słownik jest zrzucany na dysk jako
+    posortowana seria, a iteracja scala serie przez `heapq.merge` - pamięć
+    zależy od `max_keys`, a nie od liczby aukcji.
+    """
+
+    def __init__(
+        self,
+        policy: ConflictPolicy | str = ConflictPolicy.LATEST_FILE,
+        max_keys: int = 1_000_000,
+        spill_dir: Path | None = None,
+    ) -> None:
+        if max_keys < 1:
+            raise ValueError(f"max_keys must be positive, got {max_keys}")
+        self.policy = ConflictPolicy(policy)
+        self.max_keys = max_keys
+        self.spill_dir = spill_dir
+        self.total = 0
+        self.unique = 0
+        self._seq = 0
+        self._entries: dict[str, tuple[tuple, Auction]] = {}
+        self._runs: list[IO[bytes]] = []
+        self._consumed = False
+
+    @property
+    def duplicates(self) -> int:
+        """Liczba odrzuconych powtórzeń (znana w pełni po iteracji)."""
+        return self.total - self.unique
+
+    def extend(self, auctions: Iterable[Auction], source: Path) -> None:
+        order = file_order(source)
+        entries = self._entries
+        by_date = self.policy is ConflictPolicy.LATEST_AUCTION_DATE
+        for auction in auctions:
+            self._seq += 1
+            rank = (auction.auction_date_utc.timestamp(), order, self._seq) if by_date else (order, self._seq)
+            current = entries.get(auction.stock_number)
+            if current is None or current[0] < rank:
+                entries[auction.stock_number] = (rank, auction)
+            self.total += 1
+            if len(entries) > self.max_keys:
+                self._spill()
+
+    def _spill(self) -> None:
+        run = tempfile.TemporaryFile(dir=self.spill_dir)
+        for stock in sorted(self._entries):
+            rank, auction = self._entries[stock]
+            pickle.dump((stock, rank, to_row(auction)), run, pickle.HIGHEST_PROTOCOL)
+        self._runs.append(run)
+        self._entries.clear()
+
+    def __iter__(self) -> Iterator[Auction]:
+        """Zwraca unikalne aukcje w kolejności numerów aukcji.
+
+        Serie zrzucone na dysk można odczytać tylko raz - ponowna iteracja
+        po zrzutach kończy się `RuntimeError`.
+        """
+        if self._consumed:
+            raise RuntimeError("Deduplicator with spilled runs can only be iterated once")
+        self.unique = 0
+        if not self._runs:
+            for stock in sorted(self._entries):
+                self.unique += 1
+                yield self._entries[stock][1]
+            return
+
+        memory = ((stock, rank, auction) for stock, (rank, auction) in sorted(self._entries.items()))
+        merged = heapq.merge(*map(_read_run, self._runs), memory, key=itemgetter(0))
+        self._consumed = True
+        try:
+            for _, versions in groupby(merged, key=itemgetter(0)):
+                _, _, latest = max(versions, key=itemgetter(1))
+                self.unique += 1
+                yield latest if isinstance(latest, Auction) else from_row(latest)
+        finally:
+            for run in self._runs:
+                run.close()
+            self._runs = []
+            self._entries.clear()
+
+
+def deduplicate(
+    files: Iterable[tuple[Path, Iterable[Auction]]],
+    policy: ConflictPolicy | str = ConflictPolicy.LATEST_FILE,
+    max_keys: int = 1_000_000,
+    spill_dir: Path | None = None,
+) -> Deduplicator:
+    """Wczytuje pary (plik, aukcje), np. z `AuctionLoader.iter_files`, do deduplikatora."""
+    dedup = Deduplicator(policy, max_keys, spill_dir)
+    for path, auctions in files:
+        dedup.extend(auctions, path)
+    return dedup
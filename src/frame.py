@@ -0,0 +1,379 @@
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import compress
+from math import ceil, floor
+from typing import Iterable, Iterator
+
+from models import Auction, StartCode, Vehicle, VehicleType
+from symbols import MAKES
+from time_utils import utc_timestamp
+
+
+# Kompaktowa reprezentacja aukcji (np. do przesyłania między procesami):
+# (stock_number, branch, timestamp UTC, year, make, model, vehicle_type, mileage,
+#  vin, odometer_status, primary_damage, title, start_code, acv_cents, current_bid_cents)
+AuctionRow = tuple[
+    str, str, float, int, str, str, str, int | None,
+    str | None, str | None, str | None, str | None, str | None, int | None, int | None,
+]
+
+VEHICLE_TYPES = list(VehicleType)
+_VEHICLE_TYPE_CODES = {vt: code for code, vt in enumerate(VEHICLE_TYPES)}
+START_CODES = list(StartCode)
+_START_CODE_CODES = {sc: code for code, sc in enumerate(START_CODES)}
+
+# Brak wartości w kolumnach liczbowych
+MISSING_MILEAGE = -1
+MISSING_AMOUNT = -1
+MISSING_START_CODE = 0xFF
+
+# Kolumny kodów słownikowych -> atrybut ze słownikiem
+DICTIONARIES = {
+    "branch_codes": "branches",
+    "make_codes": "makes",
+    "model_codes": "models",
+    "odometer_status_codes": "odometer_statuses",
+    "damage_codes": "damages",
+    "title_codes": "titles",
+}
+# Wszystkie kolumny trzymane w `array` (kolejność zapisu w cache)
+NUMERIC_COLUMNS = (
+    "branch_codes", "timestamps", "years", "make_codes", "model_codes", "vehicle_types", "mileages",
+    "odometer_status_codes", "damage_codes", "title_codes", "start_codes", "acv_cents", "current_bid_cents",
+)
+
+
+class StringDictionary:
+    """Słownik kodujący powtarzalne stringi jako kolejne kody całkowite."""
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class AuctionFrame:
+    """Kolumnowy magazyn aukcji oparty o `array`.
+
+    Rok, przebieg, kwoty (centy), znacznik czasu (sekundy UTC), typ pojazdu
+    i kod uruchomienia są trzymane w tablicach liczbowych, a marka, model,
+    oddział i kategorie (status licznika, uszkodzenie, tytuł) są kodowane
+    słownikowo - brak kategorii to pusty string w słowniku.
+    Obiekty `Auction` powstają dopiero na żądanie (`__getitem__`, `__iter__`).
+    Ramki pochodne (filtry, grupy) współdzielą słowniki z ramką źródłową.
+
+    `unmapped_vehicle_types` to surowe wartości "Vehicle Type" zapisane jako
+    OTHER przy parsowaniu wierszy ramki - trafia razem z nią do cache.
+    """
+
+    def __init__(
+        self,
+        makes: StringDictionary | None = None,
+        models: StringDictionary | None = None,
+        branches: StringDictionary | None = None,
+        odometer_statuses: StringDictionary | None = None,
+        damages: StringDictionary | None = None,
+        titles: StringDictionary | None = None,
+    ) -> None:
+        self.makes = makes if makes is not None else StringDictionary()
+        self.models = models if models is not None else StringDictionary()
+        self.branches = branches if branches is not None else StringDictionary()
+        self.odometer_statuses = odometer_statuses if odometer_statuses is not None else StringDictionary()
+        self.damages = damages if damages is not None else StringDictionary()
+        self.titles = titles if titles is not None else StringDictionary()
+        self.stock_numbers: list[str] = []
+        self.vins: list[str | None] = []
+        self.branch_codes = array("I")
+        self.timestamps = array("q")
+        self.years = array("H")
+        self.make_codes = array("I")
+        self.model_codes = array("I")
+        self.vehicle_types = array("B")
+        self.mileages = array("q")
+        self.odometer_status_codes = array("I")
+        self.damage_codes = array("I")
+        self.title_codes = array("I")
+        self.start_codes = array("B")
+        self.acv_cents = array("q")
+        self.current_bid_cents = array("q")
+        self.unmapped_vehicle_types: Counter[str] = Counter()
+
+    def _dictionaries(self) -> dict[str, StringDictionary]:
+        return {name: getattr(self, name) for name in DICTIONARIES.values()}
+
+    @classmethod
+    def from_auctions(cls, auctions: Iterable[Auction]) -> "AuctionFrame":
+        frame = cls()
+        frame.extend(auctions)
+        return frame
+
+    def append(self, auction: Auction) -> None:
+        vehicle = auction.vehicle
+        self.append_row((
+            auction.stock_number,
+            auction.branch,
+            auction.auction_date_utc.timestamp(),
+            vehicle.year,
+            vehicle.make,
+            vehicle.model,
+            vehicle.vehicle_type.value,
+            vehicle.mileage,
+            vehicle.vin,
+            vehicle.odometer_status,
+            vehicle.primary_damage,
+            vehicle.title,
+            vehicle.start_code.value if vehicle.start_code is not None else None,
+            auction.acv_cents,
+            auction.current_bid_cents,
+        ))
+
+    def extend(self, auctions: Iterable[Auction]) -> None:
+        for auction in auctions:
+            self.append(auction)
+
+    def append_row(self, row: AuctionRow) -> None:
+        """Dodaje wiersz w formacie `AuctionRow` bez tworzenia obiektów `Auction`."""
+        (
+            stock_number, branch, timestamp, year, make, model, vehicle_type, mileage,
+            vin, odometer_status, damage, title, start_code, acv, bid,
+        ) = row
+        self.stock_numbers.append(stock_number)
+        self.vins.append(vin)
+        self.branch_codes.append(self.branches.encode(branch))
+        self.timestamps.append(int(timestamp))
+        self.years.append(year)
+        self.make_codes.append(self.makes.encode(make))
+        self.model_codes.append(self.models.encode(model))
+        self.vehicle_types.append(_VEHICLE_TYPE_CODES[VehicleType(vehicle_type)])
+        self.mileages.append(MISSING_MILEAGE if mileage is None else mileage)
+        self.odometer_status_codes.append(self.odometer_statuses.encode(odometer_status or ""))
+        self.damage_codes.append(self.damages.encode(damage or ""))
+        self.title_codes.append(self.titles.encode(title or ""))
+        self.start_codes.append(
+            MISSING_START_CODE if start_code is None else _START_CODE_CODES[StartCode(start_code)]
+        )
+        self.acv_cents.append(MISSING_AMOUNT if acv is None else acv)
+        self.current_bid_cents.append(MISSING_AMOUNT if bid is None else bid)
+
+    def append_frame(self, other: "AuctionFrame") -> None:
+        """Dopisuje wiersze innej ramki, przekodowując jej słowniki na słowniki tej ramki."""
+        remap = {
+            column: array("I", map(getattr(self, dictionary).encode, getattr(other, dictionary).values))
+            for column, dictionary in DICTIONARIES.items()
+        }
+        self.stock_numbers.extend(other.stock_numbers)
+        self.vins.extend(other.vins)
+        for name in NUMERIC_COLUMNS:
+            column = getattr(other, name)
+            if name in remap:
+                column = map(remap[name].__getitem__, column)
+            getattr(self, name).extend(column)
+        self.unmapped_vehicle_types.update(other.unmapped_vehicle_types)
+
+    def _start_code(self, i: int) -> StartCode | None:
+        code = self.start_codes[i]
+        return None if code == MISSING_START_CODE else START_CODES[code]
+
+    def _amount(self, column: array, i: int) -> int | None:
+        amount = column[i]
+        return None if amount == MISSING_AMOUNT else amount
+
+    def row(self, i: int) -> AuctionRow:
+        mileage = self.mileages[i]
+        start_code = self._start_code(i)
+        return (
+            self.stock_numbers[i],
+            self.branches.decode(self.branch_codes[i]),
+            self.timestamps[i],
+            self.years[i],
+            self.makes.decode(self.make_codes[i]),
+            self.models.decode(self.model_codes[i]),
+            VEHICLE_TYPES[self.vehicle_types[i]].value,
+            None if mileage == MISSING_MILEAGE else mileage,
+            self.vins[i],
+            self.odometer_statuses.decode(self.odometer_status_codes[i]) or None,
+            self.damages.decode(self.damage_codes[i]) or None,
+            self.titles.decode(self.title_codes[i]) or None,
+            start_code.value if start_code is not None else None,
+            self._amount(self.acv_cents, i),
+            self._amount(self.current_bid_cents, i),
+        )
+
+    def __len__(self) -> int:
+        return len(self.stock_numbers)
+
+    def __getitem__(self, i: int) -> Auction:
+        # dane w ramce są już zwalidowane - tworzymy obiekty bez walidacji pydantic
+        mileage = self.mileages[i]
+        return Auction.construct(
+            self.stock_numbers[i],
+            self.branches.decode(self.branch_codes[i]),
+            datetime.fromtimestamp(self.timestamps[i], timezone.utc),
+            Vehicle.construct(
+                self.years[i],
+                self.makes.decode(self.make_codes[i]),
+                self.models.decode(self.model_codes[i]),
+                VEHICLE_TYPES[self.vehicle_types[i]],
+                None if mileage == MISSING_MILEAGE else mileage,
+                self.vins[i],
+                self.odometer_statuses.decode(self.odometer_status_codes[i]) or None,
+                self.damages.decode(self.damage_codes[i]) or None,
+                self.titles.decode(self.title_codes[i]) or None,
+                self._start_code(i),
+            ),
+            self._amount(self.acv_cents, i),
+            self._amount(self.current_bid_cents, i),
+        )
+
+    def __iter__(self) -> Iterator[Auction]:
+        return (self[i] for i in range(len(self)))
+
+    def to_auctions(self) -> list[Auction]:
+        return list(self)
+
+    def take(self, indices: Iterable[int]) -> "AuctionFrame":
+        """Zwraca nową ramkę z wybranymi wierszami (słowniki są współdzielone)."""
+        indices = list(indices)
+        frame = AuctionFrame(**self._dictionaries())
+        frame.stock_numbers = list(map(self.stock_numbers.__getitem__, indices))
+        frame.vins = list(map(self.vins.__getitem__, indices))
+        for name in NUMERIC_COLUMNS:
+            column = getattr(self, name)
+            setattr(frame, name, array(column.typecode, map(column.__getitem__, indices)))
+        return frame
+
+    def take_mask(self, mask: bytes) -> "AuctionFrame":
+        """Zwraca ramkę z wierszami, dla których maska ma wartość 1."""
+        return self.take(compress(range(len(self)), mask))
+
+    def nbytes(self) -> int:
+        """Przybliżone zużycie pamięci przez kolumny (bez współdzielonych słowników)."""
+        return (
+            sum(sys.getsizeof(getattr(self, name)) for name in NUMERIC_COLUMNS)
+            + sys.getsizeof(self.stock_numbers)
+            + sum(sys.getsizeof(s) for s in self.stock_numbers)
+            + sys.getsizeof(self.vins)
+            + sum(sys.getsizeof(v) for v in self.vins if v is not None)
+        )
+
+    # --- maski: jeden bajt (0/1) na wiersz, budowane przez map() na metodach C ---
+
+    def year_mask(self, min_year: int, max_year: int | None = None) -> bytes:
+        top = max_year if max_year is not None else 0xFFFF  # maksimum kolumny "H"
+        return bytes(map(range(min_year, top + 1).__contains__, self.years))
+
+    def make_mask(self, makes: list[str]) -> bytes:
+        """Maska marek (case-insensitive) - normalizujemy słownik, nie wiersze."""
+        lookup = bytes(map(MAKES.matcher(makes).__getitem__, self.makes.values))
+        return bytes(map(lookup.__getitem__, self.make_codes))
+
+    def vehicle_type_mask(self, vehicle_type: VehicleType) -> bytes:
+        table = bytearray(256)
+        table[_VEHICLE_TYPE_CODES[vehicle_type]] = 1
+        return self.vehicle_types.tobytes().translate(table)
+
+    def date_mask(self, start_date: datetime, end_date: datetime) -> bytes:
+        start, end = ceil(utc_timestamp(start_date)), floor(utc_timestamp(end_date))
+        return bytes(map(range(start, end + 1).__contains__, self.timestamps))
+
+    # --- operacje odpowiadające AuctionService ---
+
+    def filter_by_year(self, min_year: int, max_year: int | None = None) -> "AuctionFrame":
+        """Filtruje aukcje po roku pojazdu."""
+        return self.take_mask(self.year_mask(min_year, max_year))
+
+    def filter_by_make(self, makes: list[str]) -> "AuctionFrame":
+        """Filtruje aukcje po markach (case-insensitive) - porównuje kody, nie stringi."""
+        return self.take_mask(self.make_mask(makes))
+
+    def filter_by_vehicle_type(self, vehicle_type: VehicleType) -> "AuctionFrame":
+        """Filtruje aukcje po typie pojazdu."""
+        return self.take_mask(self.vehicle_type_mask(vehicle_type))
+
+    def filter_by_date_range(self, start_date: datetime, end_date: datetime) -> "AuctionFrame":
+        """Filtruje aukcje po zakresie dat."""
+        return self.take_mask(self.date_mask(start_date, end_date))
+
+    @staticmethod
+    def _group_indices(codes: array) -> dict[int, list[int]]:
+        """Pozycje wierszy wg kodu; grupy w kolejności pierwszego wystąpienia (jak w `AuctionService`)."""
+        groups: dict[int, list[int]] = {}
+        for i, code in enumerate(codes):
+            groups.setdefault(code, []).append(i)
+        return groups
+
+    def group_by_make(self) -> dict[str, "AuctionFrame"]:
+        """Grupuje aukcje po markach."""
+        return {
+            self.makes.decode(code): self.take(indices)
+            for code, indices in self._group_indices(self.make_codes).items()
+        }
+
+    def group_by_branch(self) -> dict[str, "AuctionFrame"]:
+        """Grupuje aukcje po oddziałach."""
+        return {
+            self.branches.decode(code): self.take(indices)
+            for code, indices in self._group_indices(self.branch_codes).items()
+        }
+
+    def group_by_vehicle_type(self) -> dict[VehicleType, "AuctionFrame"]:
+        """Grupuje aukcje po typach pojazdów."""
+        return {
+            VEHICLE_TYPES[code]: self.take(indices)
+            for code, indices in self._group_indices(self.vehicle_types).items()
+        }
+
+    def get_top_makes(self, n: int = 10) -> list[tuple[str, int]]:
+        """Zwraca n najpopularniejszych marek."""
+        counts = Counter(self.make_codes)
+        return [(self.makes.decode(code), count) for code, count in counts.most_common(n)]
+
+    def get_top_models(self, n: int = 10) -> list[tuple[str, int]]:
+        """Zwraca n najpopularniejszych modeli."""
+        names: Counter[str] = Counter()
+        for (make, model), count in Counter(zip(self.make_codes, self.model_codes)).items():
+            names[f"{self.makes.decode(make)} {self.models.decode(model)}"] += count
+        return names.most_common(n)
+
+    def get_average_mileage_by_year(self) -> dict[int, float]:
+        """Oblicza średni przebieg dla każdego rocznika."""
+        totals: dict[int, list[int]] = {}
+        for year, mileage in zip(self.years, self.mileages):
+            if mileage != MISSING_MILEAGE:
+                total = totals.setdefault(year, [0, 0])
+                total[0] += mileage
+                total[1] += 1
+        return {year: total / count for year, (total, count) in totals.items()}
+
+    def get_statistics(self) -> dict:
+        """Zwraca podstawowe statystyki o aukcjach."""
+        mileages = sorted(m for m in self.mileages if m != MISSING_MILEAGE)
+        count = len(mileages)
+        if count:
+            middle = count // 2
+            median = mileages[middle] if count % 2 else (mileages[middle - 1] + mileages[middle]) / 2
+        return {
+            "total_auctions": len(self),
+            "unique_makes": len(set(self.make_codes)),
+            "unique_branches": len(set(self.branch_codes)),
+            "year_range": (min(self.years), max(self.years)) if self.years else (None, None),
+            "avg_mileage": sum(mileages) / count if count else None,
+            "median_mileage": median if count else None,
+            "vehicle_types": {
+                VEHICLE_TYPES[code]: n for code, n in Counter(self.vehicle_types).items()
+            },
+        }
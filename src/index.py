@@ -0,0 +1,187 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Iterable
+
+from models import Auction, VehicleType
+from symbols import BRANCHES, MAKES
+from time_utils import utc_timestamp
+
+
+# Lista pozycji jest przecinana, jeśli ma najwyżej tyle razy więcej elementów niż kandydaci
+_INTERSECT_RATIO = 4
+
+
+def _normalize(value: str) -> str:
+    return value.strip().lower()
+
+
+class _SortedIndex:
+    """Posortowane serie (klucze, pozycje) do zapytań zakresowych przez bisect.
+
+    `extend` dokłada nową serię i nie dotyka istniejących - koszt zależy tylko
+    od nowych wierszy. Serie są scalane leniwie, przy zapytaniu, gdy jest ich
+    więcej niż `max_runs`.
+    """
+
+    def __init__(self, max_runs: int = 16) -> None:
+        self.max_runs = max_runs
+        self.runs: list[tuple[list[float], list[int]]] = []
+
+    def extend(self, pairs: list[tuple[float, int]]) -> None:
+        if pairs:
+            pairs = sorted(pairs)
+            self.runs.append(([k for k, _ in pairs], [p for _, p in pairs]))
+
+    def _compacted(self) -> list[tuple[list[float], list[int]]]:
+        if len(self.runs) > self.max_runs:
+            merged = list(heapq.merge(*(zip(keys, positions) for keys, positions in self.runs)))
+            self.runs = [([k for k, _ in merged], [p for _, p in merged])]
+        return self.runs
+
+    @staticmethod
+    def _bounds(keys: list[float], low: float | None, high: float | None) -> tuple[int, int]:
+        start = 0 if low is None else bisect_left(keys, low)
+        stop = len(keys) if high is None else bisect_right(keys, high)
+        return start, max(start, stop)
+
+    def estimate(self, low: float | None, high: float | None) -> int:
+        total = 0
+        for keys, _ in self._compacted():
+            start, stop = self._bounds(keys, low, high)
+            total += stop - start
+        return total
+
+    def lookup(self, low: float | None, high: float | None) -> list[int]:
+        result: list[int] = []
+        for keys, positions in self._compacted():
+            start, stop = self._bounds(keys, low, high)
+            result.extend(positions[start:stop])
+        return result
+
+
+class AuctionIndex:
+    """Trwałe indeksy nad listą aukcji, budowane raz po załadowaniu danych.
+
+    Indeksy haszujące (znormalizowana marka, oddział, typ pojazdu) trzymają
+    listy pozycji, a rok i `auction_date_utc` są w posortowanych tablicach
+    przeszukiwanych przez bisect. `filter` zaczyna od najbardziej selektywnego
+    indeksu i przecina jego listę pozycji z listami kolejnych indeksów; indeks
+    wielokrotnie większy od bieżącego zbioru kandydatów nie jest materializowany
+    - jego warunek sprawdzamy wtedy tylko na kandydatach.
+    Nowe pliki dopisujemy przez `extend` - bez przebudowy od zera.
+    """
+
+    def __init__(self, auctions: Iterable[Auction] = ()) -> None:
+        self.auctions: list[Auction] = []
+        self._makes: dict[str, list[int]] = {}
+        self._branches: dict[str, list[int]] = {}
+        self._vehicle_types: dict[VehicleType, list[int]] = {}
+        self._years = _SortedIndex()
+        self._dates = _SortedIndex()
+        self.extend(auctions)
+
+    def __len__(self) -> int:
+        return len(self.auctions)
+
+    def extend(self, auctions: Iterable[Auction]) -> None:
+        """Dopisuje aukcje i aktualizuje indeksy przyrostowo."""
+        offset = len(self.auctions)
+        new = list(auctions)
+        self.auctions.extend(new)
+        for pos, auction in enumerate(new, start=offset):
+            # postać znormalizowana jest liczona raz na symbol, nie na wiersz
+            self._makes.setdefault(MAKES.fold(auction.vehicle.make), []).append(pos)
+            self._branches.setdefault(BRANCHES.fold(auction.branch), []).append(pos)
+            self._vehicle_types.setdefault(auction.vehicle.vehicle_type, []).append(pos)
+        self._years.extend([(a.vehicle.year, pos) for pos, a in enumerate(new, start=offset)])
+        self._dates.extend([(a.auction_date_utc.timestamp(), pos) for pos, a in enumerate(new, start=offset)])
+
+    def filter(
+        self,
+        *,
+        makes: list[str] | None = None,
+        branches: list[str] | None = None,
+        vehicle_type: VehicleType | None = None,
+        min_year: int | None = None,
+        max_year: int | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[Auction]:
+        """Zwraca aukcje spełniające wszystkie podane warunki (w kolejności wczytania)."""
+        # (szacowany rozmiar, pobranie listy pozycji, warunek dla pojedynczej aukcji)
+        candidates: list[tuple[int, Callable[[], list[int]], Callable[[Auction], bool]]] = []
+
+        if makes is not None:
+            keys = {_normalize(m) for m in makes}
+            make_matches = MAKES.matcher(keys)
+            candidates.append(self._hash_lookup(
+                self._makes, keys, lambda a: make_matches[a.vehicle.make],
+            ))
+        if branches is not None:
+            branch_keys = {_normalize(b) for b in branches}
+            branch_matches = BRANCHES.matcher(branch_keys)
+            candidates.append(self._hash_lookup(
+                self._branches, branch_keys, lambda a: branch_matches[a.branch],
+            ))
+        if vehicle_type is not None:
+            candidates.append(self._hash_lookup(
+                self._vehicle_types, {vehicle_type}, lambda a: a.vehicle.vehicle_type == vehicle_type,
+            ))
+        if min_year is not None or max_year is not None:
+            candidates.append((
+                self._years.estimate(min_year, max_year),
+                lambda: self._years.lookup(min_year, max_year),
+                lambda a: (min_year is None or a.vehicle.year >= min_year)
+                and (max_year is None or a.vehicle.year <= max_year),
+            ))
+        if start_date is not None or end_date is not None:
+            low = utc_timestamp(start_date) if start_date is not None else None
+            high = utc_timestamp(end_date) if end_date is not None else None
+            candidates.append((
+                self._dates.estimate(low, high),
+                lambda: self._dates.lookup(low, high),
+                lambda a: (start_date is None or start_date <= a.auction_date_utc)
+                and (end_date is None or a.auction_date_utc <= end_date),
+            ))
+
+        if not candidates:
+            return list(self.auctions)
+
+        candidates.sort(key=lambda c: c[0])
+        _, fetch, _ = candidates[0]
+        positions = sorted(fetch())
+        for estimate, fetch, matches in candidates[1:]:
+            if estimate <= len(positions) * _INTERSECT_RATIO:
+                posting = set(fetch())
+                positions = [p for p in positions if p in posting]
+            else:
+                # długiej listy nie opłaca się materializować - sprawdzamy tylko kandydatów
+                positions = [p for p in positions if matches(self.auctions[p])]
+        return [self.auctions[p] for p in positions]
+
+    @staticmethod
+    def _hash_lookup(index: dict, keys: set, matches: Callable[[Auction], bool]):
+        postings = [index[k] for k in keys if k in index]
+        return (
+            sum(len(p) for p in postings),
+            lambda: [pos for posting in postings for pos in posting],
+            matches,
+        )
+
+    # --- odpowiedniki filtrów AuctionService ---
+
+    def filter_by_year(self, min_year: int, max_year: int | None = None) -> list[Auction]:
+        return self.filter(min_year=min_year, max_year=max_year)
+
+    def filter_by_make(self, makes: list[str]) -> list[Auction]:
+        return self.filter(makes=makes)
+
+    def filter_by_branch(self, branches: list[str]) -> list[Auction]:
+        return self.filter(branches=branches)
+
+    def filter_by_vehicle_type(self, vehicle_type: VehicleType) -> list[Auction]:
+        return self.filter(vehicle_type=vehicle_type)
+
+    def filter_by_date_range(self, start_date: datetime, end_date: datetime) -> list[Auction]:
+        return self.filter(start_date=start_date, end_date=end_date)
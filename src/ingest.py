@@ -0,0 +1,240 @@
+import json
+import os
+import re
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from aggregates import RemovableAggregator
+from cache import ParseCache, file_checksum
+from loader import parse_cached
+from models import Auction
+from parser import CsvAuctionParser
+
+
+_COPY_NUMBER = re.compile(r"\((\d+)\)\s*$")
+
+
+def file_order(path: Path) -> tuple[date, int, str]:
+    """Klucz kolejności eksportów: data z nazwy, numer kopii "(N)", nazwa.
+
+    'Sales_List_12012025 (11).csv' jest późniejszy niż '... (3).csv'.
+    """
+    path = Path(path)
+    match = _COPY_NUMBER.search(path.stem)
+    return (
+        CsvAuctionParser.export_date(path) or date.min,
+        int(match.group(1)) if match else 0,
+        path.name,
+    )
+
+
+class FileEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    checksum: str
+
+
+class Manifest:
+    """Lista przetworzonych plików (rozmiar, mtime, skrót) w pliku JSON.
+
+    Numery aukcji plików nie trafiają do manifestu - po restarcie i tak
+    powstają na nowo przy odtwarzaniu plików z cache.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.files: dict[str, FileEntry] = {}
+        if self.path is not None and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == self.VERSION:
+                self.files = {name: FileEntry(*entry) for name, entry in data["files"].items()}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "files": self.files}, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class IngestReport(NamedTuple):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+    restored: list[str]
+    unchanged: int
+    inserted: int
+    replaced: int
+    retracted: int
+
+
+class IngestDelta(NamedTuple):
+    """Zmiana zbioru aukcji od poprzedniego `take_delta`: najpierw usuń, potem dopisz."""
+
+    removed: set[str]  # numery aukcji, których wcześniejsze wersje trzeba usunąć
+    added: list[Auction]  # bieżące wersje nowych i zmienionych aukcji, w kolejności `auctions`
+
+
+class AuctionIngestor:
+    """Przyrostowe wczytywanie plików Sales_List pojawiających się w katalogu.
+
+    `scan` porównuje katalog z manifestem i parsuje tylko nowe lub zmienione
+    pliki (rozmiar/mtime, a przy ich zmianie skrót zawartości), więc koszt
+    skanu zależy od rozmiaru nowych plików, a nie całego archiwum.
+    Zbiór aukcji jest kluczowany numerem aukcji; gdy numer wraca w innym
+    pliku, wygrywa wersja z późniejszego eksportu (`file_order`), a starsze
+    wersje są odkładane, by wrócić, gdy nowszy plik zniknie lub się zmieni.
+    Agregaty są aktualizowane przez `add`/`remove` - bez przeliczania od zera.
+    Po restarcie pliki z manifestu odtwarzamy z `ParseCache` (bez parsowania).
+    Manifest jest zapisywany tylko wtedy, gdy skan coś w nim zmienił.
+    `take_delta` zwraca zmiany od poprzedniego wywołania - pozwala
+    aktualizować pochodne struktury (np. `AuctionFrame`) bez przebudowy.
+    """
+
+    def __init__(
+        self,
+        parser: CsvAuctionParser,
+        directory: Path,
+        manifest_path: Path | None = None,
+        cache: ParseCache | None = None,
+        aggregators: Iterable[RemovableAggregator] = (),
+        pattern: str = "*.csv",
+    ) -> None:
+        self.parser = parser
+        self.directory = Path(directory)
+        self.manifest = Manifest(manifest_path)
+        self.cache = cache
+        self.aggregators = list(aggregators)
+        self.pattern = pattern
+        self.auctions: dict[str, Auction] = {}
+        self._owners: dict[str, str] = {}  # numer aukcji -> plik z wersją obowiązującą
+        self._shadowed: dict[str, dict[str, Auction]] = {}  # starsze wersje z innych plików
+        self._loaded: dict[str, list[str]] = {}  # plik -> numery jego aukcji
+        # zmiany od ostatniego `take_delta`: ustawione numery (w kolejności) i usunięte
+        self._dirty: dict[str, None] = {}
+        self._removed: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.auctions)
+
+    def results(self) -> list:
+        return [a.result() for a in self.aggregators]
+
+    def take_delta(self) -> IngestDelta:
+        """Zmiany zbioru aukcji od poprzedniego wywołania (koszt zależy od zmian, nie od archiwum)."""
+        delta = IngestDelta(self._removed, [self.auctions[stock] for stock in self._dirty])
+        self._dirty = {}
+        self._removed = set()
+        return delta
+
+    def scan(self) -> IngestReport:
+        """Wczytuje zmiany w katalogu i zapisuje manifest, jeśli się zmienił."""
+        added, changed, restored = [], [], []
+        unchanged = 0
+        touched = False
+        counts = {"inserted": 0, "replaced": 0, "retracted": 0}
+        present = {}
+        for path in sorted(self.directory.glob(self.pattern), key=file_order):
+            st = path.stat()
+            present[path.name] = path
+            entry = self.manifest.files.get(path.name)
+            if entry is not None and (entry.size, entry.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                if path.name not in self._loaded:
+                    self._ingest(path, st, entry.checksum, counts)
+                    restored.append(path.name)
+                else:
+                    unchanged += 1
+                continue
+            checksum = file_checksum(path)
+            if entry is not None and entry.checksum == checksum:
+                # plik tylko "dotknięty" - odświeżamy metadane
+                self.manifest.files[path.name] = entry._replace(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                touched = True
+                if path.name in self._loaded:
+                    unchanged += 1
+                    continue
+                restored.append(path.name)
+            elif entry is None:
+                added.append(path.name)
+            else:
+                changed.append(path.name)
+            self._retract(path.name, counts)
+            self._ingest(path, st, checksum, counts)
+
+        removed = [name for name in self.manifest.files if name not in present]
+        for name in removed:
+            self._retract(name, counts)
+            del self.manifest.files[name]
+        if added or changed or removed or touched:
+            self.manifest.save()
+        return IngestReport(added, changed, removed, restored, unchanged, **counts)
+
+    def _ingest(self, path: Path, st: os.stat_result, checksum: str, counts: dict[str, int]) -> None:
+        auctions = parse_cached(self.parser, self.cache, path)
+        name = path.name
+        order = file_order(path)
+        for auction in auctions:
+            stock = auction.stock_number
+            owner = self._owners.get(stock)
+            if owner is None:
+                self._set(stock, name, auction)
+                counts["inserted"] += 1
+            elif owner == name or file_order(Path(owner)) < order:
+                if owner != name:
+                    self._shadowed.setdefault(stock, {})[owner] = self.auctions[stock]
+                self._unset(stock)
+                self._set(stock, name, auction)
+                counts["replaced"] += 1
+            else:
+                self._shadowed.setdefault(stock, {})[name] = auction
+        self.manifest.files[name] = FileEntry(st.st_size, st.st_mtime_ns, checksum)
+        self._loaded[name] = [a.stock_number for a in auctions]
+
+    def _retract(self, name: str, counts: dict[str, int]) -> None:
+        """Wycofuje aukcje pochodzące z pliku; przywraca ich starsze wersje, jeśli są."""
+        stock_numbers = self._loaded.pop(name, None)
+        if stock_numbers is None:
+            return
+        for stock in stock_numbers:
+            if self._owners.get(stock) != name:
+                shadowed = self._shadowed.get(stock)
+                if shadowed is not None:
+                    shadowed.pop(name, None)
+                    if not shadowed:
+                        del self._shadowed[stock]
+                continue
+            self._unset(stock)
+            counts["retracted"] += 1
+            shadowed = self._shadowed.get(stock)
+            if shadowed:
+                previous = max(shadowed, key=lambda n: file_order(Path(n)))
+                self._set(stock, previous, shadowed.pop(previous))
+                if not shadowed:
+                    del self._shadowed[stock]
+
+    def _set(self, stock: str, name: str, auction: Auction) -> None:
+        self.auctions[stock] = auction
+        self._owners[stock] = name
+        self._dirty[stock] = None
+        for aggregator in self.aggregators:
+            aggregator.add(auction)
+
+    def _unset(self, stock: str) -> None:
+        auction = self.auctions.pop(stock)
+        del self._owners[stock]
+        if stock in self._dirty:
+            del self._dirty[stock]
+        else:
+            self._removed.add(stock)  # wersja sprzed poprzedniego `take_delta`
+        for aggregator in self.aggregators:
+            aggregator.remove(auction)
@@ -0,0 +1,237 @@
+import cProfile
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import partial, wraps
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
+
+class LatencyHistogram:
+    """Histogram czasów w przedziałach 1-2-5 (1 ms ... 100 s); kwantyle z dokładnością do przedziału."""
+
+    BOUNDS = tuple(b * 10.0 ** e for e in range(-3, 2) for b in (1, 2, 5)) + (100.0,)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        """Górna granica przedziału z kwantylem `q` (w ostatnim przedziale - maksimum)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.BOUNDS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "seconds": self.total,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+            "buckets": {
+                f"<={bound:g}s": n for bound, n in zip(self.BOUNDS, self.counts) if n
+            } | ({f">{self.BOUNDS[-1]:g}s": self.counts[-1]} if self.counts[-1] else {}),
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Instrumentation", name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.add_time(self.name, time.perf_counter() - self.start)
+
+
+class Instrumentation:
+    """Liczniki, czasy etapów i histogramy opóźnień jednego przebiegu.
+
+    Zapisy są chronione blokadą (strategia thread), a metryki z procesów
+    roboczych wracają razem z wynikiem zadania i są łączone przez `merge`.
+    """
+
+    def __init__(self) -> None:
+        self.timers: dict[str, float] = {}
+        self.calls: Counter[str] = Counter()
+        self.counters: Counter[str] = Counter()
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def timer(self, name: str) -> _Timer:
+        return _Timer(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+            self.calls[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def merge(self, other: "Instrumentation") -> "Instrumentation":
+        with self._lock:
+            for name, seconds in other.timers.items():
+                self.timers[name] = self.timers.get(name, 0.0) + seconds
+            self.calls.update(other.calls)
+            self.counters.update(other.counters)
+            for name, histogram in other.histograms.items():
+                self.histograms.setdefault(name, LatencyHistogram()).merge(histogram)
+        return self
+
+    def summary(self) -> dict:
+        """Podsumowanie gotowe do `json.dumps`."""
+        return {
+            "timers": {
+                name: {"calls": self.calls[name], "seconds": seconds}
+                for name, seconds in sorted(self.timers.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "histograms": {name: h.summary() for name, h in sorted(self.histograms.items())},
+        }
+
+
+# Aktywne metryki; None = instrumentacja wyłączona i każdy punkt pomiarowy
+# kończy się na jednym sprawdzeniu zmiennej globalnej
+_active: Instrumentation | None = None
+_NULL_TIMER = nullcontext()
+
+
+def enable() -> Instrumentation:
+    global _active
+    _active = Instrumentation()
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def active() -> Instrumentation | None:
+    return _active
+
+
+def timer(name: str):
+    """Mierzy czas bloku `with` jako etap `name` (bez instrumentacji - pusty kontekst)."""
+    return _NULL_TIMER if _active is None else _active.timer(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    if _active is not None:
+        _active.count(name, n)
+
+
+def observe(name: str, seconds: float) -> None:
+    if _active is not None:
+        _active.observe(name, seconds)
+
+
+def timed(fn: Callable) -> Callable:
+    """Dekorator: czas każdego wywołania jako etap `Klasa.metoda`."""
+    name = fn.__qualname__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return fn(*args, **kwargs)
+        with _active.timer(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+class _Collected(NamedTuple):
+    result: object
+    metrics: Instrumentation
+
+
+def _run_collecting(fn: Callable, *args):
+    metrics = enable()
+    try:
+        return _Collected(fn(*args), metrics)
+    finally:
+        disable()
+
+
+def worker_task(fn: Callable) -> Callable:
+    """Opakowuje zadanie dla procesu roboczego - jego metryki wracają razem z wynikiem."""
+    return fn if _active is None else partial(_run_collecting, fn)
+
+
+def unwrap(result):
+    """Wynik zadania z `worker_task`; metryki procesu roboczego są dołączane do aktywnych."""
+    if type(result) is _Collected:
+        if _active is not None:
+            _active.merge(result.metrics)
+        return result.result
+    return result
+
+
+@contextmanager
+def instrumented(profile: Path | None = None) -> Iterator[Instrumentation]:
+    """Włącza instrumentację na czas bloku; `profile` zapisuje też wynik cProfile (pstats).
+
+    Etapy to osobne funkcje (np. `CsvAuctionParser._parse_dates`), więc są
+    widoczne również w profilerach próbkujących (py-spy) bez włączania metryk.
+    """
+    metrics = enable()
+    profiler = cProfile.Profile() if profile is not None else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+        disable()
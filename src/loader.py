@@ -1,18 +1,470 @@
-from concurrent.futures import ThreadPoolExecutor
+import csv
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from functools import partial, wraps
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
 
-from parser import CsvAuctionParser
-from models import Auction
+import instrumentation
+from cache import ParseCache
+from frame import AuctionFrame, AuctionRow
+from parser import CsvAuctionParser, FileRange, Quarantine
+from models import Auction, StartCode, Vehicle, VehicleType
+from stats import StatisticsAccumulator
+from symbols import BRANCHES, MAKES, MODELS
+
+
+# Zadanie procesu roboczego: paczka całych plików lub fragment dużego pliku
+Task = list[Path] | FileRange
+
+
+class ExecutorStrategy(Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+    SERIAL = "serial"
+
+
+def to_row(auction: Auction) -> AuctionRow:
+    """Spłaszcza aukcję do krotki `AuctionRow` - taniej w pickle i SQLite niż model."""
+    vehicle = auction.vehicle
+    return (
+        auction.stock_number,
+        auction.branch,
+        auction.auction_date_utc.timestamp(),
+        vehicle.year,
+        vehicle.make,
+        vehicle.model,
+        vehicle.vehicle_type.value,
+        vehicle.mileage,
+        vehicle.vin,
+        vehicle.odometer_status,
+        vehicle.primary_damage,
+        vehicle.title,
+        vehicle.start_code.value if vehicle.start_code is not None else None,
+        auction.acv_cents,
+        auction.current_bid_cents,
+    )
+
+
+def from_row(row: AuctionRow) -> Auction:
+    """Odtwarza aukcję z krotki - dane pochodzą z naszego parsera, więc bez walidacji.
+
+    Marka, model i oddział wracają do tablic symboli tego procesu - wiersze
+    z procesów roboczych współdzielą stringi z aukcjami parsowanymi tutaj.
+    """
+    (
+        stock_number, branch, timestamp, year, make, model, vehicle_type, mileage,
+        vin, odometer_status, damage, title, start_code, acv, bid,
+    ) = row
+    return Auction.construct(
+        stock_number,
+        BRANCHES.intern(branch),
+        datetime.fromtimestamp(timestamp, timezone.utc),
+        Vehicle.construct(
+            year, MAKES.intern(make), MODELS.intern(model), VehicleType(vehicle_type), mileage,
+            vin, odometer_status, damage, title, None if start_code is None else StartCode(start_code),
+        ),
+        acv,
+        bid,
+    )
+
+
+def _file_latency(fn: Callable) -> Callable:
+    """Czas obsługi pliku (z cache lub parsowania) do histogramu `loader.file`."""
+    @wraps(fn)
+    def wrapper(*args):
+        if not instrumentation.enabled():
+            return fn(*args)
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            instrumentation.observe("loader.file", time.perf_counter() - start)
+
+    return wrapper
+
+
+@_file_latency
+def parse_cached(
+    parser: CsvAuctionParser, cache: ParseCache | None, path: Path, quarantine: Quarantine | None = None,
+) -> list[Auction]:
+    """Parsuje plik, korzystając z cache sparsowanych plików, jeśli jest dostępny.
+
+    Pliki z odrzuconymi wierszami nie trafiają do cache - przy kolejnym
+    ładowaniu raport kwarantanny powstaje ponownie. Wpis cache przechowuje
+    też nierozpoznane typy pojazdów pliku, doliczane parserowi przy trafieniu.
+    """
+    if cache is None:
+        return parser.parse_file(path, quarantine)
+    frame = cache.get(path)
+    if frame is not None:
+        parser.add_unmapped(frame.unmapped_vehicle_types)
+        return frame.to_auctions()
+    rejected = len(quarantine) if quarantine is not None else 0
+    unmapped: Counter[str] = Counter()
+    auctions = parser.parse_file(path, quarantine, unmapped)
+    if quarantine is None or len(quarantine) == rejected:
+        frame = AuctionFrame.from_auctions(auctions)
+        frame.unmapped_vehicle_types = unmapped
+        cache.put(path, frame)
+    return auctions
+
+
+def _parse_file_quarantined(
+    parser: CsvAuctionParser, cache: ParseCache | None, path: Path,
+) -> tuple[list[Auction], Quarantine]:
+    """Tryb tolerancyjny: złe wiersze do kwarantanny, a plik, którego nie da się
+    przeczytać (brak kolumn, kodowanie, błąd I/O), to jeden wpis z linią 0."""
+    quarantine = Quarantine()
+    try:
+        auctions = parse_cached(parser, cache, path, quarantine)
+    except (OSError, ValueError, csv.Error) as e:
+        instrumentation.count("loader.files_rejected")
+        quarantine.add(path, 0, "file", str(e))
+        auctions = []
+    return auctions, quarantine
+
+
+@_file_latency
+def _parse_file_frame(parser: CsvAuctionParser, cache: ParseCache | None, path: Path) -> AuctionFrame:
+    """Jak `parse_cached`, ale zwraca ramkę - przy trafieniu w cache bez tworzenia `Auction`."""
+    frame = cache.get(path) if cache is not None else None
+    if frame is not None:
+        parser.add_unmapped(frame.unmapped_vehicle_types)
+        return frame
+    unmapped: Counter[str] = Counter()
+    frame = AuctionFrame.from_auctions(parser.parse_file(path, unmapped=unmapped))
+    frame.unmapped_vehicle_types = unmapped
+    if cache is not None:
+        cache.put(path, frame)
+    return frame
+
+
+def _parse_chunk(parser: CsvAuctionParser, cache: ParseCache | None, paths: list[Path]) -> list[AuctionRow]:
+    """Parsuje paczkę plików w procesie roboczym i zwraca kompaktowe krotki."""
+    return [to_row(a) for path in paths for a in parse_cached(parser, cache, path)]
+
+
+def _parse_chunk_frame(parser: CsvAuctionParser, cache: ParseCache | None, paths: list[Path]) -> AuctionFrame:
+    frame = AuctionFrame()
+    for path in paths:
+        frame.append_frame(_parse_file_frame(parser, cache, path))
+    return frame
+
+
+def _parse_task(
+    parse_chunk: Callable, parser: CsvAuctionParser, cache: ParseCache | None, task: Task,
+) -> object:
+    """Zadanie procesu roboczego: paczka plików (`parse_chunk`) lub fragment dużego pliku (ramka)."""
+    if isinstance(task, FileRange):
+        unmapped: Counter[str] = Counter()
+        frame = AuctionFrame.from_auctions(parser.parse_range(task, unmapped=unmapped))
+        frame.unmapped_vehicle_types = unmapped  # trafia do wpisu cache sklejonego pliku
+        return frame
+    return parse_chunk(parser, cache, task)
+
+
+def _stitch(results: Iterator, plan: list[tuple[Path | None, int]], cache: ParseCache | None) -> Iterator:
+    """Wyniki zadań w kolejności plików; fragmenty pliku są sklejane w ramkę i zapisywane w cache."""
+    for path, parts in plan:
+        if path is None:
+            yield next(results)
+            continue
+        frame = AuctionFrame()
+        for part in islice(results, parts):
+            frame.append_frame(part)
+        if cache is not None:
+            cache.put(path, frame)
+        yield frame
+
+
+def _parse_chunk_quarantined(
+    parser: CsvAuctionParser, cache: ParseCache | None, paths: list[Path],
+) -> tuple[list[AuctionRow], Quarantine]:
+    quarantine = Quarantine()
+    rows = []
+    for path in paths:
+        auctions, rejected = _parse_file_quarantined(parser, cache, path)
+        rows.extend(map(to_row, auctions))
+        quarantine.extend(rejected)
+    return rows, quarantine
+
+
+def _parse_with_statistics(
+    parser: CsvAuctionParser, cache: ParseCache | None, exact: bool, path: Path,
+) -> tuple[list[Auction], StatisticsAccumulator]:
+    auctions = parse_cached(parser, cache, path)
+    return auctions, StatisticsAccumulator(exact).update(auctions)
+
+
+def _parse_chunk_with_statistics(
+    parser: CsvAuctionParser, cache: ParseCache | None, exact: bool, paths: list[Path],
+) -> tuple[list[AuctionRow], StatisticsAccumulator]:
+    """Jak `_parse_chunk`, ale zwraca też częściowe statystyki paczki."""
+    stats = StatisticsAccumulator(exact)
+    rows = []
+    for path in paths:
+        auctions = parse_cached(parser, cache, path)
+        stats.update(auctions)
+        rows.extend(to_row(a) for a in auctions)
+    return rows, stats
+
+
+class _Counted(NamedTuple):
+    result: object
+    unmapped: Counter[str]
+
+
+def _run_counting(parser: CsvAuctionParser, fn: Callable, *args) -> _Counted:
+    """Zadanie procesu roboczego; nierozpoznane typy pojazdów z kopii parsera wracają z wynikiem.
+
+    `fn` musi używać tego samego parsera - oba trafiają do procesu w jednym
+    pickle, więc po stronie procesu to nadal jeden obiekt (liczący od zera).
+    """
+    return _Counted(fn(*args), parser.unmapped_vehicle_types)
+
+
+def _chunked(paths: list[Path], size: int) -> list[list[Path]]:
+    return [paths[i:i + size] for i in range(0, len(paths), size)]
+
+
+def _iter_chunks(paths: Iterable[Path], size: int) -> Iterator[list[Path]]:
+    it = iter(paths)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _bounded_map(ex: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """Jak `Executor.map`, ale zleca naprzód najwyżej `window` zadań (backpressure)."""
+    pending: deque[Future] = deque()
+    try:
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(ex.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 class AuctionLoader:
-    def __init__(self, parser: CsvAuctionParser):
+    def __init__(
+        self,
+        parser: CsvAuctionParser,
+        strategy: ExecutorStrategy | str = ExecutorStrategy.THREAD,
+        max_workers: int | None = None,
+        chunk_size: int = 8,
+        cache: ParseCache | None = None,
+        split_bytes: int | None = 32 << 20,
+    ):
+        """`split_bytes` - w trybie process pliki większe od tego progu są dzielone
+        na fragmenty tej wielkości parsowane równolegle (None - bez podziału)."""
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if split_bytes is not None and split_bytes < 1:
+            raise ValueError(f"split_bytes must be positive, got {split_bytes}")
         self.parser = parser
+        self.strategy = ExecutorStrategy(strategy)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.split_bytes = split_bytes
+
+    def _process_tasks(self, paths: Iterable[Path]) -> tuple[list[Task], list[tuple[Path | None, int]]]:
+        """Zadania dla procesów: paczki po `chunk_size` plików i fragmenty dużych plików.
+
+        Kolejność zadań odpowiada kolejności plików; `plan` mówi `_stitch`, ile
+        kolejnych wyników składa się na jeden plik (None - paczka całych plików).
+        Pliki obecne w cache nie są dzielone - wczytanie wpisu jest tańsze.
+        """
+        tasks: list[Task] = []
+        plan: list[tuple[Path | None, int]] = []
+        chunk: list[Path] = []
+
+        def flush() -> None:
+            if chunk:
+                tasks.append(chunk.copy())
+                plan.append((None, 1))
+                chunk.clear()
+
+        for path in paths:
+            if (
+                self.split_bytes is not None
+                and os.path.getsize(path) > self.split_bytes
+                and not (self.cache is not None and self.cache.contains(path))
+            ):
+                parts = self.parser.split(path, self.split_bytes)
+                if parts:
+                    flush()
+                    tasks.extend(parts)
+                    plan.append((path, len(parts)))
+                    continue
+            chunk.append(path)
+            if len(chunk) >= self.chunk_size:
+                flush()
+        flush()
+        return tasks, plan
+
+    def _worker_task(self, fn: Callable) -> Callable:
+        """Opakowuje zadanie procesu roboczego - metryki i nierozpoznane typy wracają z wynikiem."""
+        return partial(_run_counting, self.parser, instrumentation.worker_task(fn))
+
+    def _unwrap(self, result: _Counted) -> object:
+        """Wynik zadania z `_worker_task`; jego liczniki są dołączane do parsera i metryk."""
+        self.parser.add_unmapped(result.unmapped)
+        return instrumentation.unwrap(result.result)
 
+    def _map(self, fn: Callable, items: Iterable) -> Iterator:
+        """Mapuje zadania wg strategii: paczki plików (process), pliki (thread, serial)."""
+        if self.strategy is ExecutorStrategy.SERIAL:
+            yield from map(fn, items)
+            return
+        if self.strategy is ExecutorStrategy.THREAD:
+            with ThreadPoolExecutor(self.max_workers) as ex:
+                yield from ex.map(fn, items)
+            return
+        with ProcessPoolExecutor(self.max_workers) as ex:
+            yield from map(self._unwrap, ex.map(self._worker_task(fn), items))
+
+    @instrumentation.timed
     def load(self, paths: list[Path]) -> list[Auction]:
-        with ThreadPoolExecutor() as ex:
-            return [
-                auction
-                for auctions in ex.map(self.parser.parse_file, paths)
-                for auction in auctions
-            ]
+        if self.strategy is ExecutorStrategy.PROCESS:
+            return self._load_processes(paths)
+        parse = partial(parse_cached, self.parser, self.cache)
+        return [auction for auctions in self._map(parse, paths) for auction in auctions]
+
+    def iter_auctions(self, paths: Iterable[Path], max_pending: int | None = None) -> Iterator[Auction]:
+        """Strumieniowo zwraca aukcje z kolejnych plików (w kolejności `paths`).
+
+        Naprzód parsowanych jest najwyżej `max_pending` plików (paczek plików
+        w trybie process); następne są zlecane dopiero, gdy konsument odbierze
+        wyniki, więc zużycie pamięci zależy od okna, a nie od liczby plików.
+        W trybie serial bez cache aukcje są zwracane wiersz po wierszu.
+        """
+        if self.strategy is ExecutorStrategy.SERIAL:
+            for path in paths:
+                if self.cache is None:
+                    yield from self.parser.iter_file(path)
+                else:
+                    yield from parse_cached(self.parser, self.cache, path)
+            return
+
+        window = max_pending or 2 * (self.max_workers or os.cpu_count() or 1)
+        if self.strategy is ExecutorStrategy.PROCESS:
+            with ProcessPoolExecutor(self.max_workers) as ex:
+                parse = self._worker_task(partial(_parse_chunk, self.parser, self.cache))
+                for rows in _bounded_map(ex, parse, _iter_chunks(paths, self.chunk_size), window):
+                    yield from map(from_row, self._unwrap(rows))
+            return
+        with ThreadPoolExecutor(self.max_workers) as ex:
+            parse = partial(parse_cached, self.parser, self.cache)
+            for auctions in _bounded_map(ex, parse, paths, window):
+                yield from auctions
+
+    def iter_files(
+        self, paths: Iterable[Path], max_pending: int | None = None,
+    ) -> Iterator[tuple[Path, list[Auction]]]:
+        """Jak `iter_auctions`, ale zwraca pary (plik, jego aukcje) - np. dla deduplikacji."""
+        paths = list(paths)
+        if self.strategy is ExecutorStrategy.SERIAL:
+            for path in paths:
+                yield path, parse_cached(self.parser, self.cache, path)
+            return
+
+        window = max_pending or 2 * (self.max_workers or os.cpu_count() or 1)
+        if self.strategy is ExecutorStrategy.PROCESS:
+            with ProcessPoolExecutor(self.max_workers) as ex:
+                parse = self._worker_task(partial(_parse_chunk, self.parser, self.cache))
+                for path, rows in zip(paths, _bounded_map(ex, parse, ([p] for p in paths), window)):
+                    yield path, list(map(from_row, self._unwrap(rows)))
+            return
+        with ThreadPoolExecutor(self.max_workers) as ex:
+            parse = partial(parse_cached, self.parser, self.cache)
+            yield from zip(paths, _bounded_map(ex, parse, paths, window))
+
+    @instrumentation.timed
+    def load_with_statistics(
+        self, paths: list[Path], exact: bool = True,
+    ) -> tuple[list[Auction], StatisticsAccumulator]:
+        """Ładuje aukcje i od razu liczy statystyki - bez drugiego przejścia po danych.
+
+        Każdy plik (lub paczka plików w trybie process) ma własny akumulator
+        liczony w wątku/procesie roboczym; wyniki częściowe są łączone przez `merge`.
+        """
+        stats = StatisticsAccumulator(exact)
+        auctions: list[Auction] = []
+        if self.strategy is ExecutorStrategy.PROCESS:
+            parse = partial(_parse_chunk_with_statistics, self.parser, self.cache, exact)
+            for rows, partial_stats in self._map(parse, _chunked(list(paths), self.chunk_size)):
+                auctions.extend(map(from_row, rows))
+                stats.merge(partial_stats)
+            return auctions, stats
+
+        parse = partial(_parse_with_statistics, self.parser, self.cache, exact)
+        for file_auctions, partial_stats in self._map(parse, paths):
+            auctions.extend(file_auctions)
+            stats.merge(partial_stats)
+        return auctions, stats
+
+    @instrumentation.timed
+    def load_with_quarantine(self, paths: list[Path]) -> tuple[list[Auction], Quarantine]:
+        """Ładuje poprawne aukcje, a odrzucone wiersze i pliki zbiera w kwarantannie.
+
+        Zły wiersz nie przerywa pliku, a zły plik - całego ładowania; raport
+        (plik, linia, pole, powód) wraca razem z danymi.
+        """
+        quarantine = Quarantine()
+        auctions: list[Auction] = []
+        if self.strategy is ExecutorStrategy.PROCESS:
+            parse = partial(_parse_chunk_quarantined, self.parser, self.cache)
+            for rows, rejected in self._map(parse, _chunked(list(paths), self.chunk_size)):
+                auctions.extend(map(from_row, rows))
+                quarantine.extend(rejected)
+            return auctions, quarantine
+
+        parse = partial(_parse_file_quarantined, self.parser, self.cache)
+        for file_auctions, rejected in self._map(parse, paths):
+            auctions.extend(file_auctions)
+            quarantine.extend(rejected)
+        return auctions, quarantine
+
+    @instrumentation.timed
+    def load_frame(self, paths: list[Path]) -> AuctionFrame:
+        """Ładuje pliki bezpośrednio do kolumnowej `AuctionFrame`.
+
+        Obiekty `Auction` żyją tylko w obrębie jednego pliku, a przy
+        trafieniu w cache nie powstają wcale. W trybie process ramki
+        (tablice kolumn) wracają z procesów roboczych zamiast obiektów.
+        """
+        frame = AuctionFrame()
+        if self.strategy is ExecutorStrategy.PROCESS:
+            tasks, plan = self._process_tasks(paths)
+            parse = partial(_parse_task, _parse_chunk_frame, self.parser, self.cache)
+            parts = _stitch(self._map(parse, tasks), plan, self.cache)
+        else:
+            parts = self._map(partial(_parse_file_frame, self.parser, self.cache), paths)
+        for part in parts:
+            frame.append_frame(part)
+        return frame
+
+    def _load_processes(self, paths: list[Path]) -> list[Auction]:
+        """Parsowanie w procesach - paczki plików, wyniki wracają jako krotki.
+
+        Krotki są znacznie tańsze w serializacji niż obiekty pydantic,
+        a pełne `Auction` odtwarzamy dopiero w procesie nadrzędnym. Duże
+        pliki są dzielone na fragmenty (`split_bytes`), które wracają jako
+        ramki - czas ładowania zależy od sumy bajtów, a nie od największego pliku.
+        """
+        tasks, plan = self._process_tasks(paths)
+        parse = partial(_parse_task, _parse_chunk, self.parser, self.cache)
+        auctions: list[Auction] = []
+        for part in _stitch(self._map(parse, tasks), plan, self.cache):
+            auctions.extend(part if isinstance(part, AuctionFrame) else map(from_row, part))
+        return auctions
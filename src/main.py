@@ -1,54 +1,120 @@
+import argparse
+import json
+import time
 from pathlib import Path
 
+import instrumentation
+from aggregates import Count, First, TopMakes, TopModels, aggregate
+from cache import ParseCache
+from dedup import deduplicate
+from ingest import AuctionIngestor
 from loader import AuctionLoader
 from parser import CsvAuctionParser
-from service import AuctionService
+from stats import StatisticsAccumulator
 from time_utils import to_local_time
 
 
+def watch(data_dir: Path, interval: float) -> None:
+    """Tryb ciągły: co `interval` sekund wczytuje tylko nowe lub zmienione pliki."""
+    cache_dir = data_dir.parent / ".cache"
+    top_makes = TopMakes(10)
+    ingestor = AuctionIngestor(
+        CsvAuctionParser(),
+        data_dir,
+        manifest_path=cache_dir / "manifest.json",
+        cache=ParseCache(cache_dir / "auctions"),
+        aggregators=[top_makes],
+    )
+    while True:
+        report = ingestor.scan()
+        if report.added or report.changed or report.removed or report.restored:
+            print(
+                f"Nowe: {len(report.added)}, zmienione: {len(report.changed)}, "
+                f"usunięte: {len(report.removed)}, odtworzone: {len(report.restored)} | "
+                f"dodano {report.inserted}, zastąpiono {report.replaced}, "
+                f"wycofano {report.retracted} | aukcji: {len(ingestor)}"
+            )
+            print("Top 10 marek: " + ", ".join(f"{make} ({count})" for make, count in top_makes.result()))
+        time.sleep(interval)
+
+
 def main() -> None:
+    cli = argparse.ArgumentParser()
+    cli.add_argument("--watch", type=float, metavar="SEKUNDY",
+                     help="obserwuj katalog data/ i wczytuj przyrostowo nowe pliki")
+    cli.add_argument("--metrics", action="store_true",
+                     help="wypisz czasy etapów, liczniki i histogram opóźnień plików (JSON)")
+    cli.add_argument("--profile", type=Path, metavar="PLIK",
+                     help="zapisz profil cProfile (pstats) do PLIK; włącza też --metrics")
+    args = cli.parse_args()
+    if args.metrics or args.profile:
+        with instrumentation.instrumented(args.profile) as metrics:
+            run(args)
+        print("\n=== METRYKI ===")
+        print(json.dumps(metrics.summary(), indent=2, ensure_ascii=False))
+        return
+    run(args)
+
+
+def run(args: argparse.Namespace) -> None:
     # Wczytanie wszystkich plików CSV
     # Sprawdź czy jesteśmy w src/ czy w głównym katalogu
     data_dir = Path("../data") if Path("../data").exists() else Path("data")
+    if args.watch is not None:
+        watch(data_dir, args.watch)
+        return
     paths = list(data_dir.glob("*.csv"))
     print(f"Znaleziono {len(paths)} plików CSV\n")
 
-    # Załadowanie danych z użyciem multithreading
-    auctions = AuctionLoader(CsvAuctionParser()).load(paths)
-    print(f"Wczytano {len(auctions)} aukcji\n")
+    # Strumieniowe ładowanie (multithreading) - wszystkie agregaty w jednym przejściu;
+    # niezmienione pliki są czytane z cache, a powtórzone numery aukcji liczymy raz;
+    # mediana ze szkicu kwantyli zamiast tablicy wszystkich przebiegów, liczby marek
+    # i oddziałów dokładne (zbiory są małe); wartości przybliżone oznaczamy "~"
+    loader = AuctionLoader(CsvAuctionParser(), cache=ParseCache(data_dir.parent / ".cache" / "auctions"))
+    unique = deduplicate(loader.iter_files(paths))
+    stats, top_makes, top_models, recent_count, sample = aggregate(
+        unique,
+        StatisticsAccumulator(exact_median=False),
+        TopMakes(10),
+        TopModels(5),
+        Count(lambda a: a.vehicle.year >= 2015),
+        First(),
+    )
+    print(f"Wczytano {stats['total_auctions']} aukcji (pominięto duplikatów: {unique.duplicates})\n")
 
     # Podstawowe statystyki
-    stats = AuctionService.get_statistics(auctions)
     print("=== STATYSTYKI ===")
     print(f"Liczba aukcji: {stats['total_auctions']}")
     print(f"Unikalne marki: {stats['unique_makes']}")
     print(f"Unikalne oddziały: {stats['unique_branches']}")
     print(f"Zakres lat: {stats['year_range'][0]}-{stats['year_range'][1]}")
     print(f"Średni przebieg: {stats['avg_mileage']:.0f} mil" if stats['avg_mileage'] else "Średni przebieg: brak danych")
-    print(f"Mediana przebiegu: {stats['median_mileage']:.0f} mil" if stats['median_mileage'] else "Mediana przebiegu: brak danych")
+    print(f"Mediana przebiegu: ~{stats['median_mileage']:.0f} mil" if stats['median_mileage'] else "Mediana przebiegu: brak danych")
     print(f"\nTypy pojazdów:")
     for vtype, count in stats['vehicle_types'].items():
         print(f"  {vtype.value}: {count}")
+    unmapped = loader.parser.unmapped_vehicle_types
+    if unmapped:
+        print("  Nierozpoznane (liczone jako Other): "
+              + ", ".join(f"{value!r} ({count})" for value, count in unmapped.most_common()))
 
     # Top 10 marek
     print("\n=== TOP 10 MAREK ===")
-    for make, count in AuctionService.get_top_makes(auctions, 10):
+    for make, count in top_makes:
         print(f"{make}: {count}")
 
     # Top 5 modeli
     print("\n=== TOP 5 MODELI ===")
-    for model, count in AuctionService.get_top_models(auctions, 5):
+    for model, count in top_models:
         print(f"{model}: {count}")
 
     # Przykład filtrowania
-    recent_cars = AuctionService.filter_by_year(auctions, 2015)
     print(f"\n=== POJAZDY Z 2015+ ===")
-    print(f"Liczba: {len(recent_cars)}")
+    print(f"Liczba: {recent_count}")
 
     # Przykładowa aukcja
-    if auctions:
+    if sample is not None:
         print("\n=== PRZYKŁADOWA AUKCJA ===")
-        sample = auctions[0]
         print(f"Marka: {sample.vehicle.make}")
         print(f"Model: {sample.vehicle.model}")
         print(f"Rok: {sample.vehicle.year}")
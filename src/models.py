@@ -1,9 +1,12 @@
 from datetime import datetime
 from enum import Enum
+from typing import NamedTuple, Sequence
 
-from pydantic import Field, field_validator
+from pydantic import Field, ValidationInfo, field_validator
 from pydantic.dataclasses import dataclass
 
+from symbols import BRANCHES, MAKES, MODELS
+
 
 class VehicleType(Enum):
     AUTOMOBILE = "Automobiles"
@@ -11,23 +14,88 @@ class VehicleType(Enum):
     SUV = "SUV"
     MOTORCYCLE = "Motorcycle"
     OTHER = "Other"
+    VAN = "Van"
+
+    @classmethod
+    def lookup(cls, value: str) -> "VehicleType | None":
+        """Typ dla wartości z eksportu wg `_VEHICLE_TYPES`; spoza słownika -> None.
+
+        Wielkość liter nie ma znaczenia, a dopisek po przecinku
+        ("SUVs,Fleet Vehicles") jest pomijany.
+        """
+        return _VEHICLE_TYPES.get(value.partition(",")[0].strip().lower())
 
     @classmethod
     def from_string(cls, value: str) -> "VehicleType":
         """Parsuje string do VehicleType, zwraca OTHER jeśli nie znaleziono."""
-        for member in cls:
-            if member.value.lower() == value.lower():
-                return member
-        return cls.OTHER
+        return cls.lookup(value) or cls.OTHER
+
+
+class StartCode(Enum):
+    RUN_AND_DRIVE = "Run & Drive"
+    STARTS = "Starts"
+    STATIONARY = "Stationary"
+    UNKNOWN = "Unknown"
+
+    @classmethod
+    def from_string(cls, value: str) -> "StartCode | None":
+        """Parsuje kod uruchomienia; pusty -> None, nieznany -> UNKNOWN."""
+        value = value.strip()
+        if not value:
+            return None
+        return _START_CODES.get(value.lower(), cls.UNKNOWN)
 
 
-@dataclass(frozen=True)
+_START_CODES = {member.value.lower(): member for member in StartCode}
+
+# Pisownie typu pojazdu (małymi literami) -> typ: wartości enuma, liczba mnoga
+# i słownik "Vehicle Type" z eksportów Copart. Znane kategorie bez własnego
+# typu (przyczepy, autobusy...) to jawnie OTHER - nie trafiają do raportu nieznanych.
+_VEHICLE_TYPES = {
+    **{member.value.lower(): member for member in VehicleType},
+    "": VehicleType.OTHER,
+    "automobile": VehicleType.AUTOMOBILE,
+    "car": VehicleType.AUTOMOBILE,
+    "cars": VehicleType.AUTOMOBILE,
+    "trucks": VehicleType.TRUCK,
+    "pick-up truck": VehicleType.TRUCK,
+    "pick-up trucks": VehicleType.TRUCK,
+    "pickup truck": VehicleType.TRUCK,
+    "pickup trucks": VehicleType.TRUCK,
+    "heavy duty truck": VehicleType.TRUCK,
+    "heavy duty trucks": VehicleType.TRUCK,
+    "medium duty/box trucks": VehicleType.TRUCK,
+    "suvs": VehicleType.SUV,
+    "motorcycles": VehicleType.MOTORCYCLE,
+    "dirt bikes": VehicleType.MOTORCYCLE,
+    "vans": VehicleType.VAN,
+    "classics": VehicleType.OTHER,
+    "trailers": VehicleType.OTHER,
+    "buses": VehicleType.OTHER,
+    "boats": VehicleType.OTHER,
+    "jet skis": VehicleType.OTHER,
+    "snowmobiles": VehicleType.OTHER,
+    "atvs": VehicleType.OTHER,
+    "industrial equipment": VehicleType.OTHER,
+    "recreational/ miscellaneous": VehicleType.OTHER,
+    "recreational/miscellaneous": VehicleType.OTHER,
+    "recreational vehicle (rvs)": VehicleType.OTHER,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Vehicle:
     year: int
     make: str
     model: str
     vehicle_type: VehicleType = Field(default=VehicleType.OTHER)
     mileage: int | None = None
+    vin: str | None = None
+    # kategorie o małej liczności - stringi internowane przez parser
+    odometer_status: str | None = None
+    primary_damage: str | None = None
+    title: str | None = None
+    start_code: StartCode | None = None
 
     @field_validator("year", mode="after")
     @classmethod
@@ -38,9 +106,10 @@ class Vehicle:
 
     @field_validator("make", "model", mode="before")
     @classmethod
-    def strip_whitespace(cls, v: str) -> str:
+    def strip_whitespace(cls, v: str, info: ValidationInfo) -> str:
         if isinstance(v, str):
-            v = v.strip()
+            # przycięty string ze wspólnej tablicy symboli - bez nowej kopii per pojazd
+            v = (MAKES if info.field_name == "make" else MODELS).intern(v)
             if not v:
                 raise ValueError("Field cannot be empty")
         return v
@@ -52,10 +121,134 @@ class Vehicle:
             raise ValueError(f"Mileage must be non-negative, got {v}")
         return v
 
+    @classmethod
+    def construct(
+        cls,
+        year: int,
+        make: str,
+        model: str,
+        vehicle_type: VehicleType = VehicleType.OTHER,
+        mileage: int | None = None,
+        vin: str | None = None,
+        odometer_status: str | None = None,
+        primary_damage: str | None = None,
+        title: str | None = None,
+        start_code: StartCode | None = None,
+    ) -> "Vehicle":
+        """Tworzy pojazd bez walidacji pydantic - tylko dla danych już zwalidowanych."""
+        vehicle = object.__new__(cls)
+        _set_year(vehicle, year)
+        _set_make(vehicle, make)
+        _set_model(vehicle, model)
+        _set_vehicle_type(vehicle, vehicle_type)
+        _set_mileage(vehicle, mileage)
+        _set_vin(vehicle, vin)
+        _set_odometer_status(vehicle, odometer_status)
+        _set_primary_damage(vehicle, primary_damage)
+        _set_title(vehicle, title)
+        _set_start_code(vehicle, start_code)
+        return vehicle
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Auction:
     stock_number: str
     branch: str
     auction_date_utc: datetime
-    vehicle: Vehicle
\ No newline at end of file
+    vehicle: Vehicle
+    # kwoty w centach (USD)
+    acv_cents: int | None = None
+    current_bid_cents: int | None = None
+
+    @field_validator("branch", mode="before")
+    @classmethod
+    def intern_branch(cls, v: str) -> str:
+        return BRANCHES.intern(v) if isinstance(v, str) else v
+
+    @field_validator("acv_cents", "current_bid_cents", mode="after")
+    @classmethod
+    def validate_amount(cls, v: int | None) -> int | None:
+        if v is not None and v < 0:
+            raise ValueError(f"Amount must be non-negative, got {v}")
+        return v
+
+    @classmethod
+    def construct(
+        cls,
+        stock_number: str,
+        branch: str,
+        auction_date_utc: datetime,
+        vehicle: Vehicle,
+        acv_cents: int | None = None,
+        current_bid_cents: int | None = None,
+    ) -> "Auction":
+        """Tworzy aukcję bez walidacji pydantic - tylko dla danych już zwalidowanych."""
+        auction = object.__new__(cls)
+        _set_stock_number(auction, stock_number)
+        _set_branch(auction, branch)
+        _set_auction_date_utc(auction, auction_date_utc)
+        _set_vehicle(auction, vehicle)
+        _set_acv_cents(auction, acv_cents)
+        _set_current_bid_cents(auction, current_bid_cents)
+        return auction
+
+
+# Bezpośrednie settery slotów (omijają __setattr__ zamrożonej dataclass)
+_set_year = Vehicle.year.__set__
+_set_make = Vehicle.make.__set__
+_set_model = Vehicle.model.__set__
+_set_vehicle_type = Vehicle.vehicle_type.__set__
+_set_mileage = Vehicle.mileage.__set__
+_set_vin = Vehicle.vin.__set__
+_set_odometer_status = Vehicle.odometer_status.__set__
+_set_primary_damage = Vehicle.primary_damage.__set__
+_set_title = Vehicle.title.__set__
+_set_start_code = Vehicle.start_code.__set__
+_set_stock_number = Auction.stock_number.__set__
+_set_branch = Auction.branch.__set__
+_set_auction_date_utc = Auction.auction_date_utc.__set__
+_set_vehicle = Auction.vehicle.__set__
+_set_acv_cents = Auction.acv_cents.__set__
+_set_current_bid_cents = Auction.current_bid_cents.__set__
+
+
+class RowError(NamedTuple):
+    """Błąd walidacji pojedynczego wiersza (row - indeks w walidowanej paczce)."""
+
+    row: int
+    field: str
+    reason: str
+
+
+def validate_columns(
+    years: Sequence[int],
+    makes: Sequence[str],
+    models: Sequence[str],
+    mileages: Sequence[int | None],
+    amounts: dict[str, Sequence[int | None]] | None = None,
+) -> list[RowError]:
+    """Kolumnowy odpowiednik walidatorów `Vehicle` i `Auction` - te same reguły, cała paczka naraz.
+
+    Marki i modele muszą być już przycięte (`strip`); `amounts` to kolumny
+    kwot w centach (nazwa pola -> wartości).
+    """
+    errors = [
+        RowError(i, "year", f"Year must be between 1900 and 2030, got {y}")
+        for i, y in enumerate(years)
+        if not 1900 <= y <= 2030
+    ]
+    for field, column in (("make", makes), ("model", models)):
+        if not all(column):
+            errors.extend(RowError(i, field, "Field cannot be empty") for i, v in enumerate(column) if not v)
+    errors.extend(
+        RowError(i, "mileage", f"Mileage must be non-negative, got {m}")
+        for i, m in enumerate(mileages)
+        if m is not None and m < 0
+    )
+    for field, column in (amounts or {}).items():
+        errors.extend(
+            RowError(i, field, f"Amount must be non-negative, got {v}")
+            for i, v in enumerate(column)
+            if v is not None and v < 0
+        )
+    return sorted(errors)
\ No newline at end of file
@@ -1,12 +1,246 @@
+import codecs
 import csv
+import io
+import mmap
+import os
 import re
+import sys
+import threading
+from collections import Counter
+from datetime import date, datetime
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, TextIO
 
-from models import Auction, Vehicle, VehicleType
-from time_utils import parse_auction_datetime
+import instrumentation
+from models import Auction, RowError, StartCode, Vehicle, VehicleType, validate_columns
+from symbols import BRANCHES, MAKES, MODELS
+from time_utils import infer_year, parse_auction_datetime
+
+
+# Nazwy eksportów Copart: "Sales_List_MMDDYYYY (N).csv"
+_EXPORT_DATE = re.compile(r"(\d{2})(\d{2})(\d{4})")
+_MILEAGE = re.compile(r"[\d,]+")
+# Znaki usuwane z kwot "$8,411 USD" przed konwersją na int
+_MONEY_NOISE = str.maketrans("", "", "$, USD")
+
+
+# Kolumny czytane z eksportu: nazwa -> wartość domyślna, gdy kolumny brak (None = wymagana).
+# Nowe pola modelu dopisujemy tutaj (lub przez argument `projection` parsera).
+PROJECTION: dict[str, str | None] = {
+    "Stock Number": None,
+    "Branch Name": None,
+    "Auction Date": None,
+    "Year": None,
+    "Make": None,
+    "Model": None,
+    "Vehicle Type": "Other",
+    "Odometer": "",
+    "Vin#": "",
+    "ODO Status": "",
+    "Primary Damage": "",
+    "Title/Sale Document": "",
+    "Start Code": "",
+    "ACV": "",
+    "Current Bid": "",
+}
+
+
+def _map_distinct(parse: Callable[[str], object], column: tuple[str, ...]) -> list:
+    """Jak `list(map(parse, column))`, ale parsuje każdą unikalną wartość raz (kategorie, kwoty)."""
+    parsed = {value: parse(value) for value in set(column)}
+    return list(map(parsed.__getitem__, column))
+
+
+class RowValidationError(ValueError):
+    """Niepoprawne wiersze w pliku - `errors` zawiera numer linii, pole i powód."""
+
+    def __init__(self, path: Path, errors: list[RowError]):
+        self.path = path
+        self.errors = errors
+        first = errors[0]
+        super().__init__(
+            f"{path}: {len(errors)} invalid value(s), first at line {first.row} ({first.field}): {first.reason}"
+        )
+
+
+class RejectedRow(NamedTuple):
+    """Wiersz odrzucony w trybie tolerancyjnym (line 0 - cały plik)."""
+
+    path: Path
+    line: int
+    field: str
+    reason: str
+
+
+class Quarantine:
+    """Odrzucone wiersze (plik, linia, pole, powód) - ładowanie toczy się dalej bez nich."""
+
+    def __init__(self) -> None:
+        self.rows: list[RejectedRow] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[RejectedRow]:
+        return iter(self.rows)
+
+    def add(self, path: Path, line: int, field: str, reason: str) -> None:
+        self.rows.append(RejectedRow(path, line, field, reason))
+
+    def extend(self, other: "Quarantine") -> None:
+        self.rows.extend(other.rows)
+
+    def by_file(self) -> Counter[Path]:
+        """Liczba odrzuconych wierszy per plik."""
+        return Counter(path for path, _ in {(r.path, r.line) for r in self.rows})
+
+    def write_csv(self, path: Path) -> None:
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(RejectedRow._fields)
+            writer.writerows(self.rows)
+
+
+class FileRange(NamedTuple):
+    """Fragment pliku z `CsvAuctionParser.split`: bajty [start, stop) z pełnymi wierszami.
+
+    `header` (surowy nagłówek) i `year` (rok odniesienia z pierwszego wiersza
+    pliku) są wspólne dla fragmentów; `lines_before` to liczba linii przed
+    `start` - dla numerów linii w błędach.
+    """
+
+    path: Path
+    start: int
+    stop: int
+    lines_before: int
+    header: bytes
+    year: int | None
+
+
+def _row_boundary(buf: mmap.mmap, start: int, target: int, size: int) -> int:
+    """Pozycja za pierwszym końcem wiersza >= `target`; `start` to początek wiersza (poza cudzysłowem)."""
+    if target >= size:
+        return size
+    quoted = buf[start:target].count(b'"') & 1
+    pos = target
+    while (newline := buf.find(b"\n", pos)) != -1:
+        quoted ^= buf[pos:newline].count(b'"') & 1
+        if not quoted:
+            return newline + 1
+        pos = newline + 1
+    return size
+
+
+def _parse_column(
+    parse: Callable[[str], object], column: tuple[str, ...], field: str, errors: list[RowError],
+) -> list:
+    """`list(map(parse, column))`; gdy coś się nie parsuje - drugie przejście po wierszach,
+    a niepoprawne wartości trafiają do `errors` (w wyniku None)."""
+    try:
+        return list(map(parse, column))
+    except (ValueError, OverflowError):
+        pass
+    result = []
+    for i, value in enumerate(column):
+        try:
+            result.append(parse(value))
+        except (ValueError, OverflowError) as e:
+            errors.append(RowError(i, field, str(e)))
+            result.append(None)
+    return result
+
+
+class ProjectedReader:
+    """Czytnik CSV zwracający krotki tylko z kolumn z `projection`.
+
+    Nagłówek jest mapowany na indeksy kolumn raz na plik, a wiersze są
+    wycinane przez `itemgetter` - bez budowania słownika per wiersz jak
+    w `csv.DictReader`. Brakujące kolumny opcjonalne dostają wartość domyślną.
+    """
+
+    def __init__(
+        self,
+        f: TextIO,
+        projection: dict[str, str | None],
+        on_error: Callable[[int, str], None] | None = None,
+    ):
+        """`on_error(linia, powód)` - pomija wiersze ze zbyt małą liczbą kolumn zamiast rzucać wyjątek."""
+        self._reader = csv.reader(f)
+        self._on_error = on_error
+        self.columns = tuple(projection)
+        header = next(self._reader, None)
+        self._getter = self._resolve(header, projection) if header else None
+
+    @staticmethod
+    def _resolve(header: list[str], projection: dict[str, str | None]) -> Callable[[list[str]], tuple]:
+        positions = {name: i for i, name in enumerate(header)}
+        missing = [name for name, default in projection.items() if default is None and name not in positions]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+        absent = [name for name in projection if name not in positions]
+        # brakujące kolumny opcjonalne czytamy z wartości doklejonych na końcu wiersza
+        for offset, name in enumerate(absent):
+            positions[name] = len(header) + offset
+        indices = [positions[name] for name in projection]
+        getter = itemgetter(*indices) if len(indices) > 1 else lambda row: (row[indices[0]],)
+        if not absent:
+            return getter
+        padding = [projection[name] for name in absent]
+        return lambda row: getter(row + padding)
+
+    @property
+    def line_num(self) -> int:
+        return self._reader.line_num
+
+    def __iter__(self) -> Iterator[tuple]:
+        if self._getter is None:
+            return
+        getter = self._getter
+        for row in self._reader:
+            if not row:
+                continue  # pusta linia - DictReader też ją pomija
+            try:
+                values = getter(row)
+            except IndexError:
+                if self._on_error is None:
+                    raise ValueError(f"Line {self._reader.line_num}: too few columns") from None
+                self._on_error(self._reader.line_num, "too few columns")
+                continue
+            yield values
 
 
 class CsvAuctionParser:
+    BATCH_SIZE = 1024
+
+    def __init__(self, projection: dict[str, str | None] | None = None):
+        """`projection` dopisuje kolumny do `PROJECTION` (nazwa -> domyślna wartość, None = wymagana)."""
+        self.projection = {**PROJECTION, **(projection or {})}
+        self._auction_date_pos = list(self.projection).index("Auction Date")
+        # surowe wartości "Vehicle Type" spoza słownika aliasów (zapisane jako OTHER) -> liczba wierszy;
+        # AuctionLoader dolicza tu też trafienia w cache i wyniki procesów roboczych
+        self.unmapped_vehicle_types: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # kopia w procesie roboczym liczy od zera - jej liczniki wracają z wynikiem zadania
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["unmapped_vehicle_types"] = Counter()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_unmapped(self, counts: Counter[str]) -> None:
+        """Dolicza nierozpoznane typy pojazdów (np. z wpisu cache lub procesu roboczego)."""
+        if counts:
+            with self._lock:
+                self.unmapped_vehicle_types.update(counts)
+
     @staticmethod
     def _parse_year(year_str: str) -> int:
         """Parsuje rok - konwertuje dwucyfrowe lata na czterocyfrowe.
@@ -31,26 +265,279 @@ class CsvAuctionParser:
         if not odometer_str:
             return None
         # Wyciągamy cyfry z formatu "162,022 mi"
-        match = re.search(r"[\d,]+", odometer_str)
+        match = _MILEAGE.search(odometer_str)
         if match:
             return int(match.group().replace(",", ""))
         return None
 
     @staticmethod
-    def parse_row(row: dict) -> Auction:
+    def _parse_money(amount_str: str) -> int | None:
+        """Parsuje kwotę np. '$8,411 USD' na centy (841100); pusta lub nieczytelna -> None."""
+        dollars, _, cents = amount_str.translate(_MONEY_NOISE).partition(".")
+        if not dollars:
+            return None
+        try:
+            return int(dollars) * 100 + (int(cents[:2].ljust(2, "0")) if cents else 0)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _parse_category(value: str) -> str | None:
+        """Wartość kategorii (np. 'Front End') - internowana, pusta -> None."""
+        return sys.intern(value.strip()) or None
+
+    def _vehicle_types(self, column: tuple[str, ...], counts: Counter[str] | None = None) -> list[VehicleType]:
+        """Typy pojazdów dla kolumny - każda unikalna wartość sprawdzana raz w słowniku aliasów.
+
+        Nierozpoznane wartości są doliczane do `unmapped_vehicle_types` i do `counts`.
+        """
+        parsed = {value: VehicleType.lookup(value) for value in set(column)}
+        unmapped = {value for value, member in parsed.items() if member is None}
+        if unmapped:
+            batch = Counter(value for value in column if value in unmapped)
+            self.add_unmapped(batch)
+            if counts is not None:
+                counts.update(batch)
+            parsed.update(dict.fromkeys(unmapped, VehicleType.OTHER))
+        return list(map(parsed.__getitem__, column))
+
+    @staticmethod
+    def export_date(path: Path) -> date | None:
+        """Odczytuje datę eksportu z nazwy pliku, np. 'Sales_List_03042024 (12).csv'."""
+        match = _EXPORT_DATE.search(path.stem)
+        if match is None:
+            return None
+        month, day, year = (int(g) for g in match.groups())
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _reference_year(path: Path, auction_date: str) -> int | None:
+        """Rok odniesienia dla dat bez roku - z nazwy pliku, a w ostateczności z dnia tygodnia."""
+        exported = CsvAuctionParser.export_date(path)
+        if exported is not None:
+            return exported.year
+        return infer_year(auction_date)
+
+    @staticmethod
+    def parse_row(row: dict, year: int | None = None) -> Auction:
+        """Parsuje pojedynczy wiersz z pełną walidacją pydantic (granica zaufania)."""
         return Auction(
             stock_number=str(row["Stock Number"]),
             branch=row["Branch Name"],
-            auction_date_utc=parse_auction_datetime(row["Auction Date"]),
+            auction_date_utc=parse_auction_datetime(row["Auction Date"], year),
             vehicle=Vehicle(
                 year=CsvAuctionParser._parse_year(row["Year"]),
                 make=row["Make"],
                 model=row["Model"],
                 vehicle_type=VehicleType.from_string(row.get("Vehicle Type", "Other")),
                 mileage=CsvAuctionParser._parse_mileage(row.get("Odometer", "")),
+                vin=row.get("Vin#", "").strip() or None,
+                odometer_status=CsvAuctionParser._parse_category(row.get("ODO Status", "")),
+                primary_damage=CsvAuctionParser._parse_category(row.get("Primary Damage", "")),
+                title=CsvAuctionParser._parse_category(row.get("Title/Sale Document", "")),
+                start_code=StartCode.from_string(row.get("Start Code", "")),
             ),
+            acv_cents=CsvAuctionParser._parse_money(row.get("ACV", "")),
+            current_bid_cents=CsvAuctionParser._parse_money(row.get("Current Bid", "")),
         )
 
-    def parse_file(self, path: Path) -> list[Auction]:
-        with path.open(encoding="utf-8-sig") as f:
-            return [self.parse_row(r) for r in csv.DictReader(f)]
\ No newline at end of file
+    def _build_batch(
+        self, path: Path, lines: list[int], rows: list[tuple], year: int | None,
+        quarantine: Quarantine | None = None, unmapped: Counter[str] | None = None,
+    ) -> list[Auction]:
+        """Buduje aukcje z paczki wierszy (krotki kolumn z `projection`).
+
+        Paczka jest transponowana do kolumn; walidacja odbywa się kolumnami
+        (`validate_columns`), a obiekty powstają przez `construct` - bez
+        walidatorów pydantic per wiersz. Etapy są mierzone jako `parser.*`
+        (patrz `instrumentation`).
+
+        Niepoprawne wiersze kończą się `RowValidationError`, a z `quarantine`
+        trafiają do niej i paczka jest budowana ponownie z pozostałych wierszy.
+        Nierozpoznane typy pojazdów są doliczane do `unmapped`, jeśli podano.
+        """
+        if not rows:
+            return []
+        errors: list[RowError] = []
+        with instrumentation.timer("parser.columns"):
+            columns = dict(zip(self.projection, zip(*rows)))
+            years = _parse_column(self._parse_year, columns["Year"], "year", errors)
+            # przycięte, internowane symbole - jeden obiekt str na wartość w całym zbiorze
+            makes = list(map(MAKES.intern, columns["Make"]))
+            models = list(map(MODELS.intern, columns["Model"]))
+            branches = list(map(BRANCHES.intern, columns["Branch Name"]))
+            mileages = list(map(self._parse_mileage, columns["Odometer"]))
+            acvs = list(map(self._parse_money, columns["ACV"]))
+            bids = _map_distinct(self._parse_money, columns["Current Bid"])
+
+        if not errors:
+            with instrumentation.timer("parser.validate"):
+                errors = validate_columns(
+                    years, makes, models, mileages, {"acv_cents": acvs, "current_bid_cents": bids},
+                )
+        if not errors:
+            with instrumentation.timer("parser.dates"):
+                dates = self._parse_dates(columns["Auction Date"], year, errors)
+        if errors:
+            return self._reject(path, lines, rows, year, errors, quarantine, unmapped)
+
+        with instrumentation.timer("parser.categories"):
+            vehicle_types = self._vehicle_types(columns["Vehicle Type"], unmapped)
+            odometer_statuses = _map_distinct(self._parse_category, columns["ODO Status"])
+            damages = _map_distinct(self._parse_category, columns["Primary Damage"])
+            titles = _map_distinct(self._parse_category, columns["Title/Sale Document"])
+            start_codes = _map_distinct(StartCode.from_string, columns["Start Code"])
+
+        with instrumentation.timer("parser.construct"):
+            return [
+                Auction.construct(
+                    stock_number,
+                    branch,
+                    auction_date,
+                    Vehicle.construct(
+                        y, make, model, vehicle_type, mileage,
+                        vin.strip() or None, odometer_status, damage, title, start_code,
+                    ),
+                    acv,
+                    bid,
+                )
+                for (
+                    stock_number, branch, auction_date, vehicle_type, y, make, model, mileage,
+                    vin, odometer_status, damage, title, start_code, acv, bid,
+                ) in zip(
+                    columns["Stock Number"], branches, dates, vehicle_types,
+                    years, makes, models, mileages, columns["Vin#"],
+                    odometer_statuses, damages, titles, start_codes, acvs, bids,
+                )
+            ]
+
+    @staticmethod
+    def _parse_dates(column: tuple[str, ...], year: int | None, errors: list[RowError]) -> list[datetime]:
+        return _parse_column(partial(parse_auction_datetime, year=year), column, "auction_date", errors)
+
+    def _reject(
+        self, path: Path, lines: list[int], rows: list[tuple], year: int | None,
+        errors: list[RowError], quarantine: Quarantine | None, unmapped: Counter[str] | None,
+    ) -> list[Auction]:
+        errors = [e._replace(row=lines[e.row]) for e in errors]
+        rejected = {e.row for e in errors}
+        instrumentation.count("parser.rows_rejected", len(rejected))
+        if quarantine is None:
+            raise RowValidationError(path, errors)
+        for e in errors:
+            quarantine.add(path, e.row, e.field, e.reason)
+        kept = [i for i, line in enumerate(lines) if line not in rejected]
+        return self._build_batch(
+            path, [lines[i] for i in kept], [rows[i] for i in kept], year, quarantine, unmapped,
+        )
+
+    def iter_file(
+        self, path: Path, quarantine: Quarantine | None = None, unmapped: Counter[str] | None = None,
+    ) -> Iterator[Auction]:
+        """Parsuje plik leniwie, paczkami po `BATCH_SIZE` wierszy.
+
+        Z `quarantine` (tryb tolerancyjny) niepoprawne wiersze są do niej
+        odkładane, a reszta pliku jest parsowana dalej. `unmapped` zbiera
+        nierozpoznane typy pojazdów tego pliku (np. do wpisu cache).
+        """
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            if instrumentation.enabled():
+                instrumentation.count("parser.files")
+                instrumentation.count("parser.bytes_read", os.fstat(f.fileno()).st_size)
+            reference_year = partial(self._reference_year, path)
+            yield from self._iter_stream(path, f, quarantine, reference_year, unmapped=unmapped)
+
+    def parse_file(
+        self, path: Path, quarantine: Quarantine | None = None, unmapped: Counter[str] | None = None,
+    ) -> list[Auction]:
+        return list(self.iter_file(path, quarantine, unmapped))
+
+    def split(self, path: Path, chunk_bytes: int) -> list[FileRange]:
+        """Dzieli plik na fragmenty po ok. `chunk_bytes` bajtów, zaczynające się od pełnego wiersza.
+
+        Granica to koniec linii poza polem w cudzysłowie ("162,022 mi",
+        "1.2L I-4 DOHC, VVT, 84HP"): liczba znaków `"` od początku pliku
+        musi być parzysta - podwojony `""` jej nie zmienia. Znaki są liczone
+        przez bytes.count na fragmentach mmap, bez dekodowania pliku.
+        """
+        if chunk_bytes < 1:
+            raise ValueError(f"chunk_bytes must be positive, got {chunk_bytes}")
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = len(codecs.BOM_UTF8) if mm[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+                header_end = _row_boundary(mm, start, start, size)
+                header = mm[start:header_end]
+                # rok odniesienia z pierwszego wiersza - wspólny dla wszystkich fragmentów
+                first_end = _row_boundary(mm, header_end, header_end, size)
+                text = io.StringIO((header + mm[header_end:first_end]).decode("utf-8"), newline="")
+                first = next(iter(ProjectedReader(text, self.projection)), None)
+                if first is None:
+                    return []
+                year = self._reference_year(path, first[self._auction_date_pos])
+
+                ranges = []
+                lines = header.count(b"\n")
+                pos = header_end
+                while pos < size:
+                    stop = _row_boundary(mm, pos, pos + chunk_bytes, size)
+                    ranges.append(FileRange(path, pos, stop, lines, header, year))
+                    lines += mm[pos:stop].count(b"\n")
+                    pos = stop
+                return ranges
+
+    def parse_range(
+        self, part: FileRange, quarantine: Quarantine | None = None, unmapped: Counter[str] | None = None,
+    ) -> list[Auction]:
+        """Parsuje fragment pliku z `split` - numery linii w błędach są liczone od początku pliku."""
+        with open(part.path, "rb") as f:
+            f.seek(part.start)
+            data = f.read(part.stop - part.start)
+        instrumentation.count("parser.bytes_read", len(data))
+        text = io.StringIO((part.header + data).decode("utf-8"), newline="")
+        line_offset = part.lines_before - part.header.count(b"\n")
+        return list(self._iter_stream(part.path, text, quarantine, lambda _: part.year, line_offset, unmapped))
+
+    def _iter_stream(
+        self,
+        path: Path,
+        f: TextIO,
+        quarantine: Quarantine | None,
+        reference_year: Callable[[str], int | None],
+        line_offset: int = 0,
+        unmapped: Counter[str] | None = None,
+    ) -> Iterator[Auction]:
+        """Paczki aukcji ze strumienia CSV z nagłówkiem (cały plik lub fragment z `split`)."""
+        on_error = None
+        if quarantine is not None:
+            def on_error(line: int, reason: str) -> None:
+                instrumentation.count("parser.rows_rejected")
+                quarantine.add(path, line + line_offset, "row", reason)
+        reader = ProjectedReader(f, self.projection, on_error)
+        rows = iter(reader)
+        first = next(rows, None)
+        if first is None:
+            return
+        # rok ustalamy raz na plik, parse_auction_datetime zapamiętuje wynik per (wartość, rok)
+        year = reference_year(first[self._auction_date_pos])
+        batch, lines = [first], [reader.line_num + line_offset]
+        while True:
+            # odczyt i dekodowanie CSV jednej paczki (bez czasu konsumenta generatora)
+            with instrumentation.timer("parser.read"):
+                for row in rows:
+                    batch.append(row)
+                    lines.append(reader.line_num + line_offset)
+                    if len(batch) >= self.BATCH_SIZE:
+                        break
+            if len(batch) < self.BATCH_SIZE:
+                break
+            instrumentation.count("parser.rows", len(batch))
+            yield from self._build_batch(path, lines, batch, year, quarantine, unmapped)
+            batch, lines = [], []
+        instrumentation.count("parser.rows", len(batch))
+        yield from self._build_batch(path, lines, batch, year, quarantine, unmapped)
@@ -0,0 +1,109 @@
+from array import array
+from bisect import bisect_left
+from itertools import compress, repeat
+from operator import add, mul
+from typing import Iterable, NamedTuple
+
+from frame import MISSING_AMOUNT, AuctionFrame
+
+
+class PriceSummary(NamedTuple):
+    """Rozkład kwot w grupie (w centach); percentyle z interpolacją liniową."""
+
+    count: int
+    p10: float
+    p50: float
+    p90: float
+
+
+def _percentile(values: list[int], start: int, stop: int, q: float, offset: int) -> float:
+    # ranga q * (n - 1), jak statistics.quantiles(method="inclusive")
+    rank = q * (stop - start - 1)
+    low = int(rank)
+    value = values[start + low] - offset
+    if low == rank:
+        return value
+    return value + (rank - low) * (values[start + low + 1] - values[start + low])
+
+
+def grouped_percentiles(keys: Iterable[int], amounts: array) -> dict[int, PriceSummary]:
+    """Percentyle kwot per klucz grupy - jedno sortowanie całej kolumny.
+
+    Klucz i kwota są łączone w jedną liczbę `klucz * M + kwota`, więc po
+    posortowaniu wiersze każdej grupy leżą obok siebie i są uporządkowane
+    po kwocie; granice grup wyznacza bisect. Wiersze bez kwoty są pomijane.
+    """
+    if not amounts or max(amounts) == MISSING_AMOUNT:
+        return {}
+    scale = max(amounts) + 1
+    # wszystkie przekształcenia przez map() na funkcjach z operator - pętle w C
+    combined = sorted(compress(
+        map(add, map(mul, keys, repeat(scale)), amounts),
+        map(MISSING_AMOUNT.__ne__, amounts),
+    ))
+
+    result = {}
+    start = 0
+    while start < len(combined):
+        key = combined[start] // scale
+        offset = key * scale
+        stop = bisect_left(combined, offset + scale, start)
+        result[key] = PriceSummary(
+            stop - start,
+            _percentile(combined, start, stop, 0.1, offset),
+            _percentile(combined, start, stop, 0.5, offset),
+            _percentile(combined, start, stop, 0.9, offset),
+        )
+        start = stop
+    return result
+
+
+def _amounts(frame: AuctionFrame, amount: str) -> array:
+    if amount not in ("acv_cents", "current_bid_cents"):
+        raise ValueError(f"Unknown amount column: {amount}")
+    return getattr(frame, amount)
+
+
+def prices_by_make_model_year(
+    frame: AuctionFrame, bucket_years: int = 5, amount: str = "acv_cents",
+) -> dict[tuple[str, str, int], PriceSummary]:
+    """Percentyle kwot per (marka, model, początek przedziału lat o szerokości `bucket_years`)."""
+    if bucket_years < 1:
+        raise ValueError(f"bucket_years must be positive, got {bucket_years}")
+    if not len(frame):
+        return {}
+    first = min(frame.years) // bucket_years
+    last = max(frame.years)
+    buckets = last // bucket_years - first + 1
+    bucket_of = array("I", (year // bucket_years - first if year >= first * bucket_years else 0
+                            for year in range(last + 1)))
+    models = len(frame.models)
+    # klucz = (marka * liczba_modeli + model) * liczba_przedziałów + przedział
+    keys = map(
+        add,
+        map(mul, map(add, map(mul, frame.make_codes, repeat(models)), frame.model_codes), repeat(buckets)),
+        map(bucket_of.__getitem__, frame.years),
+    )
+    result = {}
+    for key, summary in grouped_percentiles(keys, _amounts(frame, amount)).items():
+        rest, bucket = divmod(key, buckets)
+        make, model = divmod(rest, models)
+        name = (frame.makes.decode(make), frame.models.decode(model), (first + bucket) * bucket_years)
+        result[name] = summary
+    return result
+
+
+def prices_by_branch(frame: AuctionFrame, amount: str = "acv_cents") -> dict[str, PriceSummary]:
+    """Percentyle kwot per oddział."""
+    return {
+        frame.branches.decode(code): summary
+        for code, summary in grouped_percentiles(frame.branch_codes, _amounts(frame, amount)).items()
+    }
+
+
+def prices_by_damage(frame: AuctionFrame, amount: str = "acv_cents") -> dict[str | None, PriceSummary]:
+    """Percentyle kwot per główne uszkodzenie (None - brak informacji)."""
+    return {
+        frame.damages.decode(code) or None: summary
+        for code, summary in grouped_percentiles(frame.damage_codes, _amounts(frame, amount)).items()
+    }
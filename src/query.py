@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from frame import AuctionFrame
+from models import Auction, VehicleType
+
+
+def _and_masks(masks: list[bytes]) -> bytes:
+    """Łączy maski bajtowe (0/1) w jedną operacją AND na dużych liczbach."""
+    combined = int.from_bytes(masks[0], "little")
+    for mask in masks[1:]:
+        combined &= int.from_bytes(mask, "little")
+    return combined.to_bytes(len(masks[0]), "little")
+
+
+class AuctionQuery:
+    """Leniwe zapytanie nad `AuctionFrame`.
+
+    Kolejne `filter_by_*` tylko dopisują predykat; maski są budowane dopiero
+    przy wykonaniu i łączone w jedną, więc łańcuch filtrów kosztuje jedno
+    przejście na kolumnę zamiast pełnego przejścia po liście na każdy filtr.
+    Agregaty działają na kodach (Counter ~ bincount, argsort ~ group-by).
+    """
+
+    def __init__(self, frame: AuctionFrame, predicates: tuple = ()):
+        self.frame = frame
+        self._predicates = predicates
+
+    def _where(self, build_mask, *args) -> "AuctionQuery":
+        return AuctionQuery(self.frame, self._predicates + ((build_mask, args),))
+
+    def filter_by_year(self, min_year: int, max_year: int | None = None) -> "AuctionQuery":
+        return self._where(AuctionFrame.year_mask, min_year, max_year)
+
+    def filter_by_make(self, makes: list[str]) -> "AuctionQuery":
+        return self._where(AuctionFrame.make_mask, makes)
+
+    def filter_by_vehicle_type(self, vehicle_type: VehicleType) -> "AuctionQuery":
+        return self._where(AuctionFrame.vehicle_type_mask, vehicle_type)
+
+    def filter_by_date_range(self, start_date: datetime, end_date: datetime) -> "AuctionQuery":
+        return self._where(AuctionFrame.date_mask, start_date, end_date)
+
+    def mask(self) -> bytes | None:
+        """Zwraca połączoną maskę lub None, gdy zapytanie nie ma filtrów."""
+        if not self._predicates:
+            return None
+        return _and_masks([build(self.frame, *args) for build, args in self._predicates])
+
+    def collect(self) -> AuctionFrame:
+        mask = self.mask()
+        return self.frame if mask is None else self.frame.take_mask(mask)
+
+    def count(self) -> int:
+        mask = self.mask()
+        return len(self.frame) if mask is None else mask.count(1)
+
+    def to_auctions(self) -> list[Auction]:
+        return self.collect().to_auctions()
+
+    def group_by_make(self) -> dict[str, AuctionFrame]:
+        return self.collect().group_by_make()
+
+    def group_by_branch(self) -> dict[str, AuctionFrame]:
+        return self.collect().group_by_branch()
+
+    def group_by_vehicle_type(self) -> dict[VehicleType, AuctionFrame]:
+        return self.collect().group_by_vehicle_type()
+
+    def get_top_makes(self, n: int = 10) -> list[tuple[str, int]]:
+        return self.collect().get_top_makes(n)
+
+    def get_top_models(self, n: int = 10) -> list[tuple[str, int]]:
+        return self.collect().get_top_models(n)
+
+    def get_average_mileage_by_year(self) -> dict[int, float]:
+        return self.collect().get_average_mileage_by_year()
+
+    def get_statistics(self) -> dict:
+        return self.collect().get_statistics()
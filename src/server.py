@@ -0,0 +1,499 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import pickle
+import signal
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+from cache import ParseCache
+from frame import AuctionFrame
+from ingest import AuctionIngestor, IngestReport
+from models import Auction, VehicleType
+from parser import CsvAuctionParser
+from query import AuctionQuery
+
+
+class QueryError(ValueError):
+    """Niepoprawne parametry zapytania (odpowiedź 400)."""
+
+
+_MIN_DATE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MAX_DATE = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
+
+def _int(values: list[str], name: str) -> int:
+    try:
+        return int(values[-1])
+    except ValueError:
+        raise QueryError(f"{name} must be an integer, got {values[-1]!r}") from None
+
+
+def _date(values: list[str], name: str) -> int:
+    """Znacznik UTC daty ISO; poza zakresem `_MIN_DATE`..`_MAX_DATE` - przycięty do niego."""
+    try:
+        value = datetime.fromisoformat(values[-1])
+        ts = int((value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp())
+    except (ValueError, OverflowError, OSError):
+        raise QueryError(f"{name} must be an ISO date, got {values[-1]!r}") from None
+    return min(max(ts, int(_MIN_DATE.timestamp())), int(_MAX_DATE.timestamp()))
+
+
+def _vehicle_type(values: list[str], name: str) -> str:
+    vehicle_type = VehicleType.lookup(values[-1])
+    if vehicle_type is None:
+        raise QueryError(f"Unknown {name}: {values[-1]!r}")
+    return vehicle_type.value
+
+
+def _makes(values: list[str], name: str) -> tuple[str, ...]:
+    return tuple(sorted({m.strip().lower() for v in values for m in v.split(",") if m.strip()}))
+
+
+# Parametr zapytania -> parser do postaci kanonicznej (klucz cache)
+_PARAMS: dict[str, Callable[[list[str], str], object]] = {
+    "year_min": _int,
+    "year_max": _int,
+    "make": _makes,
+    "vehicle_type": _vehicle_type,
+    "date_from": _date,
+    "date_to": _date,
+    "n": _int,
+    "limit": _int,
+}
+
+
+def normalize(query: str) -> tuple[tuple[str, object], ...]:
+    """Parametry zapytania w postaci kanonicznej: typy, kolejność, wielkość liter marek.
+
+    "make=KIA,ford&year_min=2015" i "year_min=2015&make=Ford&make=kia" dają ten sam klucz.
+    """
+    params = {}
+    for name, values in parse_qs(query, keep_blank_values=True).items():
+        parse = _PARAMS.get(name)
+        if parse is None:
+            raise QueryError(f"Unknown parameter: {name}")
+        params[name] = parse(values, name)
+    return tuple(sorted(params.items()))
+
+
+def _filtered(frame: AuctionFrame, params: dict) -> AuctionQuery:
+    query = AuctionQuery(frame)
+    if "year_min" in params or "year_max" in params:
+        query = query.filter_by_year(params.get("year_min", 0), params.get("year_max"))
+    if "make" in params:
+        query = query.filter_by_make(list(params["make"]))
+    if "vehicle_type" in params:
+        query = query.filter_by_vehicle_type(VehicleType(params["vehicle_type"]))
+    if "date_from" in params or "date_to" in params:
+        query = query.filter_by_date_range(
+            datetime.fromtimestamp(params["date_from"], timezone.utc) if "date_from" in params else _MIN_DATE,
+            datetime.fromtimestamp(params["date_to"], timezone.utc) if "date_to" in params else _MAX_DATE,
+        )
+    return query
+
+
+def _auction_json(auction: Auction) -> dict:
+    vehicle = auction.vehicle
+    return {
+        "stock_number": auction.stock_number,
+        "branch": auction.branch,
+        "auction_date_utc": auction.auction_date_utc.isoformat(),
+        "year": vehicle.year,
+        "make": vehicle.make,
+        "model": vehicle.model,
+        "vehicle_type": vehicle.vehicle_type.value,
+        "mileage": vehicle.mileage,
+        "acv_cents": auction.acv_cents,
+        "current_bid_cents": auction.current_bid_cents,
+    }
+
+
+def _auctions(query: AuctionQuery, params: dict) -> dict:
+    frame = query.collect()
+    limit = max(params.get("limit", 100), 0)
+    return {"count": len(frame), "auctions": [_auction_json(a) for a in frame.take(range(min(limit, len(frame))))]}
+
+
+def _statistics(query: AuctionQuery, params: dict) -> dict:
+    stats = query.get_statistics()
+    stats["vehicle_types"] = {vt.value: count for vt, count in stats["vehicle_types"].items()}
+    return stats
+
+
+# Ścieżka -> operacja wykonywana w procesie roboczym
+ROUTES: dict[str, Callable[[AuctionQuery, dict], object]] = {
+    "/auctions": _auctions,
+    "/count": lambda query, params: {"count": query.count()},
+    "/top-makes": lambda query, params: query.get_top_makes(params.get("n", 10)),
+    "/top-models": lambda query, params: query.get_top_models(params.get("n", 10)),
+    "/mileage-by-year": lambda query, params: query.get_average_mileage_by_year(),
+    "/statistics": _statistics,
+}
+
+
+# Stan procesu roboczego puli zapytań: ramka, jej wersja i katalog z deltami puli
+_frame: AuctionFrame | None = None
+_version = 0
+_delta_dir: Path | None = None
+
+
+def _install_frame(data: bytes, version: int, delta_dir: str) -> None:
+    global _frame, _version, _delta_dir
+    _frame, _version, _delta_dir = pickle.loads(data), version, Path(delta_dir)
+
+
+def _apply_delta(frame: AuctionFrame, removed: set[str], added: AuctionFrame) -> AuctionFrame:
+    """Usuwa wiersze o numerach z `removed` i dopisuje `added`.
+
+    Bez usunięć ramka jest tylko uzupełniana w miejscu (koszt zależy od
+    `added`); usunięcia wymagają przepisania kolumn przez `take`.
+    """
+    if removed:
+        frame = frame.take(i for i, stock in enumerate(frame.stock_numbers) if stock not in removed)
+    frame.append_frame(added)
+    return frame
+
+
+def _execute(path: str, params: tuple, version: int) -> bytes:
+    """Zapytanie i serializacja JSON - w procesie roboczym, na ramce w wersji `version`."""
+    global _frame, _version
+    while _version < version:  # delty zapisane po starcie procesu
+        removed, added = pickle.loads((_delta_dir / f"{_version + 1}.pickle").read_bytes())
+        _frame, _version = _apply_delta(_frame, removed, added), _version + 1
+    kwargs = dict(params)
+    result = ROUTES[path](_filtered(_frame, kwargs), kwargs)
+    return json.dumps(result, ensure_ascii=False).encode()
+
+
+# Po tylu deltach pula jest zastępowana nową, startującą z bieżącej ramki
+_MAX_DELTAS = 32
+
+
+class _QueryPool:
+    """Pula procesów zapytań: ramka trafia do procesów raz, przy starcie (`base_version`).
+
+    Procesy startują z forkserver, a nie przez fork serwera - inaczej
+    dziedziczyłyby otwarte połączenia i klient nie dostałby EOF po ich
+    zamknięciu. Nowsze wersje danych są zapisywane przez `push` jako delty
+    w katalogu tymczasowym puli; proces doczytuje brakujące delty przed
+    zapytaniem o nowszą wersję. Wszystkie procesy startują od razu, a nie
+    przy pierwszych zapytaniach. Tworzona poza pętlą zdarzeń.
+    """
+
+    def __init__(self, frame: AuctionFrame, version: int, max_workers: int | None) -> None:
+        self.base_version = version
+        self._deltas = tempfile.TemporaryDirectory(prefix="auction-deltas-")
+        workers = max_workers or os.cpu_count() or 1
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver") if "forkserver" in methods else None
+        self.executor = ProcessPoolExecutor(
+            workers, mp_context=context, initializer=_install_frame,
+            initargs=(pickle.dumps(frame), version, self._deltas.name),
+        )
+        # zadania zlecone naraz - każde uruchamia osobny proces
+        for future in [self.executor.submit(int) for _ in range(workers)]:
+            future.result()
+
+    def push(self, version: int, removed: set[str], added: AuctionFrame) -> None:
+        """Zapisuje deltę prowadzącą od wersji `version - 1` do `version`."""
+        (Path(self._deltas.name) / f"{version}.pickle").write_bytes(pickle.dumps((removed, added)))
+
+    def run(self, path: str, params: tuple, version: int) -> "asyncio.Future[bytes]":
+        return asyncio.get_running_loop().run_in_executor(self.executor, _execute, path, params, version)
+
+    def shutdown(self, cancel_futures: bool = False) -> None:
+        self.executor.shutdown(cancel_futures=cancel_futures)
+        self._deltas.cleanup()
+
+
+class ResultCache:
+    """LRU wyników zapytań: (wersja danych, ścieżka, parametry kanoniczne) -> JSON.
+
+    Przechowuje `asyncio.Future`, więc równoczesne identyczne zapytania
+    liczone są raz. Nieudane obliczenie nie zostaje w cache.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, asyncio.Future] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: tuple, compute: Callable[[], "asyncio.Future[bytes]"]) -> bytes:
+        future = self._entries.get(key)
+        if future is not None:
+            self.hits += 1
+            instrumentation.count("server.cache_hits")
+            self._entries.move_to_end(key)
+            return await asyncio.shield(future)
+        self.misses += 1
+        instrumentation.count("server.cache_misses")
+        future = self._entries[key] = compute()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._entries.get(key) is future:
+                del self._entries[key]
+            raise
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class AuctionServer:
+    """Serwer HTTP (asyncio) odpowiadający na zapytania o aukcje w JSON.
+
+    Dane są wczytywane (`AuctionIngestor`) do `AuctionFrame`; zapytania
+    i ich serializacja JSON są liczone w puli procesów, więc nie trzymają GIL
+    pętli zdarzeń - ta tylko przyjmuje połączenia i odsyła gotowe odpowiedzi
+    (także z cache). Każde `ingest` ze zmianami podnosi `version`, czyści
+    `ResultCache` i przekazuje puli tylko deltę (`IngestDelta`) - ramka
+    nie jest budowana od nowa, a procesy nie są uruchamiane ponownie. Co
+    `_MAX_DELTAS` wersji pula jest zastępowana nową, z bieżącą ramką.
+
+    GET: /auctions, /count, /top-makes, /top-models, /mileage-by-year,
+    /statistics (filtry: year_min, year_max, make, vehicle_type, date_from,
+    date_to; n, limit), /health. POST /ingest - wczytanie nowych plików.
+    `max_workers` to liczba procesów puli zapytań (None - liczba CPU).
+    """
+
+    def __init__(self, ingestor: AuctionIngestor, cache_size: int = 256, max_workers: int | None = None) -> None:
+        self.ingestor = ingestor
+        self.cache = ResultCache(cache_size)
+        self.max_workers = max_workers
+        # skanowanie katalogu i aktualizacja ramki - stan ingestora jest w tym procesie
+        self.executor = ThreadPoolExecutor(1)
+        self.frame = AuctionFrame()
+        self.version = 0
+        # pula procesów zapytań; powstaje w pierwszym `ingest`
+        self._pool: _QueryPool | None = None
+        self._ingest_lock = asyncio.Lock()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def _scan(self) -> tuple[IngestReport, set[str], AuctionFrame | None]:
+        """Skan katalogu; zwraca raport, usunięte numery i ramkę dopisanych aukcji (None - bez zmian)."""
+        report = self.ingestor.scan()
+        delta = self.ingestor.take_delta()
+        if not (delta.removed or delta.added):
+            return report, delta.removed, None
+        return report, delta.removed, AuctionFrame.from_auctions(delta.added)
+
+    async def ingest(self) -> IngestReport:
+        """Wczytuje zmiany w katalogu; przy zmianach aktualizuje ramkę i pulę, unieważnia cache."""
+        loop = asyncio.get_running_loop()
+        async with self._ingest_lock:
+            report, removed, added = await loop.run_in_executor(self.executor, self._scan)
+            frame, version = self.frame, self.version
+            if added is not None:
+                version += 1
+                frame = await loop.run_in_executor(self.executor, _apply_delta, frame, removed, added)
+            if self._pool is None or version - self._pool.base_version > _MAX_DELTAS:
+                pool = await loop.run_in_executor(self.executor, _QueryPool, frame, version, self.max_workers)
+                old, self._pool = self._pool, pool
+                if old is not None:
+                    # rozpoczęte zapytania kończą się w starej puli, potem jej procesy wygasają
+                    loop.run_in_executor(None, old.shutdown)
+            elif added is not None:
+                await loop.run_in_executor(self.executor, self._pool.push, version, removed, added)
+            self.frame = frame
+            if version != self.version:
+                self.version = version
+                self.cache.clear()
+        return report
+
+    async def handle(self, method: str, target: str) -> tuple[HTTPStatus, bytes]:
+        url = urlsplit(target)
+        if url.path == "/ingest":
+            if method != "POST":
+                return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+            report = await self.ingest()
+            return HTTPStatus.OK, json.dumps({"version": self.version, **report._asdict()}).encode()
+        if method != "GET":
+            return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+        if url.path == "/health":
+            return HTTPStatus.OK, json.dumps({
+                "version": self.version,
+                "auctions": len(self.frame),
+                "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+            }).encode()
+        if url.path not in ROUTES:
+            return _error(HTTPStatus.NOT_FOUND, f"Unknown path: {url.path}")
+        try:
+            params = normalize(url.query)
+        except QueryError as e:
+            return _error(HTTPStatus.BAD_REQUEST, str(e))
+        if self._pool is None:
+            return _error(HTTPStatus.SERVICE_UNAVAILABLE, "Data not loaded yet")
+        pool, version = self._pool, self.version
+        loop = asyncio.get_running_loop()
+        body = await self.cache.get(
+            (version, url.path, params),
+            lambda: pool.run(url.path, params, version),
+        )
+        return HTTPStatus.OK, body
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Obsługa połączenia HTTP/1.1 z keep-alive (bez chunked i bez potokowania)."""
+        try:
+            while True:
+                start = time.perf_counter()
+                headers = {}
+                rejected = False
+                try:
+                    if not (request_line := await _read_line(reader)):
+                        break
+                    start = time.perf_counter()
+                    while (line := await _read_line(reader)) not in (b"\r\n", b"\n", b""):
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    method, target, version, length = _request_head(request_line, headers)
+                except _RequestError as e:
+                    # bez poprawnego nagłówka nie wiadomo, gdzie zaczyna się kolejne żądanie - zamykamy
+                    status, body, version = *_error(e.status, str(e)), "HTTP/1.0"
+                    rejected = True
+                else:
+                    if length:
+                        await reader.readexactly(length)
+                    try:
+                        status, body = await self.handle(method, target)
+                    except Exception as e:  # błąd zapytania nie zamyka serwera
+                        status, body = _error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                instrumentation.observe("server.request", time.perf_counter() - start)
+                if rejected:
+                    await _linger(reader, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        return await asyncio.start_server(self._serve, host, port)
+
+
+# Największa przyjmowana treść żądania (większa - 413); /ingest nie ma treści
+_MAX_CONTENT_LENGTH = 1 << 20
+_LINGER_SECONDS = 1.0
+
+
+class _RequestError(ValueError):
+    """Niepoprawne żądanie HTTP - odpowiedź `status` i zamknięcie połączenia."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except (asyncio.LimitOverrunError, ValueError):  # linia dłuższa niż limit StreamReader
+        raise _RequestError("Request line or header too long") from None
+
+
+async def _linger(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Po odrzuceniu żądania: koniec zapisu i odczyt reszty danych klienta (najwyżej `_LINGER_SECONDS`).
+
+    Zamknięcie gniazda z nieprzeczytanymi danymi wysyła RST, który może
+    dotrzeć do klienta przed odpowiedzią z błędem.
+    """
+    if writer.can_write_eof():
+        writer.write_eof()
+    with suppress(asyncio.TimeoutError):
+        async with asyncio.timeout(_LINGER_SECONDS):
+            while await reader.read(1 << 16):
+                pass
+
+
+def _request_head(request_line: bytes, headers: dict[str, str]) -> tuple[str, str, str, int]:
+    """Metoda, cel, wersja HTTP i długość treści; `_RequestError` dla niepoprawnego żądania."""
+    parts = request_line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise _RequestError("Malformed request line")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise _RequestError(f"Invalid Content-Length: {headers['content-length']!r}")
+    if length > _MAX_CONTENT_LENGTH:
+        raise _RequestError(
+            f"Content-Length exceeds {_MAX_CONTENT_LENGTH} bytes", HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+    return parts[0], parts[1], parts[2], length
+
+
+def _error(status: HTTPStatus, message: str) -> tuple[HTTPStatus, bytes]:
+    return status, json.dumps({"error": message}, ensure_ascii=False).encode()
+
+
+async def serve(data_dir: Path, host: str, port: int, max_workers: int | None) -> None:
+    cache_dir = data_dir.parent / ".cache"
+    ingestor = AuctionIngestor(
+        CsvAuctionParser(), data_dir, manifest_path=cache_dir / "manifest.json", cache=ParseCache(cache_dir / "auctions"),
+    )
+    server = AuctionServer(ingestor, max_workers=max_workers)
+    report = await server.ingest()
+    http = await server.start(host, port)
+    host, port = http.sockets[0].getsockname()[:2]
+    print(f"Wczytano {len(server.frame)} aukcji z {len(report.added) + len(report.restored)} plików", flush=True)
+    print(f"Nasłuchuje na http://{host}:{port}", flush=True)
+    # SIGTERM zamyka serwer normalnie - inaczej procesy robocze puli zostałyby osierocone
+    with suppress(NotImplementedError):  # brak obsługi sygnałów w pętli (Windows)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, http.close)
+    try:
+        async with http:
+            await http.serve_forever()
+    except asyncio.CancelledError:
+        pass  # http.close() przerywa serve_forever
+    finally:
+        server.close()
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description="Serwer zapytań o aukcje (JSON)")
+    cli.add_argument("--data", type=Path, default=Path("data"), help="katalog z plikami CSV")
+    cli.add_argument("--host", default="127.0.0.1")
+    cli.add_argument("--port", type=int, default=8080, help="0 - wolny port")
+    cli.add_argument("--workers", type=int, help="liczba procesów dla zapytań (domyślnie liczba CPU)")
+    args = cli.parse_args()
+    try:
+        asyncio.run(serve(args.data, args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 from datetime import datetime
-from statistics import mean, median
+from statistics import mean
+from typing import Iterable
 
+import instrumentation
 from models import Auction, VehicleType
+from stats import StatisticsAccumulator
+from symbols import MAKES
 
 
 class AuctionService:
     @staticmethod
+    @instrumentation.timed
     def filter_by_year(
         auctions: list[Auction],
         min_year: int,
@@ -20,15 +25,20 @@ class AuctionService:
         ]
 
     @staticmethod
+    @instrumentation.timed
     def filter_by_make(
         auctions: list[Auction],
         makes: list[str],
     ) -> list[Auction]:
-        """Filtruje aukcje po markach (case-insensitive)."""
-        makes_lower = {m.lower() for m in makes}
-        return [a for a in auctions if a.vehicle.make.lower() in makes_lower]
+        """Filtruje aukcje po markach (case-insensitive).
+
+        Normalizujemy symbole marek, nie wiersze - na wiersz jest tylko odczyt ze słownika.
+        """
+        matches = MAKES.matcher(makes)
+        return [a for a in auctions if matches[a.vehicle.make]]
 
     @staticmethod
+    @instrumentation.timed
     def filter_by_vehicle_type(
         auctions: list[Auction],
         vehicle_type: VehicleType,
@@ -37,6 +47,7 @@ class AuctionService:
         return [a for a in auctions if a.vehicle.vehicle_type == vehicle_type]
 
     @staticmethod
+    @instrumentation.timed
     def filter_by_date_range(
         auctions: list[Auction],
         start_date: datetime,
@@ -49,6 +60,7 @@ class AuctionService:
         ]
 
     @staticmethod
+    @instrumentation.timed
     def group_by_make(auctions: list[Auction]) -> dict[str, list[Auction]]:
         """Grupuje aukcje po markach."""
         groups: dict[str, list[Auction]] = defaultdict(list)
@@ -57,6 +69,7 @@ class AuctionService:
         return dict(groups)
 
     @staticmethod
+    @instrumentation.timed
     def group_by_branch(auctions: list[Auction]) -> dict[str, list[Auction]]:
         """Grupuje aukcje po oddziałach."""
         groups: dict[str, list[Auction]] = defaultdict(list)
@@ -65,6 +78,7 @@ class AuctionService:
         return dict(groups)
 
     @staticmethod
+    @instrumentation.timed
     def group_by_vehicle_type(auctions: list[Auction]) -> dict[VehicleType, list[Auction]]:
         """Grupuje aukcje po typach pojazdów."""
         groups: dict[VehicleType, list[Auction]] = defaultdict(list)
@@ -73,11 +87,13 @@ class AuctionService:
         return dict(groups)
 
     @staticmethod
+    @instrumentation.timed
     def get_top_makes(auctions: list[Auction], n: int = 10) -> list[tuple[str, int]]:
         """Zwraca n najpopularniejszych marek."""
         return Counter(a.vehicle.make for a in auctions).most_common(n)
 
     @staticmethod
+    @instrumentation.timed
     def get_top_models(auctions: list[Auction], n: int = 10) -> list[tuple[str, int]]:
         """Zwraca n najpopularniejszych modeli."""
         return Counter(
@@ -85,6 +101,7 @@ class AuctionService:
         ).most_common(n)
 
     @staticmethod
+    @instrumentation.timed
     def get_average_mileage_by_year(auctions: list[Auction]) -> dict[int, float]:
         """Oblicza średni przebieg dla każdego rocznika."""
         year_mileages: dict[int, list[int]] = defaultdict(list)
@@ -99,17 +116,122 @@ class AuctionService:
         }
 
     @staticmethod
+    @instrumentation.timed
     def get_statistics(auctions: list[Auction]) -> dict:
-        """Zwraca podstawowe statystyki o aukcjach."""
-        mileages = [a.vehicle.mileage for a in auctions if a.vehicle.mileage is not None]
-        years = [a.vehicle.year for a in auctions]
-        
-        return {
-            "total_auctions": len(auctions),
-            "unique_makes": len(set(a.vehicle.make for a in auctions)),
-            "unique_branches": len(set(a.branch for a in auctions)),
-            "year_range": (min(years), max(years)) if years else (None, None),
-            "avg_mileage": mean(mileages) if mileages else None,
-            "median_mileage": median(mileages) if mileages else None,
-            "vehicle_types": dict(Counter(a.vehicle.vehicle_type for a in auctions)),
-        }
+        """Zwraca podstawowe statystyki o aukcjach (jedno przejście, patrz StatisticsAccumulator)."""
+        return StatisticsAccumulator().update(auctions).result()
+
+
+class CachedAuctionService:
+    """Odpowiednik `AuctionService` związany z jednym zbiorem aukcji, z pamięcią wyników.
+
+    Wyniki są zapamiętywane per (wersja danych, operacja, argumenty) w LRU
+    o rozmiarze `max_entries`. Zmiana danych (`replace`, `extend`,
+    `invalidate`) podnosi `version` i czyści pamięć. Listy marek w
+    `filter_by_make` są normalizowane (kolejność, wielkość liter).
+    Ranking top-N zapamiętany dla większego n obsługuje każde mniejsze n
+    (`most_common` jest stabilne, więc krótszy ranking to prefiks dłuższego).
+    Zwracane wyniki są współdzielone z pamięcią - nie należy ich modyfikować.
+    """
+
+    def __init__(self, auctions: Iterable[Auction] = (), max_entries: int = 128) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.auctions = list(auctions)
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[tuple, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.auctions)
+
+    def invalidate(self) -> None:
+        """Nowa wersja danych - np. po zmianie listy `auctions` z zewnątrz."""
+        self.version += 1
+        self._results.clear()
+
+    def replace(self, auctions: Iterable[Auction]) -> None:
+        self.auctions = list(auctions)
+        self.invalidate()
+
+    def extend(self, auctions: Iterable[Auction]) -> None:
+        self.auctions.extend(auctions)
+        self.invalidate()
+
+    def _lookup(self, key: tuple) -> object | None:
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def _store(self, key: tuple, result: object) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def _hit(self) -> None:
+        self.hits += 1
+        instrumentation.count("service.cache_hits")
+
+    def _call(self, operation: str, *args) -> object:
+        key = (self.version, operation, args)
+        result = self._lookup(key)
+        if result is not None:
+            self._hit()
+            return result
+        self.misses += 1
+        instrumentation.count("service.cache_misses")
+        result = getattr(AuctionService, operation)(self.auctions, *args)
+        self._store(key, result)
+        return result
+
+    def _top(self, operation: str, n: int) -> list[tuple[str, int]]:
+        key = (self.version, operation)
+        cached = self._lookup(key)
+        if cached is not None:
+            computed, ranking = cached
+            # ranking krótszy niż zamówione n jest pełny - obsłuży każde n
+            if n <= computed or len(ranking) < computed:
+                self._hit()
+                return ranking[:max(n, 0)]
+        self.misses += 1
+        instrumentation.count("service.cache_misses")
+        ranking = getattr(AuctionService, operation)(self.auctions, n)
+        self._store(key, (n, ranking))
+        return ranking[:]
+
+    def filter_by_year(self, min_year: int, max_year: int | None = None) -> list[Auction]:
+        return self._call("filter_by_year", min_year, max_year)
+
+    def filter_by_make(self, makes: list[str]) -> list[Auction]:
+        return self._call("filter_by_make", tuple(sorted({make.lower() for make in makes})))
+
+    def filter_by_vehicle_type(self, vehicle_type: VehicleType) -> list[Auction]:
+        return self._call("filter_by_vehicle_type", vehicle_type)
+
+    def filter_by_date_range(self, start_date: datetime, end_date: datetime) -> list[Auction]:
+        return self._call("filter_by_date_range", start_date, end_date)
+
+    def group_by_make(self) -> dict[str, list[Auction]]:
+        return self._call("group_by_make")
+
+    def group_by_branch(self) -> dict[str, list[Auction]]:
+        return self._call("group_by_branch")
+
+    def group_by_vehicle_type(self) -> dict[VehicleType, list[Auction]]:
+        return self._call("group_by_vehicle_type")
+
+    def get_top_makes(self, n: int = 10) -> list[tuple[str, int]]:
+        return self._top("get_top_makes", n)
+
+    def get_top_models(self, n: int = 10) -> list[tuple[str, int]]:
+        return self._top("get_top_models", n)
+
+    def get_average_mileage_by_year(self) -> dict[int, float]:
+        return self._call("get_average_mileage_by_year")
+
+    def get_statistics(self) -> dict:
+        return self._call("get_statistics")
@@ -0,0 +1,221 @@
+import math
+from array import array
+from collections import Counter
+from hashlib import blake2b
+from typing import Iterable
+
+from models import Auction
+
+
+class HyperLogLog:
+    """Przybliżone zliczanie unikalnych wartości w stałej pamięci (2^p bajtów).
+
+    Używa deterministycznego skrótu (blake2b), więc szkice z różnych procesów
+    można łączyć przez `merge`.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, got {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        h = int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def __len__(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # korekta dla małych liczności
+        return round(estimate)
+
+
+class QuantileSketch:
+    """Szkic kwantyli o względnej dokładności (w stylu DDSketch).
+
+    Wartości trafiają do kubełków o logarytmicznych granicach, więc błąd
+    względny kwantyla nie przekracza `relative_accuracy`, a szkice łączy się
+    przez zsumowanie liczników.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Counter[int] = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracy")
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+class StatisticsAccumulator:
+    """Jednoprzebiegowy, łączalny akumulator statystyk aukcji.
+
+    Tryb dokładny (`exact=True`) zwraca te same wartości co
+    `AuctionService.get_statistics` (unikalne wartości w zbiorach, przebiegi
+    w tablicy dla mediany). Tryb przybliżony działa w stałej pamięci:
+    HyperLogLog dla unikalnych marek/oddziałów i szkic kwantyli dla mediany.
+    `exact_unique` i `exact_median` nadpisują tryb dla pojedynczej statystyki -
+    np. dokładne liczby marek (małe zbiory) przy medianie ze szkicu.
+    Częściowe wyniki (np. per plik lub per proces) łączy `merge`.
+    """
+
+    def __init__(
+        self,
+        exact: bool = True,
+        relative_accuracy: float = 0.01,
+        *,
+        exact_unique: bool | None = None,
+        exact_median: bool | None = None,
+    ) -> None:
+        self.exact_unique = exact if exact_unique is None else exact_unique
+        self.exact_median = exact if exact_median is None else exact_median
+        self.total_auctions = 0
+        self.min_year: int | None = None
+        self.max_year: int | None = None
+        self.vehicle_types: Counter = Counter()
+        # przebieg: dokładna suma + średnia/wariancja metodą Welforda
+        self.mileage_count = 0
+        self.mileage_total = 0
+        self.mileage_mean = 0.0
+        self._mileage_m2 = 0.0
+        if self.exact_unique:
+            self.makes: set[str] | HyperLogLog = set()
+            self.branches: set[str] | HyperLogLog = set()
+        else:
+            self.makes = HyperLogLog()
+            self.branches = HyperLogLog()
+        if self.exact_median:
+            self.mileages: array | QuantileSketch = array("q")
+        else:
+            self.mileages = QuantileSketch(relative_accuracy)
+
+    def add(self, auction: Auction) -> None:
+        vehicle = auction.vehicle
+        self.total_auctions += 1
+        if self.min_year is None or vehicle.year < self.min_year:
+            self.min_year = vehicle.year
+        if self.max_year is None or vehicle.year > self.max_year:
+            self.max_year = vehicle.year
+        self.vehicle_types[vehicle.vehicle_type] += 1
+        self.makes.add(vehicle.make)
+        self.branches.add(auction.branch)
+
+        mileage = vehicle.mileage
+        if mileage is not None:
+            self.mileage_count += 1
+            self.mileage_total += mileage
+            delta = mileage - self.mileage_mean
+            self.mileage_mean += delta / self.mileage_count
+            self._mileage_m2 += delta * (mileage - self.mileage_mean)
+            if self.exact_median:
+                self.mileages.append(mileage)
+            else:
+                self.mileages.add(mileage)
+
+    def update(self, auctions: Iterable[Auction]) -> "StatisticsAccumulator":
+        for auction in auctions:
+            self.add(auction)
+        return self
+
+    def merge(self, other: "StatisticsAccumulator") -> "StatisticsAccumulator":
+        if (other.exact_unique, other.exact_median) != (self.exact_unique, self.exact_median):
+            raise ValueError("Cannot merge exact and approximate accumulators")
+        self.total_auctions += other.total_auctions
+        years = [y for y in (self.min_year, other.min_year) if y is not None]
+        self.min_year = min(years, default=None)
+        years = [y for y in (self.max_year, other.max_year) if y is not None]
+        self.max_year = max(years, default=None)
+        self.vehicle_types.update(other.vehicle_types)
+
+        # łączenie średniej i M2 (Chan i in.)
+        count = self.mileage_count + other.mileage_count
+        if count:
+            delta = other.mileage_mean - self.mileage_mean
+            self.mileage_mean += delta * other.mileage_count / count
+            self._mileage_m2 += (
+                other._mileage_m2 + delta * delta * self.mileage_count * other.mileage_count / count
+            )
+        self.mileage_count = count
+        self.mileage_total += other.mileage_total
+
+        if self.exact_unique:
+            self.makes |= other.makes
+            self.branches |= other.branches
+        else:
+            self.makes.merge(other.makes)
+            self.branches.merge(other.branches)
+        if self.exact_median:
+            self.mileages.extend(other.mileages)
+        else:
+            self.mileages.merge(other.mileages)
+        return self
+
+    @property
+    def mileage_stddev(self) -> float | None:
+        """Odchylenie standardowe próbki przebiegów."""
+        if self.mileage_count < 2:
+            return None
+        return math.sqrt(self._mileage_m2 / (self.mileage_count - 1))
+
+    def _median_mileage(self) -> float | None:
+        if not self.mileage_count:
+            return None
+        if not self.exact_median:
+            return self.mileages.quantile(0.5)
+        ordered = sorted(self.mileages)
+        middle = len(ordered) // 2
+        return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+    def result(self) -> dict:
+        """Zwraca statystyki w formacie `AuctionService.get_statistics`."""
+        return {
+            "total_auctions": self.total_auctions,
+            "unique_makes": len(self.makes),
+            "unique_branches": len(self.branches),
+            "year_range": (self.min_year, self.max_year),
+            "avg_mileage": self.mileage_total / self.mileage_count if self.mileage_count else None,
+            "median_mileage": self._median_mileage(),
+            "vehicle_types": dict(self.vehicle_types),
+        }
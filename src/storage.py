@@ -0,0 +1,287 @@
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import groupby, islice
+from math import ceil, floor
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+import instrumentation
+from cache import ParseCache, file_checksum
+from ingest import file_order
+from loader import from_row, parse_cached, to_row
+from models import Auction, VehicleType
+from parser import CsvAuctionParser
+from time_utils import utc_timestamp
+
+
+# Kolumny w kolejności `AuctionRow` - wiersz z SELECT trafia wprost do `from_row`
+_COLUMNS = (
+    "stock_number", "branch", "auction_ts", "year", "make", "model", "vehicle_type", "mileage",
+    "vin", "odometer_status", "primary_damage", "title", "start_code", "acv_cents", "current_bid_cents",
+)
+_SELECT = ", ".join(_COLUMNS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS auctions (
+    stock_number TEXT PRIMARY KEY,
+    branch TEXT NOT NULL,
+    auction_ts INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    make TEXT NOT NULL,
+    model TEXT NOT NULL,
+    vehicle_type TEXT NOT NULL,
+    mileage INTEGER,
+    vin TEXT,
+    odometer_status TEXT,
+    primary_damage TEXT,
+    title TEXT,
+    start_code TEXT,
+    acv_cents INTEGER,
+    current_bid_cents INTEGER,
+    source TEXT NOT NULL,
+    source_order TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS auctions_make ON auctions (make COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS auctions_branch ON auctions (branch);
+CREATE INDEX IF NOT EXISTS auctions_year ON auctions (year, mileage);
+CREATE INDEX IF NOT EXISTS auctions_ts ON auctions (auction_ts);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    checksum TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+# Upsert po numerze aukcji: wygrywa wersja z późniejszego eksportu (`file_order`),
+# więc kolejność ładowania plików i ich ponowne ładowanie nie zmieniają wyniku
+_UPSERT = (
+    f"INSERT INTO auctions ({_SELECT}, source, source_order) VALUES ({', '.join('?' * (len(_COLUMNS) + 2))}) "
+    "ON CONFLICT (stock_number) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in (*_COLUMNS[1:], "source", "source_order"))
+    + " WHERE excluded.source_order >= auctions.source_order"
+)
+
+
+def _source_order(path: Path) -> str:
+    """`file_order` jako string porównywalny w SQL."""
+    exported, copy, name = file_order(path)
+    return f"{exported.isoformat()}|{copy:010d}|{name}"
+
+
+class LoadReport(NamedTuple):
+    loaded: list[str]
+    skipped: list[str]
+    rows: int
+
+
+class AuctionStore:
+    """Aukcje w lokalnej bazie SQLite - alternatywa dla `list[Auction]` przy dużym archiwum.
+
+    Pliki są ładowane paczkami `executemany` po `batch_size` wierszy, każdy
+    plik w jednej transakcji razem z wpisem w tabeli `files`. Przerwane
+    ładowanie wznawia się od pierwszego niezapisanego pliku, a pliki już
+    zapisane (rozmiar/mtime, a przy ich zmianie skrót zawartości) są
+    pomijane. Aukcje są kluczowane numerem aukcji (patrz `_UPSERT`).
+    Zmieniony plik jest ładowany ponownie, ale aukcje, które z niego
+    zniknęły, zostają w bazie.
+    Zapytania (`query`) to odpowiedniki `AuctionService` wykonywane w SQL.
+    """
+
+    def __init__(self, path: Path | str, batch_size: int = 10_000) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.path = path
+        self.batch_size = batch_size
+        # autocommit - transakcje otwieramy jawnie w `_transaction`
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")  # przy WAL bezpieczne dla spójności
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.execute("PRAGMA optimize")  # statystyki dla planera, zalecane przed zamknięciem
+        self.connection.close()
+
+    def __enter__(self) -> "AuctionStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM auctions").fetchone()[0]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    @instrumentation.timed
+    def load(
+        self, parser: CsvAuctionParser, paths: Iterable[Path], cache: ParseCache | None = None,
+    ) -> LoadReport:
+        """Ładuje nowe lub zmienione pliki; błąd parsowania wycofuje tylko bieżący plik."""
+        loaded, skipped, rows = [], [], 0
+        for path in map(Path, paths):
+            st = path.stat()
+            entry = self.connection.execute(
+                "SELECT size, mtime_ns, checksum FROM files WHERE name = ?", (path.name,),
+            ).fetchone()
+            if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+                skipped.append(path.name)
+                continue
+            checksum = file_checksum(path)
+            if entry is not None and entry[2] == checksum:
+                # plik tylko "dotknięty" - odświeżamy metadane
+                with self._transaction() as db:
+                    db.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ? WHERE name = ?",
+                        (st.st_size, st.st_mtime_ns, path.name),
+                    )
+                skipped.append(path.name)
+                continue
+            count = self._load_file(parser, cache, path, st, checksum)
+            loaded.append(path.name)
+            rows += count
+        return LoadReport(loaded, skipped, rows)
+
+    def _load_file(
+        self, parser: CsvAuctionParser, cache: ParseCache | None, path: Path, st, checksum: str,
+    ) -> int:
+        auctions = iter(parse_cached(parser, cache, path)) if cache is not None else parser.iter_file(path)
+        with self._transaction() as db:
+            count = self._upsert(db, auctions, path)
+            db.execute(
+                "INSERT OR REPLACE INTO files (name, size, mtime_ns, checksum, rows) VALUES (?, ?, ?, ?, ?)",
+                (path.name, st.st_size, st.st_mtime_ns, checksum, count),
+            )
+        return count
+
+    def _upsert(self, db: sqlite3.Connection, auctions: Iterable[Auction], source: Path) -> int:
+        auctions = iter(auctions)
+        tag = (source.name, _source_order(source))
+        count = 0
+        while batch := [(*to_row(a), *tag) for a in islice(auctions, self.batch_size)]:
+            db.executemany(_UPSERT, batch)
+            count += len(batch)
+        instrumentation.count("storage.rows", count)
+        return count
+
+    def add(self, auctions: Iterable[Auction], source: Path) -> int:
+        """Zapisuje aukcje spoza plików CSV; `source` (nazwa pliku) wyznacza pierwszeństwo."""
+        with self._transaction() as db:
+            return self._upsert(db, auctions, Path(source))
+
+    def query(self) -> "StoreQuery":
+        return StoreQuery(self.connection)
+
+
+class StoreQuery:
+    """Zapytanie nad `AuctionStore` - odpowiednik `AuctionQuery` w SQL.
+
+    Kolejne `filter_by_*` dopisują warunek WHERE (filtry po marce, oddziale,
+    roku i dacie korzystają z indeksów), a grupowania i statystyki liczy
+    SQLite - do Pythona trafiają tylko wyniki. Porównanie marek bez względu
+    na wielkość liter dotyczy liter ASCII (COLLATE NOCASE).
+    """
+
+    def __init__(self, connection: sqlite3.Connection, clauses: tuple = ()) -> None:
+        self.connection = connection
+        self._clauses = clauses
+
+    def _where(self, sql: str, *params) -> "StoreQuery":
+        return StoreQuery(self.connection, self._clauses + ((sql, params),))
+
+    def _execute(self, sql: str, *, extra: str = "", tail: str = "", params: tuple = ()) -> sqlite3.Cursor:
+        """Wykonuje `SELECT ... FROM auctions` z warunkami zapytania (i `extra`) oraz `tail`."""
+        conditions = [c for c, _ in self._clauses] + ([extra] if extra else [])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        bound = [p for _, ps in self._clauses for p in ps] + list(params)
+        return self.connection.execute(f"SELECT {sql} FROM auctions{where} {tail}", bound)
+
+    def filter_by_year(self, min_year: int, max_year: int | None = None) -> "StoreQuery":
+        if max_year is None:
+            return self._where("year >= ?", min_year)
+        return self._where("year BETWEEN ? AND ?", min_year, max_year)
+
+    def filter_by_make(self, makes: list[str]) -> "StoreQuery":
+        return self._where(f"make COLLATE NOCASE IN ({', '.join('?' * len(makes))})", *makes)
+
+    def filter_by_branch(self, branches: list[str]) -> "StoreQuery":
+        return self._where(f"branch IN ({', '.join('?' * len(branches))})", *branches)
+
+    def filter_by_vehicle_type(self, vehicle_type: VehicleType) -> "StoreQuery":
+        return self._where("vehicle_type = ?", vehicle_type.value)
+
+    def filter_by_date_range(self, start_date: datetime, end_date: datetime) -> "StoreQuery":
+        return self._where(
+            "auction_ts BETWEEN ? AND ?", ceil(utc_timestamp(start_date)), floor(utc_timestamp(end_date)),
+        )
+
+    def count(self) -> int:
+        return self._execute("COUNT(*)").fetchone()[0]
+
+    def to_auctions(self) -> list[Auction]:
+        return list(map(from_row, self._execute(_SELECT, tail="ORDER BY rowid")))
+
+    def _group_by(self, column: str) -> dict[str, list[Auction]]:
+        rows = self._execute(_SELECT, tail=f"ORDER BY {column}, rowid")
+        index = _COLUMNS.index(column)
+        return {key: list(map(from_row, group)) for key, group in groupby(rows, key=lambda r: r[index])}
+
+    def group_by_make(self) -> dict[str, list[Auction]]:
+        return self._group_by("make")
+
+    def group_by_branch(self) -> dict[str, list[Auction]]:
+        return self._group_by("branch")
+
+    def group_by_vehicle_type(self) -> dict[VehicleType, list[Auction]]:
+        return {VehicleType(key): group for key, group in self._group_by("vehicle_type").items()}
+
+    def _top(self, key: str, n: int) -> list[tuple[str, int]]:
+        # remis rozstrzyga pierwsze wystąpienie - jak w Counter.most_common
+        tail = f"GROUP BY {key} ORDER BY COUNT(*) DESC, MIN(rowid) LIMIT ?"
+        return self._execute(f"{key}, COUNT(*)", tail=tail, params=(n,)).fetchall()
+
+    def get_top_makes(self, n: int = 10) -> list[tuple[str, int]]:
+        return self._top("make", n)
+
+    def get_top_models(self, n: int = 10) -> list[tuple[str, int]]:
+        return self._top("make || ' ' || model", n)
+
+    def get_average_mileage_by_year(self) -> dict[int, float]:
+        return dict(self._execute("year, AVG(mileage)", extra="mileage IS NOT NULL", tail="GROUP BY year").fetchall())
+
+    def _median_mileage(self, count: int) -> float | None:
+        if not count:
+            return None
+        middle = self._execute(
+            "mileage", extra="mileage IS NOT NULL",
+            tail="ORDER BY mileage LIMIT ? OFFSET ?", params=(2 - count % 2, (count - 1) // 2),
+        ).fetchall()
+        return middle[0][0] if count % 2 else (middle[0][0] + middle[1][0]) / 2
+
+    def get_statistics(self) -> dict:
+        """Statystyki w formacie `AuctionService.get_statistics`."""
+        total, makes, branches, min_year, max_year, avg_mileage, mileages = self._execute(
+            "COUNT(*), COUNT(DISTINCT make), COUNT(DISTINCT branch), MIN(year), MAX(year), "
+            "AVG(mileage), COUNT(mileage)"
+        ).fetchone()
+        vehicle_types = self._execute("vehicle_type, COUNT(*)", tail="GROUP BY vehicle_type")
+        return {
+            "total_auctions": total,
+            "unique_makes": makes,
+            "unique_branches": branches,
+            "year_range": (min_year, max_year),
+            "avg_mileage": avg_mileage,
+            "median_mileage": self._median_mileage(mileages),
+            "vehicle_types": {VehicleType(value): count for value, count in vehicle_types},
+        }
@@ -0,0 +1,70 @@
+import sys
+import threading
+from typing import Iterable
+
+
+class SymbolTable:
+    """Wspólna tablica symboli: przycięte, internowane stringi z kodami.
+
+    Każda pisownia wartości z pliku (np. " FORD") dostaje kod raz; kolejne
+    wystąpienia to jedno trafienie w słowniku i ten sam obiekt `str`, więc
+    miliony pojazdów współdzielą kilkaset stringów marek. Postać
+    znormalizowana (`folded`, małe litery) jest liczona raz na symbol.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.folded: list[str] = []
+        self.codes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, raw: str) -> int:
+        code = self.codes.get(raw)
+        if code is None:
+            with self._lock:
+                value = sys.intern(raw.strip())
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.folded.append(value.lower())
+                    self.codes[value] = code
+                self.codes[raw] = code
+        return code
+
+    def intern(self, raw: str) -> str:
+        return self.values[self.code(raw)]
+
+    def fold(self, raw: str) -> str:
+        return self.folded[self.code(raw)]
+
+    def matcher(self, names: Iterable[str]) -> "SymbolMatcher":
+        return SymbolMatcher(self, names)
+
+
+class SymbolMatcher(dict):
+    """Wartość -> czy pasuje do `names` (bez względu na wielkość liter).
+
+    Znane symbole są rozstrzygnięte z góry, a nieznane - raz, przy pierwszym
+    wystąpieniu - więc filtr po wierszach to tylko odczyt ze słownika.
+    Nieznane wartości nie trafiają do tablicy symboli, tylko do tego słownika.
+    """
+
+    def __init__(self, table: SymbolTable, names: Iterable[str]) -> None:
+        self.table = table
+        self.names = {name.lower() for name in names}
+        super().__init__((value, folded in self.names) for value, folded in zip(table.values, table.folded))
+
+    def __missing__(self, value: str) -> bool:
+        code = self.table.codes.get(value)
+        folded = self.table.folded[code] if code is not None else value.strip().lower()
+        matches = self[value] = folded in self.names
+        return matches
+
+
+MAKES = SymbolTable()
+MODELS = SymbolTable()
+BRANCHES = SymbolTable()
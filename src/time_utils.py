@@ -1,4 +1,6 @@
-from datetime import datetime, timezone
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from dateutil import parser
@@ -17,6 +19,26 @@ TZINFOS = {
 LOCAL_TZ = ZoneInfo("Europe/Warsaw")
 
 
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"],
+        start=1,
+    )
+}
+
+WEEKDAYS = {name: number for number, name in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])}
+
+
+# Format eksportów Copart: "Mon Mar 04, 8:30am CST" (strefa może wystąpić kilka razy,
+# np. "Wed Sep 03, 3:30pm CEDT / CEST")
+_COPART_DATETIME = re.compile(
+    r"(mon|tue|wed|thu|fri|sat|sun)\s+([a-z]{3})\s+(\d{1,2}),\s*"
+    r"(\d{1,2}):(\d{2})\s*([ap]m)\s+([A-Za-z/ ]+)",
+    re.IGNORECASE,
+)
+
+
 def _normalize_timezone_tokens(value: str) -> str:
     tokens = value.split()
     known_tz = [t for t in tokens if t in TZINFOS]
@@ -29,10 +51,50 @@ def _normalize_timezone_tokens(value: str) -> str:
     return " ".join(tokens)
 
 
-def parse_auction_datetime(value: str) -> datetime:
+def _align_year(year: int, month: int, day: int, weekday: int) -> int:
+    """Dobiera rok (year, year+1, year-1) zgodny z dniem tygodnia z eksportu.
+
+    Obsługuje przełom roku, np. plik z 30 grudnia z aukcjami 2 stycznia.
+    """
+    for candidate in (year, year + 1, year - 1):
+        try:
+            if date(candidate, month, day).weekday() == weekday:
+                return candidate
+        except ValueError:
+            continue
+    return year
+
+
+def _parse_fast(value: str, year: int, align: bool = False) -> datetime | None:
+    """Szybka ścieżka dla znanego formatu Copart, None jeśli format nie pasuje."""
+    match = _COPART_DATETIME.fullmatch(value.strip())
+    if match is None:
+        return None
+
+    weekday_name, month_name, day, hour, minute, meridiem, tz_part = match.groups()
+    month = MONTHS.get(month_name.lower())
+    tz_tokens = [t for t in tz_part.split() if t != "/"]
+    day, hour = int(day), int(hour)
+    if month is None or not tz_tokens or not 1 <= hour <= 12:
+        return None
+    if any(t not in TZINFOS for t in tz_tokens):
+        return None
+
+    if align:
+        year = _align_year(year, month, day, WEEKDAYS[weekday_name.lower()])
+    hour = hour % 12 + (12 if meridiem.lower() == "pm" else 0)
+    try:
+        local = datetime(year, month, day, hour, int(minute), tzinfo=TZINFOS[tz_tokens[-1]])
+    except ValueError:
+        return None
+    return local.astimezone(timezone.utc)
+
+
+def _parse_with_dateutil(value: str, year: int | None = None) -> datetime:
     cleaned = _normalize_timezone_tokens(value)
 
-    dt = parser.parse(cleaned, tzinfos=TZINFOS)
+    default = datetime(year, 1, 1) if year is not None else None
+    dt = parser.parse(cleaned, default=default, tzinfos=TZINFOS)
 
     if dt.tzinfo is None:
         raise ValueError(f"Nieznana lub brak strefy czasowej: {value}")
@@ -40,5 +102,55 @@ def parse_auction_datetime(value: str) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+@lru_cache(maxsize=4096)
+def _parse_cached(value: str, year: int, align: bool) -> datetime:
+    return _parse_fast(value, year, align) or _parse_with_dateutil(value, year)
+
+
+def infer_year(value: str, today: date | None = None) -> int | None:
+    """Zgaduje rok daty bez roku - ostatni rok <= bieżącego o zgodnym dniu tygodnia.
+
+    Zwraca None, jeśli wartość nie ma formatu Copart.
+    """
+    match = _COPART_DATETIME.fullmatch(value.strip())
+    month = MONTHS.get(match.group(2).lower()) if match else None
+    if month is None:
+        return None
+
+    weekday = WEEKDAYS[match.group(1).lower()]
+    day = int(match.group(3))
+    current = (today or date.today()).year
+    # kalendarz powtarza się co najwyżej co 28 lat (29 lutego - rzadziej)
+    for year in range(current, current - 40, -1):
+        try:
+            if date(year, month, day).weekday() == weekday:
+                return year
+        except ValueError:
+            continue
+    return None
+
+
+def parse_auction_datetime(value: str, year: int | None = None) -> datetime:
+    """Parsuje datę aukcji do UTC.
+
+    Daty Copart nie zawierają roku. Jeśli podano `year` (rok odniesienia
+    ustalony raz na plik), rok jest korygowany o +-1 wg dnia tygodnia;
+    bez niego - jak w dateutil - przyjmowany jest bieżący rok.
+
+    Eksport zawiera zaledwie kilka różnych wartości, więc wynik jest
+    zapamiętywany (klucz: surowy string + rok).
+    """
+    if year is None:
+        return _parse_cached(value, datetime.now().year, False)
+    return _parse_cached(value, year, True)
+
+
 def to_local_time(dt_utc: datetime) -> datetime:
     return dt_utc.astimezone(LOCAL_TZ)
+
+
+def utc_timestamp(dt: datetime) -> float:
+    """Znacznik czasu daty ze strefą; data bez strefy -> TypeError, jak w `AuctionService`."""
+    if dt.tzinfo is None or dt.utcoffset() is None:
+        raise TypeError("can't compare offset-naive and offset-aware datetimes")
+    return dt.timestamp()
@@ -0,0 +1,143 @@
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Iterable, Mapping
+from zoneinfo import ZoneInfo
+
+from frame import AuctionFrame
+from models import Auction
+from time_utils import LOCAL_TZ
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_DAY = 86_400
+_HOUR = 3_600
+_SAMPLE_STEP = 7 * _DAY  # dwie zmiany czasu w jednym tygodniu nie występują w praktyce
+
+
+def _utc_offset(zone: ZoneInfo, ts: int) -> int:
+    return int(datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+
+
+class ZoneTable:
+    """Tabela zmian czasu strefy: momenty przejść (sekundy UTC) i obowiązujące przesunięcia.
+
+    Przejścia są wyznaczane raz z `zoneinfo` dla lat `start_year`..`end_year`
+    (próbkowanie co tydzień i bisekcja do sekundy), więc przeliczenie znacznika
+    czasu to `bisect` w tablicy zamiast `astimezone`. Poza zakresem tabeli
+    przesunięcie liczy `zoneinfo`.
+    """
+
+    def __init__(self, zone: ZoneInfo | str = LOCAL_TZ, start_year: int = 1970, end_year: int = 2100) -> None:
+        self.zone = ZoneInfo(zone) if isinstance(zone, str) else zone
+        self.start = int(datetime(start_year, 1, 1, tzinfo=timezone.utc).timestamp())
+        self.end = int(datetime(end_year + 1, 1, 1, tzinfo=timezone.utc).timestamp())
+        self.transitions = array("q", [self.start])
+        self.offsets = array("q", [_utc_offset(self.zone, self.start)])
+        previous = self.start
+        for ts in range(self.start + _SAMPLE_STEP, self.end + _SAMPLE_STEP, _SAMPLE_STEP):
+            ts = min(ts, self.end)
+            if _utc_offset(self.zone, ts) != self.offsets[-1]:
+                self._add_transition(previous, ts)
+            previous = ts
+
+    def _add_transition(self, low: int, high: int) -> None:
+        """Bisekcja: pierwsza sekunda z (low, high], w której przesunięcie się zmienia."""
+        before = self.offsets[-1]
+        while high - low > 1:
+            middle = (low + high) // 2
+            if _utc_offset(self.zone, middle) == before:
+                low = middle
+            else:
+                high = middle
+        self.transitions.append(high)
+        self.offsets.append(_utc_offset(self.zone, high))
+
+    def offset(self, ts: int) -> int:
+        """Przesunięcie strefy względem UTC (sekundy) w chwili `ts`."""
+        if self.start <= ts < self.end:
+            return self.offsets[bisect_right(self.transitions, ts) - 1]
+        return _utc_offset(self.zone, ts)
+
+    def localize(self, timestamps: Iterable[int]) -> array:
+        """Kolumna znaczników UTC -> lokalne sekundy "ściennego" czasu strefy.
+
+        Eksport ma niewiele różnych godzin aukcji, więc każda wartość jest
+        przeliczana raz (`_LocalSeconds`), a reszta to odczyty ze słownika.
+        """
+        return array("q", map(_LocalSeconds(self).__getitem__, timestamps))
+
+
+class _LocalSeconds(dict):
+    """Znacznik UTC -> lokalne sekundy; nowe wartości liczone przy pierwszym wystąpieniu."""
+
+    def __init__(self, table: ZoneTable) -> None:
+        super().__init__()
+        self.table = table
+
+    def __missing__(self, ts: int) -> int:
+        local = self[ts] = ts + self.table.offset(ts)
+        return local
+
+
+@lru_cache(maxsize=16)
+def zone_table(zone: ZoneInfo | str = LOCAL_TZ) -> ZoneTable:
+    """Współdzielona tabela dla strefy (budowa to kilka tysięcy wywołań `zoneinfo`)."""
+    return ZoneTable(zone)
+
+
+class CalendarHistogram:
+    """Liczba aukcji per oddział, lokalny dzień i godzina w strefie `zone`.
+
+    Zlicza pary (oddział, znacznik UTC) - aukcje odbywają się o kilku stałych
+    godzinach, więc na dzień i godzinę przeliczane są tylko unikalne pary.
+    `add_frame` robi to jednym przejściem po kolumnach ramki (Counter w C),
+    a `add`/`remove` pozwalają używać histogramu jako operatora strumienia.
+    """
+
+    def __init__(self, zone: ZoneInfo | str = LOCAL_TZ) -> None:
+        self.table = zone_table(zone)
+        self.counts: Counter[tuple[str, int]] = Counter()
+
+    def add(self, auction: Auction) -> None:
+        self.counts[auction.branch, int(auction.auction_date_utc.timestamp())] += 1
+
+    def remove(self, auction: Auction) -> None:
+        key = auction.branch, int(auction.auction_date_utc.timestamp())
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            del self.counts[key]
+
+    def add_counts(self, counts: Mapping[tuple[str, int], int]) -> None:
+        """Dodaje gotowe liczności par (oddział, znacznik UTC), np. z GROUP BY w SQL."""
+        self.counts.update(counts)
+
+    def add_frame(self, frame: AuctionFrame) -> None:
+        decode = frame.branches.decode
+        self.add_counts({
+            (decode(branch), ts): n for (branch, ts), n in Counter(zip(frame.branch_codes, frame.timestamps)).items()
+        })
+
+    def merge(self, other: "CalendarHistogram") -> "CalendarHistogram":
+        if other.table.zone != self.table.zone:
+            raise ValueError("Cannot merge histograms for different time zones")
+        self.counts.update(other.counts)
+        return self
+
+    def result(self) -> dict[str, dict[date, list[int]]]:
+        """Oddział -> lokalny dzień -> 24 liczniki godzinowe (dni rosnąco).
+
+        W dniu zmiany czasu na zimowy powtórzona godzina trafia do jednego licznika.
+        """
+        pairs = list(self.counts)
+        local = self.table.localize(ts for _, ts in pairs)
+        buckets: dict[str, dict[int, list[int]]] = {}
+        for (branch, _), seconds, n in zip(pairs, local, self.counts.values()):
+            day, rest = divmod(seconds, _DAY)
+            buckets.setdefault(branch, {}).setdefault(day, [0] * 24)[rest // _HOUR] += n
+        return {
+            branch: {date.fromordinal(_EPOCH_ORDINAL + day): hours[day] for day in sorted(hours)}
+            for branch, hours in buckets.items()
+        }
@@ -0,0 +1,66 @@
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+
+from models import Auction, Vehicle, VehicleType
+
+
+# Wspólne dane testowe: pliki CSV w formacie eksportu i losowe aukcje
+
+HEADER = "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type,Odometer\n"
+
+MAKES = ["Ford", "FORD", "Toyota", "Honda", "Kia"]
+MODELS = ["Focus", "F-150", "Corolla", "Civic", "Rio"]
+BRANCHES = ["Chicago", "Dallas", "New York"]
+BASE_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Wartości kolumn wiersza CSV, których test nie podaje
+_ROW_DEFAULTS = {
+    "date": "Mon Mar 04, 8:30am CST",
+    "branch": "Chicago",
+    "year": 2015,
+    "make": "FORD",
+    "model": "FOCUS",
+    "vehicle_type": "Automobiles",
+    "mileage": 120_000,
+}
+
+
+def csv_row(stock: object, **columns) -> str:
+    """Wiersz CSV eksportu; przebieg None - pusta kolumna Odometer."""
+    row = {**_ROW_DEFAULTS, **columns}
+    odometer = "" if row["mileage"] is None else f'"{row["mileage"]:,} mi"'
+    return (
+        f'"{row["date"]}",{row["branch"]},{stock},{row["year"]},{row["make"]},{row["model"]},'
+        f"{row['vehicle_type']},{odometer}\n"
+    )
+
+
+def write_csv(path: Path, rows: Iterable[tuple], fields: tuple[str, ...] = ("stock",), **defaults) -> Path:
+    """Zapisuje plik CSV; każdy wiersz to krotka wartości kolumn `fields`, reszta z `defaults`."""
+    lines = []
+    for values in rows:
+        columns = {**defaults, **dict(zip(fields, values if isinstance(values, tuple) else (values,)))}
+        lines.append(csv_row(**columns))
+    path.write_text(HEADER + "".join(lines), encoding="utf-8")
+    return path
+
+
+def random_auctions(rng: random.Random, n: int, offset: int = 0) -> list[Auction]:
+    """Losowe aukcje z `MAKES`/`MODELS`/`BRANCHES` i datami z roku od `BASE_DATE`."""
+    return [
+        Auction(
+            stock_number=str(offset + i),
+            branch=rng.choice(BRANCHES),
+            auction_date_utc=BASE_DATE + timedelta(hours=rng.randrange(24 * 365)),
+            vehicle=Vehicle(
+                year=rng.randint(1995, 2025),
+                make=rng.choice(MAKES),
+                model=rng.choice(MODELS),
+                vehicle_type=rng.choice(list(VehicleType)),
+                mileage=rng.choice([None, rng.randrange(0, 300_000)]),
+            ),
+        )
+        for i in range(n)
+    ]
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from aggregates import AverageMileageByYear, BranchCounts, Count, First, TopMakes, TopModels, aggregate
+from models import Auction, Vehicle, VehicleType
+from service import AuctionService
+from stats import StatisticsAccumulator
+
+
+@pytest.fixture
+def sample_auctions() -> list[Auction]:
+    def auction(stock, branch, year, make, model, mileage):
+        return Auction(
+            stock_number=stock,
+            branch=branch,
+            auction_date_utc=datetime(2024, 3, 15, 10, 0, tzinfo=timezone.utc),
+            vehicle=Vehicle(year=year, make=make, model=model,
+                            vehicle_type=VehicleType.AUTOMOBILE, mileage=mileage),
+        )
+
+    return [
+        auction("1", "Chicago", 2015, "Ford", "Focus", 120_000),
+        auction("2", "Dallas", 2021, "Toyota", "Corolla", 40_000),
+        auction("3", "Chicago", 2018, "Ford", "F-150", 80_000),
+        auction("4", "New York", 2020, "Honda", "Civic", None),
+        auction("5", "Chicago", 2015, "Ford", "Focus", 100_000),
+    ]
+
+
+def test_aggregate_matches_service(sample_auctions):
+    top_makes, top_models, mileage, branches, stats = aggregate(
+        iter(sample_auctions),
+        TopMakes(2),
+        TopModels(3),
+        AverageMileageByYear(),
+        BranchCounts(),
+        StatisticsAccumulator(),
+    )
+    assert top_makes == AuctionService.get_top_makes(sample_auctions, 2)
+    assert top_models == AuctionService.get_top_models(sample_auctions, 3)
+    assert mileage == AuctionService.get_average_mileage_by_year(sample_auctions)
+    assert branches == {k: len(v) for k, v in AuctionService.group_by_branch(sample_auctions).items()}
+    assert stats == AuctionService.get_statistics(sample_auctions)
+
+
+def test_count_and_first(sample_auctions):
+    recent, first = aggregate(sample_auctions, Count(lambda a: a.vehicle.year >= 2018), First())
+    assert recent == len(AuctionService.filter_by_year(sample_auctions, 2018))
+    assert first is sample_auctions[0]
+
+
+def test_aggregate_consumes_generator_once(sample_auctions):
+    consumed = []
+
+    def stream():
+        for a in sample_auctions:
+            consumed.append(a)
+            yield a
+
+    (count,) = aggregate(stream(), Count())
+    assert count == len(consumed) == 5
+
+
+def test_aggregate_empty_stream():
+    assert aggregate([], TopMakes(), First(), Count()) == [[], None, 0]
+
+
+def test_remove_reverts_add(sample_auctions):
+    aggregators = [TopMakes(10), TopModels(10), AverageMileageByYear(), BranchCounts(), Count()]
+    aggregate(sample_auctions[:3], *aggregators)
+    expected = [a.result() for a in aggregators]
+    for auction in sample_auctions[3:]:
+        for aggregator in aggregators:
+            aggregator.add(auction)
+    for auction in sample_auctions[3:]:
+        for aggregator in aggregators:
+            aggregator.remove(auction)
+    assert [a.result() for a in aggregators] == expected
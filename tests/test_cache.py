@@ -0,0 +1,96 @@
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+import cache as cache_module
+from cache import ParseCache, read_frame, write_frame
+from frame import AuctionFrame
+from loader import AuctionLoader, ExecutorStrategy
+from conftest import write_csv
+from parser import CsvAuctionParser
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    return write_csv(tmp_path / "Sales_List_03042024 (1).csv", range(1, 4))
+
+
+def test_write_read_frame_roundtrip(csv_path):
+    frame = AuctionFrame.from_auctions(CsvAuctionParser().parse_file(csv_path))
+    buf = io.BytesIO()
+    write_frame(frame, buf)
+    restored = read_frame(memoryview(buf.getvalue()))
+    assert restored.to_auctions() == frame.to_auctions()
+
+
+def test_cache_hit_after_put(tmp_path, csv_path):
+    cache = ParseCache(tmp_path / "cache")
+    assert cache.get(csv_path) is None
+    frame = AuctionFrame.from_auctions(CsvAuctionParser().parse_file(csv_path))
+    cache.put(csv_path, frame)
+    assert cache.get(csv_path).to_auctions() == frame.to_auctions()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_invalidated_when_file_changes(tmp_path, csv_path):
+    cache = ParseCache(tmp_path / "cache")
+    cache.put(csv_path, AuctionFrame.from_auctions(CsvAuctionParser().parse_file(csv_path)))
+    write_csv(csv_path, range(1, 5))
+    os.utime(csv_path, ns=(1, 1))
+    assert cache.get(csv_path) is None
+
+
+def test_cache_invalidated_when_code_changes(tmp_path, csv_path, monkeypatch):
+    cache = ParseCache(tmp_path / "cache")
+    cache.put(csv_path, AuctionFrame.from_auctions(CsvAuctionParser().parse_file(csv_path)))
+    monkeypatch.setattr(cache_module, "CODE_VERSION", "changed")
+    assert cache.get(csv_path) is None
+
+
+def test_code_version_covers_symbol_tables(tmp_path, monkeypatch):
+    changed = tmp_path / "symbols.py"
+    changed.write_bytes(Path(cache_module._symbols.__file__).read_bytes() + b"\n# zmiana\n")
+    monkeypatch.setattr(cache_module._symbols, "__file__", str(changed))
+    assert cache_module._code_version() != cache_module.CODE_VERSION
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    paths = [write_csv(tmp_path / f"Sales_List_03042024 ({i}).csv", range(10 * i + 10, 10 * i + 15)) for i in range(3)]
+    cache = ParseCache(tmp_path / "cache")
+    parser = CsvAuctionParser()
+    cache.put(paths[0], AuctionFrame.from_auctions(parser.parse_file(paths[0])))
+    entry_size = cache.size_bytes()
+    os.utime(cache._entries()[0], ns=(1, 1))  # najstarszy wpis
+    cache.max_bytes = 2 * entry_size
+    for path in paths[1:]:
+        cache.put(path, AuctionFrame.from_auctions(parser.parse_file(path)))
+    assert cache.size_bytes() <= 2 * entry_size
+    assert cache.get(paths[0]) is None
+    assert cache.get(paths[2]) is not None
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_loader_uses_cache(tmp_path, csv_path, strategy):
+    cache = ParseCache(tmp_path / "cache")
+    cold = AuctionLoader(CsvAuctionParser(), strategy, cache=cache).load([csv_path])
+    warm_loader = AuctionLoader(CsvAuctionParser(), strategy, cache=ParseCache(tmp_path / "cache"))
+    assert warm_loader.load([csv_path]) == cold
+    assert warm_loader.load_frame([csv_path]).to_auctions() == cold
+    if strategy is not ExecutorStrategy.PROCESS:
+        assert warm_loader.cache.hits == 2
+
+
+def test_write_read_frame_keeps_detail_columns(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vin#,ACV,Current Bid,Primary Damage,Start Code\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,FORD,FOCUS,1FADP3F20FL1,"$8,411 USD",,Hail,Starts\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2015,FORD,FOCUS,,,"$25 USD",,\n',
+        encoding="utf-8",
+    )
+    auctions = CsvAuctionParser().parse_file(path)
+    buf = io.BytesIO()
+    write_frame(AuctionFrame.from_auctions(auctions), buf)
+    assert read_frame(memoryview(buf.getvalue())).to_auctions() == auctions
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from dedup import ConflictPolicy, Deduplicator, deduplicate
+from loader import AuctionLoader, ExecutorStrategy
+from models import Auction, Vehicle, VehicleType
+from parser import CsvAuctionParser
+
+
+def _auction(stock: str, make: str, day: int = 1) -> Auction:
+    return Auction(
+        stock_number=stock,
+        branch="Chicago",
+        auction_date_utc=datetime(2025, 12, day, 14, 30, tzinfo=timezone.utc),
+        vehicle=Vehicle(year=2015, make=make, model="FOCUS", vehicle_type=VehicleType.AUTOMOBILE, mileage=1000),
+    )
+
+
+OLD = Path("Sales_List_12012025 (3).csv")
+NEW = Path("Sales_List_12012025 (11).csv")
+
+
+def test_latest_file_wins_regardless_of_load_order():
+    dedup = deduplicate([
+        (NEW, [_auction("1", "KIA"), _auction("2", "FORD")]),
+        (OLD, [_auction("1", "FORD"), _auction("3", "HONDA")]),
+    ])
+    unique = {a.stock_number: a.vehicle.make for a in dedup}
+    assert unique == {"1": "KIA", "2": "FORD", "3": "HONDA"}
+    assert (dedup.total, dedup.duplicates) == (4, 1)
+
+
+def test_latest_auction_date_wins():
+    dedup = deduplicate(
+        [(OLD, [_auction("1", "FORD", day=20)]), (NEW, [_auction("1", "KIA", day=5)])],
+        ConflictPolicy.LATEST_AUCTION_DATE,
+    )
+    assert [a.vehicle.make for a in dedup] == ["FORD"]
+    assert dedup.duplicates == 1
+
+
+def test_spilled_runs_match_in_memory_result(tmp_path):
+    files = [
+        (Path(f"Sales_List_12{day:02d}2025 (1).csv"), [
+            _auction(str(stock), f"MAKE{day}", day) for stock in range(day, day + 50)
+        ])
+        for day in range(1, 20)
+    ]
+    in_memory = deduplicate(files)
+    spilled = deduplicate(files, max_keys=7, spill_dir=tmp_path)
+    assert spilled._runs
+    expected = list(in_memory)
+    assert expected == sorted(expected, key=lambda a: a.stock_number)
+    assert list(spilled) == expected
+    assert spilled.duplicates == in_memory.duplicates == 19 * 50 - 68
+    assert list(in_memory) == expected
+    with pytest.raises(RuntimeError):
+        list(spilled)
+
+
+def test_max_keys_must_be_positive():
+    with pytest.raises(ValueError):
+        Deduplicator(max_keys=0)
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_iter_files_pairs_paths_with_auctions(tmp_path, strategy):
+    header = "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type,Odometer\n"
+    row = '"Mon Mar 04, 8:30am CST",Chicago,{stock},2015,{make},FOCUS,Automobiles,"120,000 mi"\n'
+    old = tmp_path / "Sales_List_03042024 (1).csv"
+    new = tmp_path / "Sales_List_03042024 (2).csv"
+    old.write_text(header + row.format(stock=1, make="FORD") + row.format(stock=2, make="FORD"))
+    new.write_text(header + row.format(stock=1, make="KIA"))
+
+    loader = AuctionLoader(CsvAuctionParser(), strategy=strategy, max_workers=2)
+    files = list(loader.iter_files([new, old]))
+    assert [(path, len(auctions)) for path, auctions in files] == [(new, 1), (old, 2)]
+    dedup = deduplicate(files)
+    assert sorted((a.stock_number, a.vehicle.make) for a in dedup) == [("1", "KIA"), ("2", "FORD")]
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from frame import AuctionFrame
+from models import Auction, StartCode, Vehicle, VehicleType
+from service import AuctionService
+
+
+@pytest.fixture
+def sample_auctions() -> list[Auction]:
+    return [
+        Auction(
+            stock_number="1",
+            branch="Chicago",
+            auction_date_utc=datetime(2024, 3, 15, 10, 0, tzinfo=timezone.utc),
+            vehicle=Vehicle(year=2015, make="Ford", model="Focus",
+                            vehicle_type=VehicleType.AUTOMOBILE, mileage=120_000,
+                            vin="1FADP3F20FL123456", odometer_status="Not Actual",
+                            primary_damage="Front End", title="Salvage",
+                            start_code=StartCode.RUN_AND_DRIVE),
+            acv_cents=841_100,
+            current_bid_cents=2_500,
+        ),
+        Auction(
+            stock_number="2",
+            branch="Dallas",
+            auction_date_utc=datetime(2024, 6, 20, 14, 0, tzinfo=timezone.utc),
+            vehicle=Vehicle(year=2021, make="Toyota", model="Corolla",
+                            vehicle_type=VehicleType.AUTOMOBILE, mileage=40_000),
+        ),
+        Auction(
+            stock_number="3",
+            branch="Chicago",
+            auction_date_utc=datetime(2024, 9, 10, 9, 0, tzinfo=timezone.utc),
+            vehicle=Vehicle(year=2018, make="Ford", model="F-150",
+                            vehicle_type=VehicleType.TRUCK, mileage=80_000,
+                            primary_damage="Front End", start_code=StartCode.STATIONARY),
+            acv_cents=1_200_000,
+        ),
+        Auction(
+            stock_number="4",
+            branch="New York",
+            auction_date_utc=datetime(2024, 12, 1, 11, 0, tzinfo=timezone.utc),
+            vehicle=Vehicle(year=2020, make="Honda", model="Civic",
+                            vehicle_type=VehicleType.AUTOMOBILE, mileage=None),
+        ),
+    ]
+
+
+@pytest.fixture
+def frame(sample_auctions) -> AuctionFrame:
+    return AuctionFrame.from_auctions(sample_auctions)
+
+
+def test_frame_roundtrip(frame, sample_auctions):
+    assert len(frame) == 4
+    assert frame.to_auctions() == sample_auctions
+    assert frame[3].vehicle.mileage is None
+
+
+def test_frame_dictionary_encoding(frame):
+    assert len(frame.makes) == 3
+    assert len(frame.branches) == 3
+    assert list(frame.make_codes) == [0, 1, 0, 2]
+
+
+def test_frame_filters_match_service(frame, sample_auctions):
+    start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 12, 31, tzinfo=timezone.utc)
+    assert frame.filter_by_year(2018, 2020).to_auctions() == AuctionService.filter_by_year(sample_auctions, 2018, 2020)
+    assert frame.filter_by_make(["ford"]).to_auctions() == AuctionService.filter_by_make(sample_auctions, ["ford"])
+    assert frame.filter_by_vehicle_type(VehicleType.TRUCK).to_auctions() == AuctionService.filter_by_vehicle_type(
+        sample_auctions, VehicleType.TRUCK
+    )
+    assert frame.filter_by_date_range(start, end).to_auctions() == AuctionService.filter_by_date_range(
+        sample_auctions, start, end
+    )
+
+
+def test_frame_date_range_rejects_naive_datetimes(frame, sample_auctions):
+    start, end = datetime(2024, 6, 1), datetime(2024, 12, 31)
+    with pytest.raises(TypeError):
+        AuctionService.filter_by_date_range(sample_auctions, start, end)
+    with pytest.raises(TypeError):
+        frame.filter_by_date_range(start, end)
+
+
+def test_frame_groups_match_service(frame, sample_auctions):
+    groups = frame.group_by_make()
+    expected = AuctionService.group_by_make(sample_auctions)
+    assert list(groups) == list(expected)
+    assert {k: v.to_auctions() for k, v in groups.items()} == expected
+    assert {k: len(v) for k, v in frame.group_by_branch().items()} == {"Chicago": 2, "Dallas": 1, "New York": 1}
+    assert {k: len(v) for k, v in frame.group_by_vehicle_type().items()} == {
+        VehicleType.AUTOMOBILE: 3,
+        VehicleType.TRUCK: 1,
+    }
+
+
+def test_frame_aggregates_match_service(frame, sample_auctions):
+    assert frame.get_top_makes(2) == AuctionService.get_top_makes(sample_auctions, 2)
+    assert frame.get_top_models(5) == AuctionService.get_top_models(sample_auctions, 5)
+    assert frame.get_average_mileage_by_year() == AuctionService.get_average_mileage_by_year(sample_auctions)
+    assert frame.get_statistics() == AuctionService.get_statistics(sample_auctions)
+
+
+def test_empty_frame_statistics():
+    stats = AuctionFrame().get_statistics()
+    assert stats["total_auctions"] == 0
+    assert stats["year_range"] == (None, None)
+    assert stats["avg_mileage"] is None
+
+
+def test_frame_keeps_detail_columns(frame, sample_auctions):
+    assert frame.take([2, 0]).to_auctions() == [sample_auctions[2], sample_auctions[0]]
+    assert len(frame.damages) == 2  # "Front End" i brak wartości
+    copy = AuctionFrame()
+    copy.append_frame(frame)
+    assert copy.to_auctions() == sample_auctions
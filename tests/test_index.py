@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import BASE_DATE, random_auctions
+from index import AuctionIndex
+from models import Auction, VehicleType
+from service import AuctionService
+
+
+@pytest.fixture
+def auctions() -> list[Auction]:
+    return random_auctions(random.Random(42), 500)
+
+
+def test_index_filters_match_service(auctions):
+    index = AuctionIndex(auctions)
+    start, end = BASE_DATE + timedelta(days=30), BASE_DATE + timedelta(days=90)
+    assert index.filter_by_year(2010, 2015) == AuctionService.filter_by_year(auctions, 2010, 2015)
+    assert index.filter_by_year(2020) == AuctionService.filter_by_year(auctions, 2020)
+    assert index.filter_by_make(["ford"]) == AuctionService.filter_by_make(auctions, ["ford"])
+    assert index.filter_by_vehicle_type(VehicleType.TRUCK) == AuctionService.filter_by_vehicle_type(
+        auctions, VehicleType.TRUCK
+    )
+    assert index.filter_by_date_range(start, end) == AuctionService.filter_by_date_range(auctions, start, end)
+
+
+def test_index_date_range_rejects_naive_datetimes(auctions):
+    index = AuctionIndex(auctions)
+    with pytest.raises(TypeError):
+        index.filter_by_date_range(datetime(2024, 1, 1), datetime(2024, 6, 1))
+    with pytest.raises(TypeError):
+        index.filter(makes=["ford"], start_date=datetime(2024, 1, 1))
+
+
+def test_index_combined_filter(auctions):
+    index = AuctionIndex(auctions)
+    start, end = BASE_DATE, BASE_DATE + timedelta(days=180)
+    expected = AuctionService.filter_by_make(
+        AuctionService.filter_by_date_range(AuctionService.filter_by_year(auctions, 2005, 2020), start, end),
+        ["Toyota"],
+    )
+    expected = [a for a in expected if a.branch == "Dallas"]
+    result = index.filter(
+        makes=["toyota"], branches=["dallas"], min_year=2005, max_year=2020, start_date=start, end_date=end,
+    )
+    assert result == expected
+
+
+def test_index_incremental_extend_matches_full_build(auctions):
+    incremental = AuctionIndex(auctions[:200])
+    incremental.extend(auctions[200:350])
+    incremental.extend(auctions[350:])
+    full = AuctionIndex(auctions)
+    assert len(incremental) == len(full)
+    assert incremental.filter(makes=["honda"], min_year=2010) == full.filter(makes=["honda"], min_year=2010)
+    assert incremental.filter_by_year(2000, 2003) == full.filter_by_year(2000, 2003)
+
+
+def test_index_unknown_key_and_no_filters(auctions):
+    index = AuctionIndex(auctions)
+    assert index.filter_by_make(["Bugatti"]) == []
+    assert index.filter() == auctions
+
+
+def test_extend_does_not_touch_existing_entries(auctions):
+    index = AuctionIndex(auctions[:300])
+    runs = [(keys, positions, list(keys), list(positions)) for keys, positions in index._dates.runs]
+    index.extend(auctions[300:])
+    assert len(index._dates.runs) == len(runs) + 1
+    for (keys, positions, keys_before, positions_before), run in zip(runs, index._dates.runs):
+        assert run[0] is keys and run[1] is positions
+        assert keys == keys_before and positions == positions_before
+
+
+def test_runs_are_merged_lazily_on_lookup(auctions):
+    index = AuctionIndex()
+    for i in range(0, len(auctions), 10):
+        index.extend(auctions[i:i + 10])
+    assert len(index._years.runs) == len(auctions) // 10
+    assert index.filter_by_year(2000, 2010) == AuctionService.filter_by_year(auctions, 2000, 2010)
+    assert len(index._years.runs) == 1
@@ -0,0 +1,156 @@
+import os
+from functools import partial
+from pathlib import Path
+
+from aggregates import AverageMileageByYear, BranchCounts, TopMakes
+from cache import ParseCache
+from conftest import write_csv
+from ingest import AuctionIngestor, file_order
+from parser import CsvAuctionParser
+from service import AuctionService
+
+
+_write_csv = partial(write_csv, fields=("stock", "make", "branch", "mileage"))
+
+
+def _ingestor(tmp_path: Path, **kwargs) -> AuctionIngestor:
+    return AuctionIngestor(
+        CsvAuctionParser(),
+        tmp_path / "data",
+        manifest_path=tmp_path / "manifest.json",
+        aggregators=[TopMakes(10), AverageMileageByYear(), BranchCounts()],
+        **kwargs,
+    )
+
+
+def _expected(ingestor: AuctionIngestor) -> list:
+    auctions = list(ingestor.auctions.values())
+    return [
+        AuctionService.get_top_makes(auctions, 10),
+        AuctionService.get_average_mileage_by_year(auctions),
+        {b: len(a) for b, a in AuctionService.group_by_branch(auctions).items()},
+    ]
+
+
+def test_file_order_uses_export_date_and_copy_number():
+    names = ["Sales_List_12012025 (11).csv", "Sales_List_11302025 (20).csv", "Sales_List_12012025 (3).csv"]
+    assert sorted(names, key=lambda n: file_order(Path(n))) == [
+        "Sales_List_11302025 (20).csv", "Sales_List_12012025 (3).csv", "Sales_List_12012025 (11).csv",
+    ]
+
+
+def test_scan_parses_only_new_files(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_csv(data / "Sales_List_03042024 (1).csv", [("1", "FORD", "Chicago", 100), ("2", "KIA", "Dallas", 200)])
+    ingestor = _ingestor(tmp_path)
+
+    report = ingestor.scan()
+    assert report.added == ["Sales_List_03042024 (1).csv"]
+    assert report.inserted == 2
+
+    _write_csv(data / "Sales_List_03052024 (1).csv", [("3", "FORD", "Dallas", 300)])
+    report = ingestor.scan()
+    assert report.added == ["Sales_List_03052024 (1).csv"]
+    assert (report.unchanged, report.inserted) == (1, 1)
+    assert ingestor.results() == _expected(ingestor)
+
+    manifest = tmp_path / "manifest.json"
+    saved = manifest.stat().st_mtime_ns
+    os.utime(manifest, ns=(1, 1))
+    report = ingestor.scan()
+    assert (report.added, report.unchanged, report.inserted) == ([], 2, 0)
+    assert manifest.stat().st_mtime_ns == 1 != saved  # skan bez zmian nie zapisuje manifestu
+
+
+def test_later_file_replaces_stock_number(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_csv(data / "Sales_List_12012025 (11).csv", [("1", "KIA", "Dallas", 500)])
+    _write_csv(data / "Sales_List_12012025 (3).csv", [("1", "FORD", "Chicago", 100), ("2", "KIA", "Dallas", 200)])
+    ingestor = _ingestor(tmp_path)
+
+    report = ingestor.scan()
+    assert ingestor.auctions["1"].vehicle.make == "KIA"
+    assert (report.inserted, report.replaced) == (2, 1)
+    assert ingestor.results() == _expected(ingestor)
+
+    # usunięcie nowszego pliku przywraca wersję ze starszego eksportu
+    (data / "Sales_List_12012025 (11).csv").unlink()
+    report = ingestor.scan()
+    assert report.removed == ["Sales_List_12012025 (11).csv"]
+    assert ingestor.auctions["1"].vehicle.make == "FORD"
+    assert ingestor.results() == _expected(ingestor)
+
+
+def test_older_file_arriving_later_does_not_win(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_csv(data / "Sales_List_12012025 (11).csv", [("1", "KIA", "Dallas", 500)])
+    ingestor = _ingestor(tmp_path)
+    ingestor.scan()
+    _write_csv(data / "Sales_List_12012025 (3).csv", [("1", "FORD", "Chicago", 100)])
+    report = ingestor.scan()
+    assert (report.inserted, report.replaced) == (0, 0)
+    assert ingestor.auctions["1"].vehicle.make == "KIA"
+
+
+def test_changed_file_is_reapplied(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    path = _write_csv(data / "Sales_List_03042024 (1).csv", [("1", "FORD", "Chicago", 100), ("2", "KIA", "Dallas", 200)])
+    ingestor = _ingestor(tmp_path)
+    ingestor.scan()
+
+    _write_csv(path, [("2", "HONDA", "Dallas", 250)])
+    os.utime(path, ns=(1, 1))
+    report = ingestor.scan()
+    assert report.changed == [path.name]
+    assert sorted(ingestor.auctions) == ["2"]
+    assert ingestor.auctions["2"].vehicle.make == "HONDA"
+    assert ingestor.results() == _expected(ingestor)
+
+
+def test_take_delta_reports_changes_since_last_call(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_csv(data / "Sales_List_12012025 (3).csv", [("1", "FORD", "Chicago", 100), ("2", "KIA", "Dallas", 200)])
+    ingestor = _ingestor(tmp_path)
+    ingestor.scan()
+    delta = ingestor.take_delta()
+    assert (delta.removed, [a.stock_number for a in delta.added]) == (set(), ["1", "2"])
+
+    _write_csv(data / "Sales_List_12012025 (11).csv", [("2", "HONDA", "Dallas", 250), ("3", "KIA", "Dallas", 300)])
+    ingestor.scan()
+    delta = ingestor.take_delta()
+    assert delta.removed == {"2"}
+    assert [(a.stock_number, a.vehicle.make) for a in delta.added] == [("2", "HONDA"), ("3", "KIA")]
+
+    ingestor.scan()
+    assert ingestor.take_delta() == (set(), [])
+
+
+def test_touched_file_is_not_reparsed(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    path = _write_csv(data / "Sales_List_03042024 (1).csv", [("1", "FORD", "Chicago", 100)])
+    ingestor = _ingestor(tmp_path)
+    ingestor.scan()
+    os.utime(path, ns=(1, 1))
+    report = ingestor.scan()
+    assert (report.changed, report.unchanged, report.inserted) == ([], 1, 0)
+
+
+def test_restart_restores_from_manifest_and_cache(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_csv(data / "Sales_List_03042024 (1).csv", [("1", "FORD", "Chicago", 100)])
+    cache = ParseCache(tmp_path / "cache")
+    first = _ingestor(tmp_path, cache=cache)
+    first.scan()
+
+    second = _ingestor(tmp_path, cache=cache)
+    report = second.scan()
+    assert (report.added, report.restored) == ([], ["Sales_List_03042024 (1).csv"])
+    assert second.auctions == first.auctions
+    assert cache.hits == 1
@@ -0,0 +1,100 @@
+import pickle
+import pstats
+from pathlib import Path
+
+import pytest
+
+import instrumentation
+from cache import ParseCache
+from conftest import write_csv
+from instrumentation import Instrumentation, LatencyHistogram
+from loader import AuctionLoader, ExecutorStrategy
+from parser import CsvAuctionParser, RowValidationError
+from service import AuctionService
+
+
+def _write(path: Path, rows: int, bad_year: bool = False) -> Path:
+    return write_csv(path, range(rows), year=2045 if bad_year else 2015, make="Honda", model="Civic")
+
+
+@pytest.fixture(autouse=True)
+def _disabled():
+    yield
+    instrumentation.disable()
+
+
+def test_disabled_records_nothing(tmp_path):
+    assert not instrumentation.enabled()
+    assert instrumentation.timer("x") is instrumentation.timer("y")
+    instrumentation.count("x")
+    CsvAuctionParser().parse_file(_write(tmp_path / "a.csv", 3))
+    assert instrumentation.active() is None
+
+
+def test_parser_stages_and_counters(tmp_path):
+    path = _write(tmp_path / "Sales_List_03042024 (1).csv", 2500)
+    with instrumentation.instrumented() as metrics:
+        CsvAuctionParser().parse_file(path)
+    summary = metrics.summary()
+    assert summary["counters"]["parser.rows"] == 2500
+    assert summary["counters"]["parser.files"] == 1
+    assert summary["counters"]["parser.bytes_read"] == path.stat().st_size
+    batches = -(-2500 // CsvAuctionParser.BATCH_SIZE)
+    for stage in ("parser.read", "parser.columns", "parser.validate", "parser.dates", "parser.construct"):
+        assert summary["timers"][stage]["calls"] == batches
+    assert not instrumentation.enabled()
+
+
+def test_rejected_rows_are_counted(tmp_path):
+    with instrumentation.instrumented() as metrics, pytest.raises(RowValidationError):
+        CsvAuctionParser().parse_file(_write(tmp_path / "a.csv", 3, bad_year=True))
+    assert metrics.counters["parser.rows_rejected"] == 3
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_loader_file_latency_and_cache_hits(tmp_path, strategy):
+    paths = [_write(tmp_path / f"{i}.csv", 10) for i in range(3)]
+    loader = AuctionLoader(CsvAuctionParser(), strategy, max_workers=2, cache=ParseCache(tmp_path / "cache"))
+    loader.load(paths)
+    with instrumentation.instrumented() as metrics:
+        auctions = loader.load(paths)
+        AuctionService.get_statistics(auctions)
+    assert len(auctions) == 30
+    assert metrics.counters["cache.hits"] == 3
+    assert metrics.histograms["loader.file"].count == 3
+    assert metrics.calls["AuctionLoader.load"] == 1
+    assert metrics.calls["AuctionService.get_statistics"] == 1
+
+
+def test_histogram_quantiles_and_merge():
+    histogram = LatencyHistogram()
+    for seconds in (0.0005, 0.0015, 0.003, 0.003, 150.0):
+        histogram.add(seconds)
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(0.2) == 0.001
+    assert histogram.quantile(1.0) == 150.0
+    other = LatencyHistogram()
+    other.add(0.0005)
+    histogram.merge(other)
+    assert histogram.count == 6
+    assert histogram.summary()["buckets"] == {"<=0.001s": 2, "<=0.002s": 1, "<=0.005s": 2, ">100s": 1}
+
+
+def test_metrics_pickle_and_merge():
+    metrics = Instrumentation()
+    metrics.count("rows", 5)
+    metrics.add_time("stage", 0.5)
+    metrics.observe("file", 0.01)
+    copy = pickle.loads(pickle.dumps(metrics))
+    metrics.merge(copy)
+    assert metrics.counters["rows"] == 10
+    assert metrics.timers["stage"] == 1.0
+    assert metrics.calls["stage"] == 2
+    assert metrics.histograms["file"].count == 2
+
+
+def test_profile_mode_writes_stats(tmp_path):
+    with instrumentation.instrumented(tmp_path / "out.prof"):
+        CsvAuctionParser().parse_file(_write(tmp_path / "a.csv", 5))
+    stats = pstats.Stats(str(tmp_path / "out.prof"))
+    assert any(name == "_parse_dates" for _, _, name in stats.stats)
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+
+from cache import ParseCache
+from conftest import write_csv
+from loader import AuctionLoader, ExecutorStrategy, from_row, to_row
+from parser import CsvAuctionParser
+from service import AuctionService
+
+
+@pytest.fixture
+def csv_paths(tmp_path: Path) -> list[Path]:
+    columns = [
+        {},
+        dict(year=2018, model="F-150", vehicle_type="Truck", mileage=None),
+        dict(date="Wed Sep 03, 3:30pm CEDT / CEST", branch="Dallas", year=2021, make="TOYOTA", model="COROLLA",
+             mileage=40_000),
+    ]
+    return [write_csv(tmp_path / f"Sales_List_{i}.csv", [i + 1], **row) for i, row in enumerate(columns)]
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_load_strategies_return_same_auctions(csv_paths, strategy):
+    expected = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL).load(csv_paths)
+    result = AuctionLoader(CsvAuctionParser(), strategy, chunk_size=2).load(csv_paths)
+    assert result == expected
+    assert [a.stock_number for a in result] == ["1", "2", "3"]
+
+
+def test_load_strategy_from_string():
+    loader = AuctionLoader(CsvAuctionParser(), "process")
+    assert loader.strategy is ExecutorStrategy.PROCESS
+
+
+def test_load_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        AuctionLoader(CsvAuctionParser(), chunk_size=0)
+
+
+def test_row_roundtrip(csv_paths):
+    auction = CsvAuctionParser().parse_file(csv_paths[0])[0]
+    assert from_row(to_row(auction)) == auction
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_load_frame(csv_paths, strategy):
+    expected = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL).load(csv_paths)
+    frame = AuctionLoader(CsvAuctionParser(), strategy).load_frame(csv_paths)
+    assert frame.to_auctions() == expected
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_load_with_statistics(csv_paths, strategy):
+    loader = AuctionLoader(CsvAuctionParser(), strategy, chunk_size=2)
+    auctions, stats = loader.load_with_statistics(csv_paths)
+    assert stats.result() == AuctionService.get_statistics(auctions)
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_iter_auctions_streams_in_order(csv_paths, strategy):
+    expected = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL).load(csv_paths)
+    loader = AuctionLoader(CsvAuctionParser(), strategy, chunk_size=1)
+    stream = loader.iter_auctions(iter(csv_paths), max_pending=1)
+    assert next(stream) == expected[0]
+    assert [expected[0], *stream] == expected
+
+
+def test_iter_auctions_early_close(csv_paths):
+    stream = AuctionLoader(CsvAuctionParser()).iter_auctions(csv_paths, max_pending=1)
+    next(stream)
+    stream.close()
+
+
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_load_with_quarantine_keeps_good_rows_and_files(csv_paths, tmp_path, strategy):
+    bad_row = write_csv(tmp_path / "Sales_List_bad_row.csv", [(4, 2045), (5, 2016)], ("stock", "year"), mileage=None)
+    corrupt = tmp_path / "Sales_List_corrupt.csv"
+    corrupt.write_text("Stock Number,Make\n6,FORD\n", encoding="utf-8")
+    loader = AuctionLoader(CsvAuctionParser(), strategy, chunk_size=2, cache=ParseCache(tmp_path / "cache"))
+
+    auctions, quarantine = loader.load_with_quarantine([*csv_paths, bad_row, corrupt])
+    assert [a.stock_number for a in auctions] == ["1", "2", "3", "5"]
+    assert [(r.path.name, r.line, r.field) for r in quarantine] == [
+        ("Sales_List_bad_row.csv", 2, "year"),
+        ("Sales_List_corrupt.csv", 0, "file"),
+    ]
+    # plik z odrzuconymi wierszami nie jest zapamiętany - raport powstaje ponownie
+    assert len(loader.load_with_quarantine([bad_row])[1]) == 1
+
+
+@pytest.mark.parametrize("method", ["load", "load_frame"])
+def test_process_load_splits_large_files(csv_paths, tmp_path, method):
+    big = write_csv(tmp_path / "Sales_List_big.csv", [(i, i) for i in range(100, 400)], ("stock", "mileage"))
+    paths = [csv_paths[0], big, *csv_paths[1:], big]
+    expected = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.SERIAL).load(paths)
+    cache = ParseCache(tmp_path / "cache")
+    loader = AuctionLoader(CsvAuctionParser(), ExecutorStrategy.PROCESS, max_workers=2, cache=cache, split_bytes=2000)
+    tasks, plan = loader._process_tasks(paths)
+    assert sum(parts for _, parts in plan) == len(tasks) > len(paths)
+
+    result = getattr(loader, method)(paths)
+    assert (result.to_auctions() if method == "load_frame" else result) == expected
+    # sklejony plik trafił do cache - kolejne ładowanie go nie dzieli
+    assert cache.contains(big)
+    assert loader._process_tasks(paths)[0] == [paths]
+
+
+@pytest.mark.parametrize("method", ["load", "iter_files", "load_frame"])
+@pytest.mark.parametrize("strategy", list(ExecutorStrategy))
+def test_unmapped_vehicle_types_survive_cache_and_workers(csv_paths, tmp_path, strategy, method):
+    hovercraft = write_csv(
+        tmp_path / "Sales_List_hovercraft.csv", range(100, 400), vehicle_type="Hovercraft", mileage=None,
+    )
+    paths = [*csv_paths, hovercraft]
+    cache = ParseCache(tmp_path / "cache")
+    for _ in range(2):  # drugi przebieg czyta wszystko z cache
+        loader = AuctionLoader(CsvAuctionParser(), strategy, chunk_size=2, cache=cache, split_bytes=2000)
+        list(getattr(loader, method)(paths))
+        assert loader.parser.unmapped_vehicle_types == {"Hovercraft": 300}
+    assert cache.contains(hovercraft)
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 import pytest
 from pydantic import ValidationError
 
-from models import Auction, Vehicle, VehicleType
+from models import Auction, StartCode, Vehicle, VehicleType, validate_columns
 
 
 def test_vehicle_valid():
@@ -96,6 +96,24 @@ def test_vehicle_type_from_string():
     assert VehicleType.from_string("Unknown") == VehicleType.OTHER
 
 
+def test_vehicle_type_copart_aliases():
+    """Słownik Copart: liczba mnoga, wielkość liter, dopiski po przecinku."""
+    assert VehicleType.from_string("SUVs") == VehicleType.SUV
+    assert VehicleType.from_string(" suvs ") == VehicleType.SUV
+    assert VehicleType.from_string("Pick-up Trucks") == VehicleType.TRUCK
+    assert VehicleType.from_string("Heavy Duty Trucks,Fleet Vehicles") == VehicleType.TRUCK
+    assert VehicleType.from_string("Automobiles,Fleet Vehicles") == VehicleType.AUTOMOBILE
+    assert VehicleType.from_string("Motorcycles") == VehicleType.MOTORCYCLE
+    assert VehicleType.from_string("Vans") == VehicleType.VAN
+    assert VehicleType.from_string("Recreational/ Miscellaneous") == VehicleType.OTHER
+
+
+def test_vehicle_type_lookup_reports_unknown():
+    assert VehicleType.lookup("Trailers") == VehicleType.OTHER
+    assert VehicleType.lookup("") == VehicleType.OTHER
+    assert VehicleType.lookup("Electric Vehicle") is None
+
+
 def test_vehicle_default_type():
     """Test domyślnej wartości vehicle_type."""
     vehicle = Vehicle(
@@ -137,4 +155,60 @@ def test_auction_frozen():
         ),
     )
     with pytest.raises(AttributeError):
-        auction.branch = "Dallas"
\ No newline at end of file
+        auction.branch = "Dallas"
+
+
+def test_vehicle_construct_skips_validation_but_equals_validated():
+    validated = Vehicle(year=2020, make="Toyota", model="Camry", vehicle_type=VehicleType.AUTOMOBILE, mileage=10)
+    trusted = Vehicle.construct(2020, "Toyota", "Camry", VehicleType.AUTOMOBILE, 10)
+    assert trusted == validated
+    assert Vehicle.construct(2050, "", "X").year == 2050  # brak walidacji
+    with pytest.raises(AttributeError):
+        trusted.make = "Honda"
+
+
+def test_auction_construct():
+    vehicle = Vehicle.construct(2020, "Toyota", "Camry")
+    date = datetime(2024, 3, 15, 10, 0, tzinfo=timezone.utc)
+    assert Auction.construct("1", "Chicago", date, vehicle) == Auction(
+        stock_number="1", branch="Chicago", auction_date_utc=date, vehicle=vehicle,
+    )
+
+
+def test_validate_columns_reports_each_bad_row():
+    errors = validate_columns(
+        years=[2020, 1800, 2040],
+        makes=["Toyota", "", "Ford"],
+        models=["Camry", "Civic", "Focus"],
+        mileages=[10, None, -5],
+    )
+    assert [(e.row, e.field) for e in errors] == [(1, "make"), (1, "year"), (2, "mileage"), (2, "year")]
+
+
+def test_validate_columns_valid():
+    assert validate_columns([2020], ["Toyota"], ["Camry"], [None]) == []
+
+
+def test_start_code_from_string():
+    assert StartCode.from_string("Run & Drive") is StartCode.RUN_AND_DRIVE
+    assert StartCode.from_string("stationary") is StartCode.STATIONARY
+    assert StartCode.from_string(" ") is None
+    assert StartCode.from_string("Enhanced Vehicles") is StartCode.UNKNOWN
+
+
+def test_auction_negative_amount_rejected():
+    vehicle = Vehicle(year=2020, make="Toyota", model="Camry")
+    with pytest.raises(ValidationError):
+        Auction(
+            stock_number="1",
+            branch="Chicago",
+            auction_date_utc=datetime(2024, 3, 15, tzinfo=timezone.utc),
+            vehicle=vehicle,
+            acv_cents=-100,
+        )
+
+
+def test_validate_columns_checks_amounts():
+    errors = validate_columns([2020, 2020], ["Ford", "Ford"], ["Focus", "Focus"], [None, None],
+                              {"acv_cents": [100, -1], "current_bid_cents": [None, 0]})
+    assert [(e.row, e.field) for e in errors] == [(1, "acv_cents")]
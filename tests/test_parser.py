@@ -1,7 +1,12 @@
+import csv
+import io
+from datetime import date, datetime, timezone
+from pathlib import Path
+
 import pytest
 
-from models import VehicleType
-from parser import CsvAuctionParser
+from models import StartCode, VehicleType
+from parser import PROJECTION, CsvAuctionParser, ProjectedReader, Quarantine, RowValidationError
 
 
 def test_parse_mileage_standard():
@@ -123,4 +128,282 @@ def test_parse_row_two_digit_year():
     }
     
     auction = CsvAuctionParser.parse_row(row)
-    assert auction.vehicle.year == 2015
\ No newline at end of file
+    assert auction.vehicle.year == 2015
+
+
+def test_export_date_from_filename():
+    assert CsvAuctionParser.export_date(Path("Sales_List_03042024 (12).csv")) == date(2024, 3, 4)
+    assert CsvAuctionParser.export_date(Path("auctions.csv")) is None
+
+
+def test_parse_file_uses_year_from_filename(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (12).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type,Odometer\n"
+        '"Mon Mar 04, 8:30am CST",New Castle,1,2004,CHEVROLET,SILVERADO 1500,Automobiles,"162,022 mi"\n',
+        encoding="utf-8",
+    )
+    auction = CsvAuctionParser().parse_file(path)[0]
+    assert auction.auction_date_utc == datetime(2024, 3, 4, 14, 30, tzinfo=timezone.utc)
+
+
+def test_parse_file_infers_year_from_weekday(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type,Odometer\n"
+        '"Mon Mar 04, 8:30am CST",New Castle,1,2004,CHEVROLET,SILVERADO 1500,Automobiles,\n',
+        encoding="utf-8",
+    )
+    auction = CsvAuctionParser().parse_file(path)[0]
+    assert auction.auction_date_utc.weekday() == 0
+    assert auction.auction_date_utc.month == 3
+
+
+def test_parse_row_year_rolls_over_new_year():
+    row = {
+        "Stock Number": "1",
+        "Branch Name": "Chicago",
+        "Auction Date": "Fri Jan 02, 8:30am CST",
+        "Year": "2020",
+        "Make": "Toyota",
+        "Model": "Camry",
+    }
+    auction = CsvAuctionParser.parse_row(row, year=2025)
+    assert auction.auction_date_utc.year == 2026
+
+
+def test_parse_file_fast_path_matches_validated_rows(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type,Odometer\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,15, Honda ,Civic,Automobiles,"80,000 mi"\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2018,Ford,F-150,Truck,\n',
+        encoding="utf-8",
+    )
+    with path.open(encoding="utf-8") as f:
+        expected = [CsvAuctionParser.parse_row(r, 2024) for r in csv.DictReader(f)]
+    assert CsvAuctionParser().parse_file(path) == expected
+
+
+def test_parse_file_reports_invalid_rows_with_line_numbers(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type,Odometer\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,Honda,Civic,Automobiles,\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2045,,F-150,Truck,\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(RowValidationError) as exc_info:
+        CsvAuctionParser().parse_file(path)
+    assert [(e.row, e.field) for e in exc_info.value.errors] == [(3, "make"), (3, "year")]
+
+
+def test_projected_reader_returns_only_projected_columns():
+    data = io.StringIO(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,VIN\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,Honda,"Civic, LX",ABC\n'
+        "\n"
+    )
+    reader = ProjectedReader(data, {"Stock Number": None, "Model": None, "Odometer": ""})
+    assert list(reader) == [("1", "Civic, LX", "")]
+    assert reader.columns == ("Stock Number", "Model", "Odometer")
+
+
+def test_projected_reader_missing_required_column():
+    with pytest.raises(ValueError, match="Make"):
+        ProjectedReader(io.StringIO("Stock Number,Model\n1,Civic\n"), {"Make": None, "Model": None})
+
+
+def test_projected_reader_empty_file():
+    assert list(ProjectedReader(io.StringIO(""), PROJECTION)) == []
+
+
+def test_parser_projection_opt_in():
+    parser = CsvAuctionParser(projection={"Exterior Color": ""})
+    assert list(parser.projection)[-1] == "Exterior Color"
+    assert "Odometer" in parser.projection
+
+
+def test_parse_money_to_cents():
+    assert CsvAuctionParser._parse_money("$8,411 USD") == 841_100
+    assert CsvAuctionParser._parse_money("$25 USD") == 2_500
+    assert CsvAuctionParser._parse_money("$1,234.5 USD") == 123_450
+    assert CsvAuctionParser._parse_money("") is None
+    assert CsvAuctionParser._parse_money("N/A") is None
+
+
+def test_parse_category_is_interned():
+    first = CsvAuctionParser._parse_category("".join(["Front", " End"]))
+    assert first == "Front End"
+    assert first is CsvAuctionParser._parse_category(" Front End ")
+    assert CsvAuctionParser._parse_category(" ") is None
+
+
+def test_parse_file_reads_detail_columns(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Current Bid,Title/Sale Document,"
+        "Primary Damage,Vehicle Type,Odometer,ODO Status,Start Code,Vin#,ACV\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,Honda,Civic,"$2,200 USD",SALVAGE-DE,Front End,'
+        'Automobiles,"80,000 mi",Not Actual,Run & Drive,2HGFB2F50FH123456,"$8,411 USD"\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2018,Ford,F-150,,Clear,Hail,Truck,,, ,,\n',
+        encoding="utf-8",
+    )
+    first, second = CsvAuctionParser().parse_file(path)
+    assert (first.acv_cents, first.current_bid_cents) == (841_100, 220_000)
+    assert first.vehicle.vin == "2HGFB2F50FH123456"
+    assert first.vehicle.title == "SALVAGE-DE"
+    assert first.vehicle.primary_damage == "Front End"
+    assert first.vehicle.odometer_status == "Not Actual"
+    assert first.vehicle.start_code is StartCode.RUN_AND_DRIVE
+    assert (second.acv_cents, second.current_bid_cents, second.vehicle.vin) == (None, None, None)
+    assert (second.vehicle.odometer_status, second.vehicle.start_code) == (None, None)
+    with path.open(encoding="utf-8") as f:
+        assert [first, second] == [CsvAuctionParser.parse_row(r, 2024) for r in csv.DictReader(f)]
+
+
+def test_parse_file_rejects_negative_amounts(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,ACV\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,Honda,Civic,-$5 USD\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(RowValidationError) as exc_info:
+        CsvAuctionParser().parse_file(path)
+    assert [(e.row, e.field) for e in exc_info.value.errors] == [(2, "acv_cents")]
+
+
+def test_parse_file_shares_make_model_branch_strings(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model\n"
+        '"Mon Mar 04, 8:30am CST",Chicago ,1,2015,HONDA,CIVIC\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2016, HONDA,CIVIC\n',
+        encoding="utf-8",
+    )
+    first, second = CsvAuctionParser().parse_file(path)
+    assert first.branch is second.branch == "Chicago"
+    assert first.vehicle.make is second.vehicle.make == "HONDA"
+    assert first.vehicle.model is second.vehicle.model
+
+
+def test_parse_file_counts_unmapped_vehicle_types(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Vehicle Type\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,Honda,Civic,SUVs\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2016,Tesla,Model 3,Electric Vehicle\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,3,2017,Tesla,Model S,Electric Vehicle\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,4,2018,Utility,Reefer,"Trailers,Fleet Vehicles"\n',
+        encoding="utf-8",
+    )
+    parser = CsvAuctionParser()
+    types = [a.vehicle.vehicle_type for a in parser.parse_file(path)]
+    assert types == [VehicleType.SUV, VehicleType.OTHER, VehicleType.OTHER, VehicleType.OTHER]
+    assert parser.unmapped_vehicle_types == {"Electric Vehicle": 2}
+
+
+def _write_with_bad_rows(path: Path) -> Path:
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model,Odometer\n"
+        '"Mon Mar 04, 8:30am CST",Chicago,1,2015,Honda,Civic,\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,2,2045,Ford,F-150,\n'
+        '"Mon Mar 04, 8:30am XYZ",Chicago,3,2016,Kia,Soul,\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,4,abc,Kia,Soul,\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,5,2017,,Soul,\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,6\n'
+        '"Mon Mar 04, 8:30am CST",Chicago,7,2018,Toyota,Camry,\n',
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.filterwarnings("ignore::dateutil.parser.UnknownTimezoneWarning")
+def test_parse_file_quarantines_bad_rows(tmp_path):
+    path = _write_with_bad_rows(tmp_path / "Sales_List_03042024 (1).csv")
+    quarantine = Quarantine()
+    auctions = CsvAuctionParser().parse_file(path, quarantine)
+    assert [a.stock_number for a in auctions] == ["1", "7"]
+    assert [(r.line, r.field) for r in sorted(quarantine, key=lambda r: r.line)] == [
+        (3, "year"), (4, "auction_date"), (5, "year"), (6, "make"), (7, "row"),
+    ]
+    assert all(r.path == path and r.reason for r in quarantine)
+    assert quarantine.by_file() == {path: 5}
+
+
+@pytest.mark.filterwarnings("ignore::dateutil.parser.UnknownTimezoneWarning")
+def test_parse_file_strict_reports_unparsable_values(tmp_path):
+    path = tmp_path / "Sales_List_03042024 (1).csv"
+    path.write_text(
+        "Auction Date,Branch Name,Stock Number,Year,Make,Model\n"
+        '"Mon Mar 04, 8:30am XYZ",Chicago,1,2016,Kia,Soul\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(RowValidationError) as exc_info:
+        CsvAuctionParser().parse_file(path)
+    assert [(e.row, e.field) for e in exc_info.value.errors] == [(2, "auction_date")]
+
+
+@pytest.mark.filterwarnings("ignore::dateutil.parser.UnknownTimezoneWarning")
+def test_quarantine_batches_keep_good_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(CsvAuctionParser, "BATCH_SIZE", 2)
+    path = _write_with_bad_rows(tmp_path / "Sales_List_03042024 (1).csv")
+    quarantine = Quarantine()
+    assert [a.stock_number for a in CsvAuctionParser().parse_file(path, quarantine)] == ["1", "7"]
+    assert len(quarantine) == 5
+
+
+def test_quarantine_write_csv(tmp_path):
+    quarantine = Quarantine()
+    quarantine.add(Path("a.csv"), 3, "year", "Year must be between 1900 and 2030, got 2045")
+    quarantine.write_csv(tmp_path / "rejected.csv")
+    with (tmp_path / "rejected.csv").open(encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [
+            ["path", "line", "field", "reason"],
+            ["a.csv", "3", "year", "Year must be between 1900 and 2030, got 2045"],
+        ]
+
+
+def _write_quoted(path: Path, rows: int) -> Path:
+    lines = ["Auction Date,Branch Name,Stock Number,Year,Make,Model,Engine,Odometer"]
+    for i in range(rows):
+        engine = '"1.2L I-4 DOHC, VVT,\n84HP ""turbo"""' if i % 3 == 0 else "2.0L"
+        lines.append(f'"Mon Mar 04, 8:30am CST",Chicago,{i},2015,Honda,Civic,{engine},"{i * 1000:,} mi"')
+    path.write_bytes(b"\xef\xbb\xbf" + ("\n".join(lines) + "\n").encode())
+    return path
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 40, 100, 1 << 20])
+def test_split_respects_quoted_fields(tmp_path, chunk_bytes):
+    path = _write_quoted(tmp_path / "Sales_List_03042024 (1).csv", 20)
+    parser = CsvAuctionParser()
+    parts = parser.split(path, chunk_bytes)
+    assert parts[0].start > 0 and parts[-1].stop == path.stat().st_size
+    assert all(a.stop == b.start for a, b in zip(parts, parts[1:]))
+    assert [a for part in parts for a in parser.parse_range(part)] == parser.parse_file(path)
+
+
+def test_parse_range_reports_file_line_numbers(tmp_path):
+    path = _write_quoted(tmp_path / "Sales_List_03042024 (1).csv", 6)
+    text = path.read_text(encoding="utf-8-sig").replace(",5,2015,", ",5,2045,")
+    path.write_text(text, encoding="utf-8")
+    parser = CsvAuctionParser()
+    with pytest.raises(RowValidationError) as exc_info:
+        parser.parse_file(path)
+    expected = [(e.row, e.field) for e in exc_info.value.errors]
+    quarantine = Quarantine()
+    for part in parser.split(path, 1):
+        parser.parse_range(part, quarantine)
+    assert [(r.line, r.field) for r in quarantine] == expected == [(9, "year")]
+
+
+def test_split_empty_and_header_only(tmp_path):
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", encoding="utf-8")
+    header = tmp_path / "header.csv"
+    header.write_text("Auction Date,Branch Name,Stock Number,Year,Make,Model\n", encoding="utf-8")
+    parser = CsvAuctionParser()
+    assert parser.split(empty, 10) == [] == parser.split(header, 10)
+    with pytest.raises(ValueError):
+        parser.split(header, 0)
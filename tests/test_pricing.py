@@ -0,0 +1,103 @@
+import random
+import statistics
+from array import array
+from datetime import datetime, timezone
+
+import pytest
+
+from frame import AuctionFrame
+from models import Auction, Vehicle
+from pricing import (
+    PriceSummary,
+    grouped_percentiles,
+    prices_by_branch,
+    prices_by_damage,
+    prices_by_make_model_year,
+)
+
+
+def _expected(groups: dict) -> dict:
+    result = {}
+    for key, values in groups.items():
+        if len(values) < 2:
+            continue
+        deciles = statistics.quantiles(values, n=10, method="inclusive")
+        result[key] = PriceSummary(len(values), deciles[0], deciles[4], deciles[8])
+    return result
+
+
+def _assert_matches(summaries: dict, groups: dict) -> None:
+    expected = _expected(groups)
+    observed = {key: summary for key, summary in summaries.items() if summary.count >= 2}
+    assert observed.keys() == expected.keys()
+    for key, summary in observed.items():
+        assert tuple(summary) == pytest.approx(tuple(expected[key]))
+
+
+@pytest.fixture
+def auctions() -> list[Auction]:
+    rng = random.Random(7)
+    makes = {"FORD": ["FOCUS", "F-150"], "KIA": ["SOUL"], "HONDA": ["CIVIC", "ACCORD"]}
+    result = []
+    for i in range(600):
+        make = rng.choice(list(makes))
+        result.append(Auction(
+            stock_number=str(i),
+            branch=rng.choice(["Chicago", "Dallas", "Hartford"]),
+            auction_date_utc=datetime(2024, 3, 4, tzinfo=timezone.utc),
+            vehicle=Vehicle(
+                year=rng.randint(1995, 2024), make=make, model=rng.choice(makes[make]),
+                primary_damage=rng.choice(["Front End", "Hail", None]),
+            ),
+            acv_cents=None if rng.random() < 0.1 else rng.randrange(0, 4_000_000),
+            current_bid_cents=rng.choice([None, 2_500, 50_000]),
+        ))
+    return result
+
+
+def test_grouped_percentiles_interpolates():
+    summaries = grouped_percentiles([0, 0, 0, 0, 1], array("q", [40, 10, 30, 20, 7]))
+    assert summaries[0] == PriceSummary(4, 13.0, 25.0, 37.0)
+    assert summaries[1] == PriceSummary(1, 7, 7, 7)
+
+
+def test_grouped_percentiles_skips_missing():
+    assert grouped_percentiles([0, 1], array("q", [-1, -1])) == {}
+    assert grouped_percentiles([0, 1], array("q", [-1, 5])) == {1: PriceSummary(1, 5, 5, 5)}
+
+
+def test_prices_by_make_model_year_matches_statistics(auctions):
+    groups: dict = {}
+    for a in auctions:
+        if a.acv_cents is not None:
+            key = (a.vehicle.make, a.vehicle.model, a.vehicle.year // 5 * 5)
+            groups.setdefault(key, []).append(a.acv_cents)
+    summaries = prices_by_make_model_year(AuctionFrame.from_auctions(auctions))
+    assert sum(s.count for s in summaries.values()) == sum(map(len, groups.values()))
+    _assert_matches(summaries, groups)
+
+
+def test_prices_by_branch_and_damage_match_statistics(auctions):
+    frame = AuctionFrame.from_auctions(auctions)
+    branches: dict = {}
+    damages: dict = {}
+    bids: dict = {}
+    for a in auctions:
+        if a.acv_cents is not None:
+            branches.setdefault(a.branch, []).append(a.acv_cents)
+            damages.setdefault(a.vehicle.primary_damage, []).append(a.acv_cents)
+        if a.current_bid_cents is not None:
+            bids.setdefault(a.branch, []).append(a.current_bid_cents)
+    _assert_matches(prices_by_branch(frame), branches)
+    _assert_matches(prices_by_damage(frame), damages)
+    _assert_matches(prices_by_branch(frame, amount="current_bid_cents"), bids)
+
+
+def test_unknown_amount_column(auctions):
+    with pytest.raises(ValueError):
+        prices_by_branch(AuctionFrame.from_auctions(auctions), amount="mileages")
+
+
+def test_empty_frame():
+    assert prices_by_make_model_year(AuctionFrame()) == {}
+    assert prices_by_branch(AuctionFrame()) == {}
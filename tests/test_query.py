@@ -0,0 +1,58 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from conftest import BASE_DATE, MAKES, random_auctions
+from frame import AuctionFrame
+from models import VehicleType
+from query import AuctionQuery
+from service import AuctionService
+
+
+def _random_filters(rng: random.Random) -> list[tuple[str, tuple]]:
+    start = BASE_DATE + timedelta(days=rng.randrange(200))
+    candidates = [
+        ("filter_by_year", (rng.randint(1995, 2025), rng.choice([None, rng.randint(2005, 2025)]))),
+        ("filter_by_make", (rng.sample([m.lower() for m in MAKES] + MAKES, 2),)),
+        ("filter_by_vehicle_type", (rng.choice(list(VehicleType)),)),
+        ("filter_by_date_range", (start, start + timedelta(days=rng.randrange(1, 200)))),
+    ]
+    return rng.sample(candidates, rng.randint(0, len(candidates)))
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_chained_filters_match_service(seed):
+    rng = random.Random(seed)
+    auctions = random_auctions(rng, rng.randint(0, 300))
+    query = AuctionQuery(AuctionFrame.from_auctions(auctions))
+    expected = auctions
+    for name, args in _random_filters(rng):
+        query = getattr(query, name)(*args)
+        expected = getattr(AuctionService, name)(expected, *args)
+
+    assert query.to_auctions() == expected
+    assert query.count() == len(expected)
+    assert query.get_top_makes(3) == AuctionService.get_top_makes(expected, 3)
+    assert query.get_top_models(4) == AuctionService.get_top_models(expected, 4)
+    assert query.get_average_mileage_by_year() == AuctionService.get_average_mileage_by_year(expected)
+    assert query.get_statistics() == AuctionService.get_statistics(expected)
+    # kolejność grup też musi się zgadzać - porównanie dict by jej nie sprawdziło
+    for name in ("group_by_make", "group_by_branch", "group_by_vehicle_type"):
+        groups = [(k, v.to_auctions()) for k, v in getattr(query, name)().items()]
+        assert groups == list(getattr(AuctionService, name)(expected).items())
+
+
+def test_query_without_filters_returns_frame():
+    frame = AuctionFrame.from_auctions(random_auctions(random.Random(0), 10))
+    query = AuctionQuery(frame)
+    assert query.mask() is None
+    assert query.collect() is frame
+
+
+def test_query_is_immutable():
+    frame = AuctionFrame.from_auctions(random_auctions(random.Random(1), 50))
+    base = AuctionQuery(frame).filter_by_year(2010)
+    narrowed = base.filter_by_make(["ford"])
+    assert base.count() >= narrowed.count()
+    assert len(base._predicates) == 1
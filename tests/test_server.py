@@ -0,0 +1,176 @@
+import asyncio
+import json
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from conftest import write_csv
+from ingest import AuctionIngestor
+from parser import CsvAuctionParser
+from server import AuctionServer, QueryError, ResultCache, normalize
+
+
+_write_csv = partial(write_csv, fields=("stock", "year", "make", "model", "mileage"))
+
+
+async def _request(port: int, method: str, target: str) -> tuple[int, object]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+async def _run(tmp_path: Path, scenario) -> None:
+    ingestor = AuctionIngestor(CsvAuctionParser(), tmp_path / "data")
+    server = AuctionServer(ingestor, cache_size=8, max_workers=2)
+    await server.ingest()
+    http = await server.start(port=0)
+    try:
+        await scenario(server, http.sockets[0].getsockname()[1])
+    finally:
+        http.close()
+        await http.wait_closed()
+        server.close()
+
+
+@pytest.fixture
+def data(tmp_path):
+    (tmp_path / "data").mkdir()
+    _write_csv(tmp_path / "data" / "Sales_List_03042024 (1).csv", [
+        ("1", 2015, "FORD", "FOCUS", 100),
+        ("2", 2018, "KIA", "RIO", 200),
+        ("3", 2020, "FORD", "F-150", 300),
+    ])
+    return tmp_path
+
+
+def test_normalize_is_canonical():
+    assert normalize("make=KIA,ford&year_min=2015") == normalize("year_min=2015&make=Ford&make=kia")
+    assert normalize("vehicle_type=suvs") == (("vehicle_type", "SUV"),)
+    assert normalize("date_to=1960-01-01") == (("date_to", 0),)
+    assert normalize("date_from=0001-01-01T00:00:00%2B14:00") == (("date_from", 0),)
+    assert normalize("date_to=9999-12-31T23:59:59-14:00") == (("date_to", 253402214400),)
+    for query in ("colour=red", "n=ten", "date_from=yesterday", "vehicle_type=hovercraft"):
+        with pytest.raises(QueryError):
+            normalize(query)
+
+
+def test_queries_over_http(data):
+    async def scenario(server, port):
+        status, body = await _request(port, "GET", "/top-makes?n=1")
+        assert (status, body) == (200, [["FORD", 2]])
+        status, body = await _request(port, "GET", "/count?make=ford&year_min=2016")
+        assert body == {"count": 1}
+        status, body = await _request(port, "GET", "/auctions?make=kia")
+        assert body["count"] == 1 and body["auctions"][0]["stock_number"] == "2"
+        status, body = await _request(port, "GET", "/statistics")
+        assert body["total_auctions"] == 3 and body["vehicle_types"] == {"Automobiles": 3}
+        status, body = await _request(port, "GET", "/mileage-by-year?date_from=2024-03-01&date_to=2024-03-31")
+        assert body == {"2015": 100.0, "2018": 200.0, "2020": 300.0}
+        assert (await _request(port, "GET", "/nope"))[0] == 404
+        assert (await _request(port, "GET", "/count?n=x"))[0] == 400
+        assert (await _request(port, "GET", "/ingest"))[0] == 405
+
+    asyncio.run(_run(data, scenario))
+
+
+def test_invalid_content_length_gets_400(data):
+    async def scenario(server, port):
+        for length in ("abc", "-5"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"POST /ingest HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            head, _, body = response.partition(b"\r\n\r\n")
+            assert head.startswith(b"HTTP/1.1 400 ")
+            assert json.loads(body) == {"error": f"Invalid Content-Length: {length!r}"}
+        status, _ = await _request(port, "GET", "/auctions?date_from=0001-01-01T00:00:00%2B14:00")
+        assert status == 200
+
+    asyncio.run(_run(data, scenario))
+
+
+def test_oversized_request_line_and_body_are_rejected(data):
+    async def scenario(server, port):
+        for request, status in [
+            (b"GET /" + b"x" * (1 << 17) + b" HTTP/1.1\r\n\r\n", b"400"),
+            (b"GET /count HTTP/1.1\r\nX-Long: " + b"x" * (1 << 17) + b"\r\n\r\n", b"400"),
+            (f"POST /ingest HTTP/1.1\r\nContent-Length: {1 << 40}\r\n\r\n".encode(), b"413"),
+        ]:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            assert response.split()[1] == status
+        assert (await _request(port, "GET", "/count"))[1] == {"count": 3}
+
+    asyncio.run(_run(data, scenario))
+
+
+def test_cache_hits_and_ingest_invalidation(data):
+    async def scenario(server, port):
+        await _request(port, "GET", "/count?make=FORD")
+        await _request(port, "GET", "/count?make=ford")
+        assert (server.cache.hits, server.cache.misses) == (1, 1)
+        pool = server._pool
+
+        _write_csv(data / "data" / "Sales_List_03052024 (1).csv", [("4", 2021, "FORD", "FOCUS", 50)])
+        status, body = await _request(port, "POST", "/ingest")
+        assert body["version"] == 2 and body["added"] == ["Sales_List_03052024 (1).csv"]
+        assert len(server.cache) == 0
+        assert (await _request(port, "GET", "/count?make=ford"))[1] == {"count": 3}
+        assert server._pool is pool  # procesy dostają deltę zamiast nowej ramki
+
+        status, body = await _request(port, "POST", "/ingest")
+        assert body["version"] == 2  # bez zmian - cache zostaje
+        assert (await _request(port, "GET", "/health"))[1]["cache"]["entries"] == 1
+
+    asyncio.run(_run(data, scenario))
+
+
+def test_ingest_applies_replacements_and_rebases_pool(data, monkeypatch):
+    async def scenario(server, port):
+        pool = server._pool
+        _write_csv(data / "data" / "Sales_List_03052024 (1).csv", [("1", 2021, "KIA", "RIO", 50)])
+        status, body = await _request(port, "POST", "/ingest")
+        assert body["replaced"] == 1
+        assert (await _request(port, "GET", "/top-makes"))[1] == [["KIA", 2], ["FORD", 1]]
+        assert (await _request(port, "GET", "/auctions?make=kia"))[1]["count"] == 2
+        assert [a.stock_number for a in server.frame] == list(server.ingestor.auctions)
+
+        monkeypatch.setattr("server._MAX_DELTAS", 1)
+        (data / "data" / "Sales_List_03052024 (1).csv").unlink()
+        status, body = await _request(port, "POST", "/ingest")
+        assert body["version"] == 3 and server._pool is not pool
+        assert (await _request(port, "GET", "/top-makes"))[1] == [["FORD", 2], ["KIA", 1]]
+
+    asyncio.run(_run(data, scenario))
+
+
+def test_result_cache_coalesces_and_evicts():
+    async def scenario():
+        cache = ResultCache(max_entries=2)
+        calls = []
+
+        def compute(value):
+            def start():
+                calls.append(value)
+                future = asyncio.get_running_loop().create_future()
+                asyncio.get_running_loop().call_later(0.01, future.set_result, value)
+                return future
+            return start
+
+        assert await asyncio.gather(*(cache.get(("a",), compute(b"a")) for _ in range(5))) == [b"a"] * 5
+        await cache.get(("b",), compute(b"b"))
+        await cache.get(("c",), compute(b"c"))
+        await cache.get(("a",), compute(b"a"))
+        assert calls == [b"a", b"b", b"c", b"a"]
+        assert (cache.hits, cache.misses, len(cache)) == (4, 4, 2)
+
+    asyncio.run(scenario())
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 import pytest
 
 from models import Auction, Vehicle, VehicleType
-from service import AuctionService
+from service import AuctionService, CachedAuctionService
 
 
 @pytest.fixture
@@ -146,3 +146,47 @@ def test_get_statistics(sample_auctions):
     assert stats["year_range"] == (2015, 2021)
     assert stats["avg_mileage"] == 80_000  # (120k + 40k + 80k) / 3
     assert stats["median_mileage"] == 80_000
+
+
+def test_cached_service_matches_static_api(sample_auctions):
+    service = CachedAuctionService(sample_auctions)
+    start, end = datetime(2024, 5, 1, tzinfo=timezone.utc), datetime(2024, 10, 1, tzinfo=timezone.utc)
+    for _ in range(2):
+        assert service.filter_by_year(2018) == AuctionService.filter_by_year(sample_auctions, 2018)
+        assert service.filter_by_make(["FORD", "honda"]) == AuctionService.filter_by_make(sample_auctions, ["ford", "Honda"])
+        assert service.filter_by_vehicle_type(VehicleType.TRUCK) == AuctionService.filter_by_vehicle_type(
+            sample_auctions, VehicleType.TRUCK,
+        )
+        assert service.filter_by_date_range(start, end) == AuctionService.filter_by_date_range(sample_auctions, start, end)
+        assert service.group_by_branch() == AuctionService.group_by_branch(sample_auctions)
+        assert service.get_average_mileage_by_year() == AuctionService.get_average_mileage_by_year(sample_auctions)
+        assert service.get_statistics() == AuctionService.get_statistics(sample_auctions)
+    assert (service.hits, service.misses) == (7, 7)
+    service.filter_by_make(["honda", "Ford"])
+    assert service.hits == 8
+
+
+def test_cached_top_n_served_from_larger_n(sample_auctions):
+    service = CachedAuctionService(sample_auctions)
+    assert service.get_top_makes(3) == AuctionService.get_top_makes(sample_auctions, 3)
+    for n in (2, 1, 0, 3):
+        assert service.get_top_makes(n) == AuctionService.get_top_makes(sample_auctions, n)
+    assert (service.hits, service.misses) == (4, 1)
+    service.get_top_models(10)  # 4 modele - ranking pełny, obsłuży każde n
+    assert service.get_top_models(50) == AuctionService.get_top_models(sample_auctions, 50)
+    assert (service.hits, service.misses) == (5, 2)
+
+
+def test_cached_service_invalidates_on_change_and_evicts(sample_auctions):
+    service = CachedAuctionService(sample_auctions[:2], max_entries=2)
+    assert service.get_statistics()["total_auctions"] == 2
+    service.extend(sample_auctions[2:])
+    assert service.version == 1
+    assert service.get_statistics()["total_auctions"] == 4
+    assert service.misses == 2
+
+    service.group_by_make()
+    service.group_by_branch()
+    service.get_statistics()
+    assert (service.hits, service.misses) == (0, 5)
+    assert len(service._results) == 2
@@ -0,0 +1,101 @@
+import random
+import statistics
+from datetime import datetime, timezone
+
+import pytest
+
+from models import Auction, Vehicle, VehicleType
+from service import AuctionService
+from stats import HyperLogLog, QuantileSketch, StatisticsAccumulator
+
+
+def _auctions(n: int, seed: int = 0) -> list[Auction]:
+    rng = random.Random(seed)
+    return [
+        Auction(
+            stock_number=str(i),
+            branch=f"Branch {rng.randrange(20)}",
+            auction_date_utc=datetime(2024, 3, 15, 10, 0, tzinfo=timezone.utc),
+            vehicle=Vehicle(
+                year=rng.randint(1990, 2025),
+                make=f"Make {rng.randrange(60)}",
+                model="Model",
+                vehicle_type=rng.choice(list(VehicleType)),
+                mileage=rng.choice([None, rng.randrange(0, 300_000)]),
+            ),
+        )
+        for i in range(n)
+    ]
+
+
+def test_accumulator_matches_previous_implementation():
+    auctions = _auctions(1000)
+    mileages = [a.vehicle.mileage for a in auctions if a.vehicle.mileage is not None]
+    stats = StatisticsAccumulator().update(auctions).result()
+    assert stats["total_auctions"] == 1000
+    assert stats["unique_makes"] == len({a.vehicle.make for a in auctions})
+    assert stats["avg_mileage"] == statistics.mean(mileages)
+    assert stats["median_mileage"] == statistics.median(mileages)
+
+
+def test_accumulator_merge_equals_single_pass():
+    auctions = _auctions(900, seed=1)
+    merged = StatisticsAccumulator()
+    for start in range(0, 900, 250):
+        merged.merge(StatisticsAccumulator().update(auctions[start:start + 250]))
+    single = StatisticsAccumulator().update(auctions)
+    assert merged.result() == single.result()
+    assert merged.mileage_stddev == pytest.approx(single.mileage_stddev)
+    mileages = [a.vehicle.mileage for a in auctions if a.vehicle.mileage is not None]
+    assert merged.mileage_stddev == pytest.approx(statistics.stdev(mileages))
+
+
+def test_approximate_mode_is_close():
+    auctions = _auctions(2000, seed=2)
+    exact = StatisticsAccumulator().update(auctions).result()
+    approx = StatisticsAccumulator(exact=False).update(auctions).result()
+    assert approx["total_auctions"] == exact["total_auctions"]
+    assert approx["avg_mileage"] == exact["avg_mileage"]
+    assert approx["unique_makes"] == pytest.approx(exact["unique_makes"], rel=0.1)
+    assert approx["median_mileage"] == pytest.approx(exact["median_mileage"], rel=0.02)
+
+
+def test_exact_unique_with_approximate_median():
+    auctions = _auctions(2000, seed=3)
+    exact = StatisticsAccumulator().update(auctions).result()
+    mixed = StatisticsAccumulator(exact_median=False).update(auctions).result()
+    assert (mixed["unique_makes"], mixed["unique_branches"]) == (exact["unique_makes"], exact["unique_branches"])
+    assert mixed["median_mileage"] == pytest.approx(exact["median_mileage"], rel=0.02)
+
+
+def test_cannot_merge_exact_with_approximate():
+    with pytest.raises(ValueError):
+        StatisticsAccumulator().merge(StatisticsAccumulator(exact=False))
+    with pytest.raises(ValueError):
+        StatisticsAccumulator().merge(StatisticsAccumulator(exact_median=False))
+
+
+def test_empty_accumulator():
+    stats = StatisticsAccumulator(exact=False).result()
+    assert stats["year_range"] == (None, None)
+    assert stats["median_mileage"] is None
+    assert AuctionService.get_statistics([])["avg_mileage"] is None
+
+
+def test_hyperloglog_estimate_and_merge():
+    left, right = HyperLogLog(), HyperLogLog()
+    for i in range(5000):
+        left.add(str(i))
+    for i in range(2500, 10_000):
+        right.add(str(i))
+    left.merge(right)
+    assert len(left) == pytest.approx(10_000, rel=0.05)
+
+
+def test_quantile_sketch_relative_accuracy():
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    values = list(range(1, 10_001))
+    for v in values:
+        sketch.add(v)
+    assert sketch.quantile(0.5) == pytest.approx(statistics.median(values), rel=0.01)
+    assert sketch.quantile(0.9) == pytest.approx(9000, rel=0.01)
@@ -0,0 +1,110 @@
+import os
+import random
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from conftest import BASE_DATE, MAKES, random_auctions, write_csv
+from models import VehicleType
+from parser import CsvAuctionParser, RowValidationError
+from service import AuctionService
+from storage import AuctionStore
+
+
+_write_csv = partial(write_csv, fields=("stock", "make", "mileage"))
+
+
+def _random_filters(rng: random.Random) -> list[tuple[str, tuple]]:
+    start = BASE_DATE + timedelta(days=rng.randrange(200))
+    candidates = [
+        ("filter_by_year", (rng.randint(1995, 2025), rng.choice([None, rng.randint(2005, 2025)]))),
+        ("filter_by_make", (rng.sample([m.lower() for m in MAKES] + MAKES, 2),)),
+        ("filter_by_vehicle_type", (rng.choice(list(VehicleType)),)),
+        ("filter_by_date_range", (start, start + timedelta(days=rng.randrange(1, 200)))),
+    ]
+    return rng.sample(candidates, rng.randint(0, len(candidates)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AuctionStore(tmp_path / "auctions.db", batch_size=7) as store:
+        yield store
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_queries_match_service(store, seed):
+    rng = random.Random(seed)
+    auctions = random_auctions(rng, rng.randint(0, 300))
+    store.add(auctions, Path("a.csv"))
+    query = store.query()
+    expected = auctions
+    for name, args in _random_filters(rng):
+        query = getattr(query, name)(*args)
+        expected = getattr(AuctionService, name)(expected, *args)
+
+    assert query.to_auctions() == expected
+    assert query.count() == len(expected)
+    assert query.get_top_makes(3) == AuctionService.get_top_makes(expected, 3)
+    assert query.get_top_models(4) == AuctionService.get_top_models(expected, 4)
+    assert query.get_average_mileage_by_year() == AuctionService.get_average_mileage_by_year(expected)
+    assert query.get_statistics() == AuctionService.get_statistics(expected)
+    assert query.group_by_make() == AuctionService.group_by_make(expected)
+    assert query.group_by_branch() == AuctionService.group_by_branch(expected)
+    assert query.group_by_vehicle_type() == AuctionService.group_by_vehicle_type(expected)
+
+
+def test_date_range_rejects_naive_datetimes(store):
+    with pytest.raises(TypeError):
+        store.query().filter_by_date_range(datetime(2024, 1, 1), datetime(2024, 6, 1))
+
+
+def test_wal_mode_and_indexed_filters(store):
+    assert store.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    query = store.query().filter_by_make(["ford"]).filter_by_year(2015)
+    where = " AND ".join(sql for sql, _ in query._clauses)
+    params = [p for _, ps in query._clauses for p in ps]
+    plan = store.connection.execute(f"EXPLAIN QUERY PLAN SELECT * FROM auctions WHERE {where}", params)
+    plan = " ".join(row[-1] for row in plan)
+    assert "USING INDEX" in plan
+
+
+def test_reload_is_idempotent_and_later_export_wins(store, tmp_path):
+    older = _write_csv(tmp_path / "Sales_List_03042024 (1).csv", [("1", "FORD", 100), ("2", "KIA", 200)])
+    newer = _write_csv(tmp_path / "Sales_List_03052024 (1).csv", [("2", "KIA", 250), ("3", "FORD", 300)])
+    parser = CsvAuctionParser()
+
+    report = store.load(parser, [newer, older])
+    assert (report.loaded, report.rows) == ([newer.name, older.name], 4)
+    assert report.skipped == []
+    assert {a.stock_number: a.vehicle.mileage for a in store.query().to_auctions()} == {"1": 100, "2": 250, "3": 300}
+
+    os.utime(older)  # tylko "dotknięty" - ten sam skrót
+    report = store.load(parser, [older, newer])
+    assert (report.loaded, report.skipped, report.rows) == ([], [older.name, newer.name], 0)
+    assert len(store) == 3
+
+
+def test_failed_file_is_rolled_back_and_load_resumes(store, tmp_path):
+    good = _write_csv(tmp_path / "Sales_List_03042024 (1).csv", [("1", "FORD", 100)])
+    bad = _write_csv(tmp_path / "Sales_List_03052024 (1).csv", [(str(i), "KIA", i) for i in range(2, 30)], year=2045)
+    parser = CsvAuctionParser()
+
+    with pytest.raises(RowValidationError):
+        store.load(parser, [good, bad])
+    assert [a.stock_number for a in store.query().to_auctions()] == ["1"]
+
+    _write_csv(bad, [(str(i), "KIA", i) for i in range(2, 30)])
+    report = store.load(parser, [good, bad])
+    assert (report.loaded, report.skipped, report.rows) == ([bad.name], [good.name], 28)
+    assert len(store) == 29
+
+
+def test_store_reopens_existing_database(tmp_path):
+    path = _write_csv(tmp_path / "Sales_List_03042024 (1).csv", [("1", "FORD", 100)])
+    with AuctionStore(tmp_path / "auctions.db") as store:
+        store.load(CsvAuctionParser(), [path])
+    with AuctionStore(tmp_path / "auctions.db") as store:
+        assert store.load(CsvAuctionParser(), [path]).skipped == [path.name]
+        assert store.query().get_top_makes() == [("FORD", 1)]
@@ -0,0 +1,74 @@
+import threading
+from datetime import datetime, timezone
+
+from loader import from_row, to_row
+from models import Auction, Vehicle
+from service import AuctionService
+from symbols import MAKES, MODELS, SymbolTable
+
+
+def test_code_is_shared_by_spelling_variants():
+    table = SymbolTable()
+    assert table.code("FORD") == table.code(" FORD ") == 0
+    assert table.code("Ford") == 1
+    assert table.values == ["FORD", "Ford"]
+    assert table.folded == ["ford", "ford"]
+
+
+def test_intern_returns_one_object_per_symbol():
+    table = SymbolTable()
+    first = table.intern("".join(["TOY", "OTA"]))
+    assert table.intern("TOYOTA ") is first
+    assert table.fold("TOYOTA") == "toyota"
+
+
+def test_matcher_is_case_insensitive_and_does_not_intern_new_values():
+    table = SymbolTable()
+    table.code("FORD")
+    table.code("KIA")
+    matches = table.matcher(["ford", "zastava"])
+    assert matches["FORD"] and not matches["KIA"]
+    assert matches["Ford"] and matches[" Zastava "]  # wartości spoza tablicy - rozstrzygane przy odczycie
+    assert not matches["LADA"]
+    assert len(table) == 2
+
+
+def test_code_is_thread_safe():
+    table = SymbolTable()
+    names = [f"MAKE{i % 50}" for i in range(5_000)]
+    threads = [threading.Thread(target=lambda: list(map(table.code, names))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(table) == 50
+    assert sorted(table.codes.values()) == sorted(set(table.codes.values()))
+
+
+def test_validated_vehicles_share_interned_strings():
+    make = "".join(["Sub", "aru"])
+    first = Vehicle(year=2020, make=make, model=" Outback ")
+    second = Vehicle(year=2020, make="Subaru", model="Outback")
+    assert first.make is second.make
+    assert first.model is second.model == "Outback"
+
+
+def test_filter_by_make_uses_symbols_for_unregistered_values():
+    vehicle = Vehicle.construct(2020, "ZASTAVA", "YUGO")  # construct pomija tablicę symboli
+    auction = Auction.construct("1", "Chicago", datetime(2024, 3, 4, tzinfo=timezone.utc), vehicle)
+    assert AuctionService.filter_by_make([auction], ["zastava"]) == [auction]
+    assert AuctionService.filter_by_make([auction], ["yugo"]) == []
+
+
+def test_from_row_interns_symbols_like_the_parser():
+    vehicle = Vehicle(year=2020, make="Subaru", model="Outback")
+    auction = Auction(
+        stock_number="1", branch="Chicago", auction_date_utc=datetime(2024, 3, 4, tzinfo=timezone.utc), vehicle=vehicle,
+    )
+    # kopie stringów, jak po odczycie z pickle w procesie roboczym
+    row = tuple("".join(value) if isinstance(value, str) else value for value in to_row(auction))
+    restored = from_row(row)
+    assert restored == auction
+    assert restored.vehicle.make is MAKES.intern("Subaru") is vehicle.make
+    assert restored.vehicle.model is MODELS.intern("Outback")
+    assert restored.branch is auction.branch
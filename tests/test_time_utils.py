@@ -1,6 +1,10 @@
-from datetime import timezone
+from datetime import date, datetime, timezone
 
-from time_utils import parse_auction_datetime
+import pytest
+
+from time_utils import (
+    _parse_cached, _parse_fast, _parse_with_dateutil, infer_year, parse_auction_datetime, utc_timestamp,
+)
 
 
 def test_parse_auction_datetime_with_multiple_timezones():
@@ -8,3 +12,48 @@ def test_parse_auction_datetime_with_multiple_timezones():
 
     assert dt.tzinfo == timezone.utc
     assert dt.hour == 13  # 15:30 CEST -> 13:30 UTC
+
+
+def test_parse_auction_datetime_fast_path_matches_dateutil():
+    values = [
+        "Mon Mar 04, 8:30am CST",
+        "Thu Apr 03, 8:30am CDT",
+        "Wed Sep 03, 3:30pm CEDT / CEST",
+        "Fri Oct 31, 12:30pm CDT",
+        "Fri Oct 31, 12:05am EST",
+    ]
+    for value in values:
+        assert parse_auction_datetime(value) == _parse_with_dateutil(value)
+
+
+def test_parse_auction_datetime_is_cached():
+    _parse_cached.cache_clear()
+    parse_auction_datetime("Mon Mar 04, 8:30am CST")
+    parse_auction_datetime("Mon Mar 04, 8:30am CST")
+    assert _parse_cached.cache_info().hits == 1
+
+
+def test_parse_fast_rejects_unknown_layout():
+    assert _parse_fast("2024-03-04 08:30 CST", 2024) is None
+    assert _parse_fast("Mon Mar 04, 8:30am PST", 2024) is None
+
+
+def test_parse_auction_datetime_unknown_timezone():
+    with pytest.raises(ValueError):
+        parse_auction_datetime("Mon Mar 04, 8:30am")
+
+
+def test_parse_auction_datetime_with_reference_year():
+    dt = parse_auction_datetime("Mon Mar 04, 8:30am CST", 2024)
+    assert (dt.year, dt.month, dt.day, dt.hour) == (2024, 3, 4, 14)
+
+
+def test_infer_year_from_weekday():
+    assert infer_year("Mon Mar 04, 8:30am CST", today=date(2026, 10, 18)) == 2024
+    assert infer_year("not a date") is None
+
+
+def test_utc_timestamp_rejects_naive_datetimes():
+    assert utc_timestamp(datetime(1970, 1, 2, tzinfo=timezone.utc)) == 86400
+    with pytest.raises(TypeError):
+        utc_timestamp(datetime(1970, 1, 2))
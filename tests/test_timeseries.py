@@ -0,0 +1,92 @@
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from frame import AuctionFrame
+from models import Auction, Vehicle
+from timeseries import CalendarHistogram, ZoneTable, zone_table
+
+
+def _naive_seconds(ts: int, zone: ZoneInfo) -> int:
+    local = datetime.fromtimestamp(ts, zone).replace(tzinfo=timezone.utc)
+    return int(local.timestamp())
+
+
+def _auction(stock: int, branch: str, when: datetime) -> Auction:
+    return Auction.construct(str(stock), branch, when, Vehicle.construct(2015, "FORD", "FOCUS"))
+
+
+@pytest.mark.parametrize("zone", ["Europe/Warsaw", "America/Chicago", "Australia/Lord_Howe", "UTC"])
+def test_localize_matches_zoneinfo(zone):
+    table = ZoneTable(zone, 1990, 2040)
+    rng = random.Random(zone)
+    stamps = [rng.randrange(0, 2_500_000_000) for _ in range(2000)]
+    for ts in table.transitions[1:]:
+        stamps += [ts - 1, ts, ts + 1]
+    assert list(table.localize(stamps)) == [_naive_seconds(ts, ZoneInfo(zone)) for ts in stamps]
+
+
+def test_transitions_found_to_the_second():
+    table = zone_table("Europe/Warsaw")
+    spring = int(datetime(2024, 3, 31, 1, 0, tzinfo=timezone.utc).timestamp())
+    autumn = int(datetime(2024, 10, 27, 1, 0, tzinfo=timezone.utc).timestamp())
+    assert spring in table.transitions and autumn in table.transitions
+    assert (table.offset(spring - 1), table.offset(spring)) == (3600, 7200)
+    assert (table.offset(autumn - 1), table.offset(autumn)) == (7200, 3600)
+    assert zone_table("Europe/Warsaw") is table
+
+
+def test_histogram_buckets_by_local_day_and_hour():
+    utc = timezone.utc
+    auctions = [
+        _auction(1, "Chicago", datetime(2024, 3, 4, 14, 30, tzinfo=utc)),
+        _auction(2, "Chicago", datetime(2024, 3, 4, 14, 30, tzinfo=utc)),
+        _auction(3, "Chicago", datetime(2024, 3, 4, 23, 30, tzinfo=utc)),  # 00:30 następnego dnia w Warszawie
+        _auction(4, "Dallas", datetime(2024, 7, 1, 8, 0, tzinfo=utc)),  # czas letni: 10:00
+    ]
+    histogram = CalendarHistogram("Europe/Warsaw")
+    for auction in auctions:
+        histogram.add(auction)
+    result = histogram.result()
+    assert set(result) == {"Chicago", "Dallas"}
+    assert list(result["Chicago"]) == [date(2024, 3, 4), date(2024, 3, 5)]
+    assert result["Chicago"][date(2024, 3, 4)][15] == 2
+    assert result["Chicago"][date(2024, 3, 5)][0] == 1
+    assert result["Dallas"][date(2024, 7, 1)][10] == 1
+    assert sum(map(sum, result["Chicago"].values())) == 3
+
+    histogram.remove(auctions[3])
+    assert set(histogram.result()) == {"Chicago"}
+
+
+def test_frame_histogram_matches_astimezone():
+    rng = random.Random(3)
+    base = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    auctions = [
+        _auction(i, rng.choice(["Chicago", "Dallas", "Warsaw"]), base + timedelta(minutes=30 * rng.randrange(40_000)))
+        for i in range(3000)
+    ]
+    zone = ZoneInfo("America/Chicago")
+    expected: Counter = Counter()
+    for a in auctions:
+        local = a.auction_date_utc.astimezone(zone)
+        expected[a.branch, local.date(), local.hour] += 1
+
+    histogram = CalendarHistogram(zone)
+    histogram.add_frame(AuctionFrame.from_auctions(auctions))
+    actual = Counter({
+        (branch, day, hour): n
+        for branch, days in histogram.result().items()
+        for day, hours in days.items()
+        for hour, n in enumerate(hours) if n
+    })
+    assert actual == expected
+
+    other = CalendarHistogram(zone)
+    other.add_frame(AuctionFrame.from_auctions(auctions[:10]))
+    assert sum(histogram.merge(other).counts.values()) == 3010
+    with pytest.raises(ValueError):
+        histogram.merge(CalendarHistogram("UTC"))